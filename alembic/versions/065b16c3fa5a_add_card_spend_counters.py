@@ -0,0 +1,30 @@
+"""Add card spend counters
+
+Revision ID: 065b16c3fa5a
+Revises: 665c5ee9bed0
+Create Date: 2026-10-19 06:54:33.077444
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '065b16c3fa5a'
+down_revision = '665c5ee9bed0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('cards', sa.Column('daily_spent', sa.Numeric(precision=15, scale=2), server_default='0', nullable=False))
+    op.add_column('cards', sa.Column('daily_spent_on', sa.Date(), nullable=True))
+    op.add_column('cards', sa.Column('monthly_spent', sa.Numeric(precision=15, scale=2), server_default='0', nullable=False))
+    op.add_column('cards', sa.Column('monthly_spent_in', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('cards', 'monthly_spent_in')
+    op.drop_column('cards', 'monthly_spent')
+    op.drop_column('cards', 'daily_spent_on')
+    op.drop_column('cards', 'daily_spent')
@@ -0,0 +1,30 @@
+"""Add ledger indexes and transactions.updated_at
+
+Revision ID: 0d3a06daca94
+Revises: 20d69e0b7c5f
+Create Date: 2026-10-19 06:47:50.001088
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0d3a06daca94'
+down_revision = '20d69e0b7c5f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_transactions_account_id_created_at', 'transactions', ['account_id', 'created_at'], unique=False)
+    op.create_index('ix_transactions_to_account_id', 'transactions', ['to_account_id'], unique=False)
+    op.create_index('ix_transactions_updated_at', 'transactions', ['updated_at'], unique=False, sqlite_where=sa.text('updated_at IS NOT NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_updated_at', table_name='transactions', sqlite_where=sa.text('updated_at IS NOT NULL'))
+    op.drop_index('ix_transactions_to_account_id', table_name='transactions')
+    op.drop_index('ix_transactions_account_id_created_at', table_name='transactions')
+    op.drop_column('transactions', 'updated_at')
@@ -0,0 +1,40 @@
+"""Add archive manifest
+
+Revision ID: 20d69e0b7c5f
+Revises: b247ee170dda
+Create Date: 2026-10-19 06:43:00.011705
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '20d69e0b7c5f'
+down_revision = 'b247ee170dda'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('archive_manifest',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('period', sa.String(length=7), nullable=False),
+    sa.Column('file_name', sa.String(length=100), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('first_created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('archived_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('account_id', 'period', name='uq_archive_manifest_account_period')
+    )
+    op.create_index(op.f('ix_archive_manifest_account_id'), 'archive_manifest', ['account_id'], unique=False)
+    op.create_index(op.f('ix_archive_manifest_id'), 'archive_manifest', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_archive_manifest_id'), table_name='archive_manifest')
+    op.drop_index(op.f('ix_archive_manifest_account_id'), table_name='archive_manifest')
+    op.drop_table('archive_manifest')
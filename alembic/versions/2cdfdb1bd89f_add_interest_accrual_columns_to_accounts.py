@@ -0,0 +1,26 @@
+"""Add interest accrual columns to accounts
+
+Revision ID: 2cdfdb1bd89f
+Revises: c961a8cf424e
+Create Date: 2026-10-19 06:48:53.680968
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2cdfdb1bd89f'
+down_revision = 'c961a8cf424e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('accounts', sa.Column('accrued_interest', sa.BigInteger(), server_default='0', nullable=False))
+    op.add_column('accounts', sa.Column('interest_accrued_through', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('accounts', 'interest_accrued_through')
+    op.drop_column('accounts', 'accrued_interest')
@@ -0,0 +1,41 @@
+"""Add FX rates and transaction conversion columns
+
+Revision ID: 334e64537520
+Revises: 7e594cbfbf3d
+Create Date: 2026-10-19 06:48:28.395283
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '334e64537520'
+down_revision = '7e594cbfbf3d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('fx_rates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('base_currency', sa.String(length=3), nullable=False),
+    sa.Column('quote_currency', sa.String(length=3), nullable=False),
+    sa.Column('rate', sa.Numeric(precision=18, scale=8), nullable=False),
+    sa.Column('effective_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('base_currency', 'quote_currency', 'effective_at', name='uq_fx_rates_pair_effective_at')
+    )
+    op.create_index(op.f('ix_fx_rates_id'), 'fx_rates', ['id'], unique=False)
+    op.add_column('transactions', sa.Column('exchange_rate', sa.Numeric(precision=18, scale=8), nullable=True))
+    op.add_column('transactions', sa.Column('converted_amount', sa.Numeric(precision=15, scale=2), nullable=True))
+    op.add_column('transactions', sa.Column('converted_currency', sa.String(length=3), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('transactions', 'converted_currency')
+    op.drop_column('transactions', 'converted_amount')
+    op.drop_column('transactions', 'exchange_rate')
+    op.drop_index(op.f('ix_fx_rates_id'), table_name='fx_rates')
+    op.drop_table('fx_rates')
@@ -0,0 +1,30 @@
+"""Add settlement lease columns to transactions
+
+Revision ID: 665c5ee9bed0
+Revises: a5a4f942b40e
+Create Date: 2026-10-19 06:52:18.931587
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '665c5ee9bed0'
+down_revision = 'a5a4f942b40e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('settles_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('transactions', sa.Column('lease_owner', sa.String(length=64), nullable=True))
+    op.add_column('transactions', sa.Column('lease_expires_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_index('ix_transactions_status_settles_at', 'transactions', ['status', 'settles_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_transactions_status_settles_at', table_name='transactions')
+    op.drop_column('transactions', 'lease_expires_at')
+    op.drop_column('transactions', 'lease_owner')
+    op.drop_column('transactions', 'settles_at')
@@ -0,0 +1,55 @@
+"""Add standing orders
+
+Revision ID: 7e594cbfbf3d
+Revises: 0d3a06daca94
+Create Date: 2026-10-19 06:48:14.357056
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7e594cbfbf3d'
+down_revision = '0d3a06daca94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('standing_orders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('from_account_id', sa.Integer(), nullable=False),
+    sa.Column('to_account_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('frequency', sa.Enum('DAILY', 'WEEKLY', 'MONTHLY', name='standingorderfrequency'), nullable=False),
+    sa.Column('start_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('end_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('next_run_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('run_count', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('ACTIVE', 'CANCELLED', 'COMPLETED', name='standingorderstatus'), nullable=False),
+    sa.Column('last_run_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_transaction_id', sa.String(length=50), nullable=True),
+    sa.Column('last_failure_reason', sa.String(length=255), nullable=True),
+    sa.Column('failure_count', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['from_account_id'], ['accounts.id'], ),
+    sa.ForeignKeyConstraint(['to_account_id'], ['accounts.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_standing_orders_from_account_id'), 'standing_orders', ['from_account_id'], unique=False)
+    op.create_index(op.f('ix_standing_orders_id'), 'standing_orders', ['id'], unique=False)
+    op.create_index('ix_standing_orders_status_next_run_at', 'standing_orders', ['status', 'next_run_at'], unique=False)
+    op.create_index(op.f('ix_standing_orders_user_id'), 'standing_orders', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_standing_orders_user_id'), table_name='standing_orders')
+    op.drop_index('ix_standing_orders_status_next_run_at', table_name='standing_orders')
+    op.drop_index(op.f('ix_standing_orders_id'), table_name='standing_orders')
+    op.drop_index(op.f('ix_standing_orders_from_account_id'), table_name='standing_orders')
+    op.drop_table('standing_orders')
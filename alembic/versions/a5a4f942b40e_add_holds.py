@@ -0,0 +1,47 @@
+"""Add holds
+
+Revision ID: a5a4f942b40e
+Revises: 2cdfdb1bd89f
+Create Date: 2026-10-19 06:49:16.809701
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a5a4f942b40e'
+down_revision = '2cdfdb1bd89f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('holds',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=False),
+    sa.Column('amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('currency', sa.String(length=3), nullable=False),
+    sa.Column('status', sa.Enum('ACTIVE', 'CAPTURED', 'RELEASED', 'EXPIRED', name='holdstatus'), nullable=False),
+    sa.Column('transaction_id', sa.String(length=50), nullable=False),
+    sa.Column('description', sa.String(length=255), nullable=True),
+    sa.Column('card_id', sa.Integer(), nullable=True),
+    sa.Column('captured_amount', sa.Numeric(precision=15, scale=2), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('resolved_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['accounts.id'], ),
+    sa.ForeignKeyConstraint(['card_id'], ['cards.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_holds_account_id'), 'holds', ['account_id'], unique=False)
+    op.create_index(op.f('ix_holds_id'), 'holds', ['id'], unique=False)
+    op.create_index('ix_holds_status_expires_at', 'holds', ['status', 'expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_holds_status_expires_at', table_name='holds')
+    op.drop_index(op.f('ix_holds_id'), table_name='holds')
+    op.drop_index(op.f('ix_holds_account_id'), table_name='holds')
+    op.drop_table('holds')
@@ -0,0 +1,39 @@
+"""Add outbox events and consumer offsets
+
+Revision ID: b247ee170dda
+Revises: e11e05c473ac
+Create Date: 2026-10-19 06:41:41.448584
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b247ee170dda'
+down_revision = 'e11e05c473ac'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_events',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('event_type', sa.String(length=50), nullable=False),
+    sa.Column('aggregate_id', sa.String(length=50), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sqlite_autoincrement=True
+    )
+    op.create_table('consumer_offsets',
+    sa.Column('consumer', sa.String(length=100), nullable=False),
+    sa.Column('offset', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('consumer')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('consumer_offsets')
+    op.drop_table('outbox_events')
@@ -0,0 +1,30 @@
+"""Add card number sequences
+
+Revision ID: b4d06783fc14
+Revises: 065b16c3fa5a
+Create Date: 2026-10-19 06:55:42.102000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b4d06783fc14'
+down_revision = '065b16c3fa5a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('card_number_sequences',
+    sa.Column('bin', sa.String(length=8), nullable=False),
+    sa.Column('next_value', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('bin')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('card_number_sequences')
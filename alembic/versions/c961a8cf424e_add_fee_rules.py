@@ -0,0 +1,39 @@
+"""Add fee rules
+
+Revision ID: c961a8cf424e
+Revises: 334e64537520
+Create Date: 2026-10-19 06:48:45.657830
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c961a8cf424e'
+down_revision = '334e64537520'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('fee_rules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('account_type', sa.Enum('CHECKING', 'SAVINGS', 'MONEY_MARKET', 'CERTIFICATE_OF_DEPOSIT', 'BUSINESS', name='accounttype'), nullable=True),
+    sa.Column('transaction_type', sa.Enum('DEPOSIT', 'WITHDRAWAL', 'TRANSFER', 'PAYMENT', 'FEE', 'INTEREST', 'REFUND', name='transactiontype'), nullable=True),
+    sa.Column('currency', sa.String(length=3), nullable=True),
+    sa.Column('min_amount', sa.Numeric(precision=15, scale=2), nullable=False),
+    sa.Column('flat_fee', sa.Numeric(precision=10, scale=2), nullable=False),
+    sa.Column('percent_fee', sa.Numeric(precision=7, scale=4), nullable=False),
+    sa.Column('max_fee', sa.Numeric(precision=10, scale=2), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_fee_rules_id'), 'fee_rules', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_fee_rules_id'), table_name='fee_rules')
+    op.drop_table('fee_rules')
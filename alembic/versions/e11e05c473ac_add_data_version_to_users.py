@@ -0,0 +1,24 @@
+"""Add data_version to users
+
+Revision ID: e11e05c473ac
+Revises: aecd5aee8f3a
+Create Date: 2026-10-19 06:40:08.216771
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e11e05c473ac'
+down_revision = 'aecd5aee8f3a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('data_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'data_version')
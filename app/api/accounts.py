@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List
+from decimal import Decimal
 import secrets
 import string
 from app.database import get_db
-from app.models import User, Account, AccountType
+from app.models import User, Account, AccountType, Transaction, TransactionType, TransactionStatus
 from app.schemas.account import (
     AccountCreateRequest,
     AccountResponse,
@@ -12,9 +13,15 @@ from app.schemas.account import (
     AccountDetailResponse
 )
 from app.core.auth import get_current_active_user
+from app.core.versioning import bump_user_version, make_etag, etag_matches, not_modified
+from app.core.singleflight import SingleFlight, coalesced_read
+from app.core.outbox import record_transaction
+from app.api.transactions import generate_transaction_id
 
 router = APIRouter(prefix="/accounts", tags=["accounts"])
 
+list_accounts_flight = SingleFlight("accounts.list")
+
 
 def generate_account_number() -> str:
     """Generate a unique account number."""
@@ -52,6 +59,22 @@ async def create_account(
     )
     
     db.add(db_account)
+    if account_data.initial_deposit:
+        # Post the opening balance so the ledger matches it
+        db.flush()
+        opening = Transaction(
+            transaction_id=generate_transaction_id(),
+            transaction_type=TransactionType.DEPOSIT,
+            status=TransactionStatus.COMPLETED,
+            amount=account_data.initial_deposit,
+            currency=db_account.currency,
+            fee=Decimal("0.00"),
+            account_id=db_account.id,
+            description="Initial deposit"
+        )
+        db.add(opening)
+        record_transaction(db, opening)
+    bump_user_version(db, current_user.id)
     db.commit()
     db.refresh(db_account)
     
@@ -60,16 +83,28 @@ async def create_account(
 
 @router.get("/", response_model=AccountListResponse)
 async def list_accounts(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """List all accounts for the current user."""
-    accounts = db.query(Account).filter(Account.user_id == current_user.id).all()
+    etag = make_etag("accounts", current_user, request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
     
-    return AccountListResponse(
-        accounts=[AccountResponse.from_orm(account) for account in accounts],
-        total_count=len(accounts)
-    )
+    user_id = current_user.id
+    
+    def load(db: Session) -> AccountListResponse:
+        accounts = db.query(Account).filter(Account.user_id == user_id).all()
+        return AccountListResponse(
+            accounts=[AccountResponse.from_orm(account) for account in accounts],
+            total_count=len(accounts)
+        )
+    
+    # The ETag carries the user's data version, so a burst never shares a stale list
+    return await coalesced_read(list_accounts_flight, etag, load)
 
 
 @router.get("/{account_id}", response_model=AccountDetailResponse)
@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+
+from app.database import get_db
+from app.core.auth import get_current_active_user
+from app.core import analytics
+from app.models import User, Account
+from app.schemas.analytics import SpendingResponse
+from app.utils.serialization import FastJSONResponse
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+MAX_MONTHS = 12
+# A month's spending ends where the next month starts, which datetime cannot represent after 9999-12
+LAST_MONTH = "9999-11"
+
+
+@router.get("/spending", response_model=SpendingResponse)
+async def get_spending(
+    start_month: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="First month (YYYY-MM), defaults to end_month"),
+    end_month: Optional[str] = Query(None, pattern=MONTH_PATTERN, description="Last month (YYYY-MM), defaults to the current month"),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Spending per merchant category and merchant for each month, across all the user's accounts"""
+    end_month = end_month or datetime.now().strftime("%Y-%m")
+    start_month = start_month or end_month
+    if start_month > end_month:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="start_month must not be after end_month"
+        )
+    if end_month > LAST_MONTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"end_month cannot be after {LAST_MONTH}"
+        )
+    
+    # Check the span before walking it
+    start, end = analytics.parse_month(start_month), analytics.parse_month(end_month)
+    if (end.year - start.year) * 12 + end.month - start.month + 1 > MAX_MONTHS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range cannot exceed {MAX_MONTHS} months"
+        )
+    months = []
+    month = start
+    while month <= end:
+        months.append(month.strftime("%Y-%m"))
+        month = analytics.next_month(month)
+    
+    account_ids = [account_id for (account_id,) in db.query(Account.id).filter(Account.user_id == current_user.id)]
+    breakdown = analytics.spending_by_month(db, current_user.id, account_ids, months)
+    
+    return FastJSONResponse({
+        "months": breakdown,
+        "total": str(sum((Decimal(month_spending["total"]) for month_spending in breakdown), Decimal("0.00"))),
+        "message": "Spending analytics retrieved successfully"
+    })
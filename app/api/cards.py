@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import List
 import uuid
@@ -6,23 +7,24 @@ from datetime import datetime, date
 
 from app.database import get_db
 from app.core.auth import get_current_active_user
+from app.core.versioning import bump_user_version, make_etag, etag_matches, not_modified
+from app.core.cards import authorize_card
+from app.core.card_numbers import card_number_allocator
 from app.models import User, Account, Card, CardType, CardStatus, AccountStatus
 from app.schemas.card import (
     CardCreateRequest,
     CardResponse,
     CardListResponse,
     CardStatusUpdateRequest,
-    CardStatusUpdateResponse
+    CardStatusUpdateResponse,
+    CardAuthorizationRequest,
+    CardAuthorizationResponse
 )
+from app.utils.serialization import FastJSONResponse, card_to_dict
 
 router = APIRouter(prefix="/cards", tags=["cards"])
 
 
-def generate_card_number() -> str:
-    """Generate a unique card number (simplified for demo)"""
-    return f"4{uuid.uuid4().hex[:15]}"
-
-
 def generate_cvv() -> str:
     """Generate a 3-digit CVV"""
     return f"{uuid.uuid4().int % 900 + 100}"
@@ -67,7 +69,7 @@ async def issue_card(
         )
     
     # Generate card details
-    card_number = generate_card_number()
+    card_number = card_number_allocator.allocate(card_data.card_type)
     cvv = generate_cvv()
     
     # Set expiry date (3 years from now)
@@ -94,6 +96,7 @@ async def issue_card(
     )
     
     db.add(card)
+    bump_user_version(db, current_user.id)
     db.commit()
     db.refresh(card)
     
@@ -120,6 +123,7 @@ async def issue_card(
 
 @router.get("/", response_model=CardListResponse)
 async def list_user_cards(
+    request: Request,
     skip: int = 0,
     limit: int = 50,
     current_user: User = Depends(get_current_active_user),
@@ -127,6 +131,10 @@ async def list_user_cards(
 ):
     """List all cards for the current user"""
     
+    etag = make_etag("cards", current_user, request)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    
     cards = db.query(Card).filter(
         Card.user_id == current_user.id
     ).order_by(Card.created_at.desc()).offset(skip).limit(limit).all()
@@ -135,30 +143,11 @@ async def list_user_cards(
         Card.user_id == current_user.id
     ).count()
     
-    return CardListResponse(
-        cards=[
-            CardResponse(
-                id=card.id,
-                card_number=card.card_number,
-                card_type=card.card_type,
-                status=card.status,
-                cardholder_name=card.cardholder_name,
-                expiry_month=card.expiry_month,
-                expiry_year=card.expiry_year,
-                is_pin_set=card.is_pin_set,
-                is_contactless_enabled=card.is_contactless_enabled,
-                is_international_enabled=card.is_international_enabled,
-                daily_limit=str(card.daily_limit),
-                monthly_limit=str(card.monthly_limit),
-                credit_limit=str(card.credit_limit) if card.credit_limit else None,
-                user_id=card.user_id,
-                account_id=card.account_id,
-                created_at=card.created_at
-            ) for card in cards
-        ],
-        total_count=total_count,
-        message="Cards retrieved successfully"
-    )
+    return FastJSONResponse({
+        "cards": [card_to_dict(card) for card in cards],
+        "total_count": total_count,
+        "message": "Cards retrieved successfully"
+    }, headers={"ETag": etag})
 
 
 @router.get("/account/{account_id}", response_model=CardListResponse)
@@ -185,30 +174,11 @@ async def list_account_cards(
         Card.account_id == account_id
     ).order_by(Card.created_at.desc()).all()
     
-    return CardListResponse(
-        cards=[
-            CardResponse(
-                id=card.id,
-                card_number=card.card_number,
-                card_type=card.card_type,
-                status=card.status,
-                cardholder_name=card.cardholder_name,
-                expiry_month=card.expiry_month,
-                expiry_year=card.expiry_year,
-                is_pin_set=card.is_pin_set,
-                is_contactless_enabled=card.is_contactless_enabled,
-                is_international_enabled=card.is_international_enabled,
-                daily_limit=str(card.daily_limit),
-                monthly_limit=str(card.monthly_limit),
-                credit_limit=str(card.credit_limit) if card.credit_limit else None,
-                user_id=card.user_id,
-                account_id=card.account_id,
-                created_at=card.created_at
-            ) for card in cards
-        ],
-        total_count=len(cards),
-        message="Account cards retrieved successfully"
-    )
+    return FastJSONResponse({
+        "cards": [card_to_dict(card) for card in cards],
+        "total_count": len(cards),
+        "message": "Account cards retrieved successfully"
+    })
 
 
 @router.get("/{card_id}", response_model=CardResponse)
@@ -288,6 +258,7 @@ async def update_card_status(
     old_status = card.status
     card.status = status_data.status
     card.updated_at = datetime.now()
+    bump_user_version(db, card.user_id)
     
     db.commit()
     db.refresh(card)
@@ -315,3 +286,38 @@ async def update_card_status(
         new_status=card.status,
         message="Card status updated successfully"
     )
+
+
+@router.post("/{card_id}/authorize", response_model=CardAuthorizationResponse)
+async def authorize_card_payment(
+    card_id: int,
+    authorization_data: CardAuthorizationRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Authorize a card payment and hold the amount on the linked account"""
+    result = await run_in_threadpool(
+        authorize_card, db, card_id, authorization_data.amount,
+        merchant_name=authorization_data.merchant_name,
+        merchant_category=authorization_data.merchant_category,
+        international=authorization_data.is_international,
+        contactless=authorization_data.is_contactless,
+        user_id=current_user.id
+    )
+    hold = result.hold
+    return FastJSONResponse({
+        "card_id": card_id,
+        "account_id": hold.account_id,
+        "hold_id": hold.id,
+        "transaction_id": hold.transaction_id,
+        "amount": str(hold.amount),
+        "currency": hold.currency,
+        "merchant_name": authorization_data.merchant_name,
+        "merchant_category": authorization_data.merchant_category,
+        "expires_at": hold.expires_at,
+        "daily_spent": str(result.daily_spent),
+        "monthly_spent": str(result.monthly_spent),
+        "fraud_decision": result.fraud_decision.decision,
+        "fraud_rules": result.fraud_decision.rules,
+        "message": "Authorization approved"
+    })
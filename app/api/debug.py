@@ -0,0 +1,40 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.auth import get_current_operator
+from app.core.profiler import recent_profiles, get_profile
+from app.models import User
+
+router = APIRouter(prefix="/debug", tags=["debug"])
+
+
+@router.get("/sql-profiles")
+async def list_sql_profiles(limit: int = 20, current_user: User = Depends(get_current_operator)):
+    """List summaries of the most recent profiled requests (operators only)"""
+    profiles = list(recent_profiles)[-limit:][::-1]
+    return {
+        "profiles": [
+            {
+                "id": p.id,
+                "method": p.method,
+                "path": p.path,
+                "route": p.route,
+                "status_code": p.status_code,
+                "query_count": len(p.statements),
+                "total_ms": round(p.total_time * 1000, 3),
+                "n_plus_one_suspects": len(p.n_plus_one_suspects())
+            } for p in profiles
+        ],
+        "total_count": len(profiles)
+    }
+
+
+@router.get("/sql-profiles/{profile_id}")
+async def get_sql_profile(profile_id: int, current_user: User = Depends(get_current_operator)):
+    """Get the grouped statements and N+1 suspects of a profiled request (operators only)"""
+    profile = get_profile(profile_id)
+    if not profile:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return profile.to_dict()
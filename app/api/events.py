@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Depends, Header, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.config import settings
+from app.database import get_db
+from app.core.auth import get_current_active_user
+from app.core.events import broker
+from app.models import User
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+# Sent when events were lost: the client should refetch accounts/transactions
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+HEARTBEAT_FRAME = b": keep-alive\n\n"
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Stream balance and new transaction events for the current user (SSE)"""
+    user_id = current_user.id
+    # The stream never queries the database, so don't hold a connection open
+    db.close()
+
+    # Subscribe before replaying so nothing published in between is missed
+    subscriber = broker.subscribe(user_id)
+    backlog = []
+    resync = False
+    if last_event_id is not None:
+        replayed = broker.replay(user_id, last_event_id)
+        if replayed is None:
+            resync = True
+        else:
+            backlog = replayed
+
+    async def event_stream():
+        last_sent = 0
+        try:
+            yield b"retry: 3000\n\n"
+            if resync:
+                yield RESYNC_FRAME
+            for event in backlog:
+                yield event.encode()
+                last_sent = event.id
+            while not await request.is_disconnected():
+                events = await subscriber.get(settings.sse_heartbeat_seconds)
+                if subscriber.closed:
+                    # Fell too far behind; the client reconnects with Last-Event-ID
+                    break
+                if subscriber.lagged:
+                    subscriber.lagged = False
+                    yield RESYNC_FRAME
+                if not events:
+                    yield HEARTBEAT_FRAME
+                    continue
+                for event in events:
+                    if event.id > last_sent:
+                        yield event.encode()
+                        last_sent = event.id
+        finally:
+            broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
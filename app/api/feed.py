@@ -0,0 +1,99 @@
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from app.config import settings
+from app.database import get_db
+from app.core import outbox
+from app.schemas.feed import ChangeFeedResponse, OffsetCommitRequest, ConsumerOffsetResponse
+from app.utils.serialization import FastJSONResponse
+
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+
+def verify_feed_token(x_feed_token: Optional[str] = Header(None)) -> None:
+    """Change-feed consumers authenticate with a shared service token."""
+    if not settings.change_feed_token:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Change feed is not enabled"
+        )
+    if x_feed_token != settings.change_feed_token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid feed token"
+        )
+
+
+def require_retained(db: Session, offset: int) -> None:
+    """Refuse offsets whose following events were pruned, instead of silently skipping them."""
+    if not outbox.is_retained(db, offset):
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=f"Events after offset {offset} have been pruned; the oldest retained offset is {outbox.oldest_offset(db)}"
+        )
+
+
+@router.get("/transactions", response_model=ChangeFeedResponse, dependencies=[Depends(verify_feed_token)])
+async def read_transaction_feed(
+    consumer: Optional[str] = Query(None, max_length=100, description="Resume from this consumer's committed offset"),
+    after: Optional[int] = Query(None, ge=0, description="Explicit offset to read after"),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """Read the next batch of committed transaction events"""
+    if after is None:
+        after = outbox.get_offset(db, consumer) if consumer else 0
+    require_retained(db, after)
+    
+    events = outbox.read_events(db, after, limit + 1)
+    has_more = len(events) > limit
+    events = events[:limit]
+    
+    return FastJSONResponse({
+        "events": [outbox.event_to_dict(event) for event in events],
+        "next_offset": events[-1].id if events else after,
+        "latest_offset": outbox.latest_offset(db),
+        "has_more": has_more
+    })
+
+
+@router.get("/consumers/{consumer}", response_model=ConsumerOffsetResponse, dependencies=[Depends(verify_feed_token)])
+async def get_consumer_offset(consumer: str, db: Session = Depends(get_db)):
+    """Get a consumer's committed offset and lag"""
+    offset = outbox.get_offset(db, consumer)
+    return ConsumerOffsetResponse(
+        consumer=consumer,
+        offset=offset,
+        lag=max(outbox.latest_offset(db) - offset, 0)
+    )
+
+
+@router.put("/consumers/{consumer}/offset", response_model=ConsumerOffsetResponse, dependencies=[Depends(verify_feed_token)])
+async def commit_consumer_offset(
+    consumer: str,
+    offset_data: OffsetCommitRequest,
+    db: Session = Depends(get_db)
+):
+    """Commit the last offset a consumer has processed"""
+    latest = outbox.latest_offset(db)
+    if offset_data.offset > latest:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Offset is beyond the end of the feed"
+        )
+    require_retained(db, offset_data.offset)
+    
+    outbox.commit_offset(db, consumer, offset_data.offset)
+    if settings.outbox_prune_consumed:
+        db.flush()
+        outbox.prune_consumed(db, datetime.utcnow() - timedelta(hours=settings.outbox_retention_hours))
+    db.commit()
+    
+    return ConsumerOffsetResponse(
+        consumer=consumer,
+        offset=offset_data.offset,
+        lag=latest - offset_data.offset,
+        message="Offset committed successfully"
+    )
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.core.auth import get_current_active_user
+from app.core.fx import fx_cache
+from app.models import User
+from app.schemas.fx import FxRateResponse, FxRateListResponse
+
+router = APIRouter(prefix="/fx", tags=["fx"])
+
+
+@router.get("/rates", response_model=FxRateListResponse)
+async def list_rates(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Exchange rates currently in force, served from the in-process cache"""
+
+    rates = [
+        FxRateResponse(base_currency=base, quote_currency=quote, rate=rate, effective_at=effective_at)
+        for base, quote, rate, effective_at in fx_cache.latest(db)
+    ]
+    return FxRateListResponse(rates=rates, total_count=len(rates))
@@ -0,0 +1,136 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import Optional
+from datetime import datetime, timedelta
+
+from app.database import get_db
+from app.core.auth import get_current_active_user, is_operator
+from app.core.concurrency import run_serialized
+from app.core.events import publish_transaction
+from app.core.analytics import invalidate_spending
+from app.core import holds
+from app.models import User, Account, Hold, HoldStatus
+from app.schemas.hold import HoldCreateRequest, HoldCaptureRequest, HoldResponse, HoldListResponse
+
+router = APIRouter(prefix="/holds", tags=["holds"])
+
+
+@router.post("/", response_model=HoldResponse, status_code=status.HTTP_201_CREATED)
+async def create_hold(
+    hold_data: HoldCreateRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Reserve funds on one of the user's accounts"""
+    return await run_in_threadpool(
+        run_serialized, db, (hold_data.account_id,), "hold",
+        lambda: _create_hold(hold_data, current_user, db)
+    )
+
+
+def _create_hold(hold_data: HoldCreateRequest, current_user: User, db: Session) -> HoldResponse:
+    expires_at = None
+    if hold_data.expires_in_minutes is not None:
+        expires_at = datetime.now() + timedelta(minutes=hold_data.expires_in_minutes)
+    hold, transaction, account = holds.place_hold(
+        db, hold_data.account_id, hold_data.amount, expires_at,
+        user_id=current_user.id,
+        transaction_type=hold_data.transaction_type,
+        description=hold_data.description,
+        reference=hold_data.reference
+    )
+    db.commit()
+    db.refresh(hold)
+    publish_transaction(transaction, account)
+    return HoldResponse.model_validate(hold)
+
+
+def _get_settleable_hold(db: Session, hold_id: int, current_user: User) -> Hold:
+    """A hold the user may capture or release: one of their own, other than a card
+    authorization's, which only the card network or an operator settles."""
+    operator = is_operator(current_user)
+    query = db.query(Hold).filter(Hold.id == hold_id)
+    if not operator:
+        query = query.join(Account, Hold.account_id == Account.id).filter(Account.user_id == current_user.id)
+    hold = query.first()
+    if not hold:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Hold not found"
+        )
+    if hold.card_id is not None and not operator:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Card authorization holds are settled by the card network"
+        )
+    return hold
+
+
+@router.post("/{hold_id}/capture", response_model=HoldResponse)
+async def capture_hold(
+    hold_id: int,
+    capture_data: Optional[HoldCaptureRequest] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Post a held amount (or part of it) and release the rest"""
+    hold = _get_settleable_hold(db, hold_id, current_user)
+    amount = capture_data.amount if capture_data else None
+    return await run_in_threadpool(
+        run_serialized, db, (hold.account_id,), "hold",
+        lambda: _resolve(db, hold, lambda: holds.capture_hold(db, hold, amount))
+    )
+
+
+@router.post("/{hold_id}/release", response_model=HoldResponse)
+async def release_hold(
+    hold_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Release a hold, returning its amount to the available balance"""
+    hold = _get_settleable_hold(db, hold_id, current_user)
+    return await run_in_threadpool(
+        run_serialized, db, (hold.account_id,), "hold",
+        lambda: _resolve(db, hold, lambda: holds.release_hold(db, hold))
+    )
+
+
+def _resolve(db: Session, hold: Hold, apply) -> HoldResponse:
+    """Capture or release under the account's lock, from the hold's current state"""
+    db.refresh(hold)
+    transaction, account = apply()
+    db.commit()
+    db.refresh(hold)
+    publish_transaction(transaction, account)
+    invalidate_spending(transaction, account)
+    return HoldResponse.model_validate(hold)
+
+
+@router.get("/account/{account_id}", response_model=HoldListResponse)
+async def list_account_holds(
+    account_id: int,
+    hold_status: Optional[HoldStatus] = None,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """List the holds of one of the user's accounts, newest first"""
+    account = db.query(Account).filter(
+        Account.id == account_id,
+        Account.user_id == current_user.id
+    ).first()
+    if not account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found or access denied"
+        )
+
+    query = db.query(Hold).filter(Hold.account_id == account_id)
+    if hold_status is not None:
+        query = query.filter(Hold.status == hold_status)
+    account_holds = query.order_by(Hold.id.desc()).all()
+    return HoldListResponse(
+        holds=[HoldResponse.model_validate(hold) for hold in account_holds],
+        total_count=len(account_holds)
+    )
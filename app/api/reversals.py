@@ -0,0 +1,72 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from typing import List, Optional
+
+from app.database import get_db
+from app.config import settings
+from app.core.auth import get_current_operator
+from app.core.concurrency import run_serialized
+from app.core.events import publish_transaction
+from app.core.analytics import invalidate_spending
+from app.core import reversals
+from app.models import User
+from app.schemas.transaction import ReversalRequest, BulkReversalRequest, ReversalResponse
+from app.utils.serialization import FastJSONResponse, transaction_to_dict
+
+router = APIRouter(prefix="/transactions", tags=["reversals"])
+
+
+@router.post("/reverse", response_model=ReversalResponse)
+async def reverse_transactions(
+    reversal_data: BulkReversalRequest,
+    current_user: User = Depends(get_current_operator),
+    db: Session = Depends(get_db)
+):
+    """Reverse many transactions in one atomic unit of work (operators only)"""
+    if len(reversal_data.transaction_ids) > settings.reversal_max_batch:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.reversal_max_batch} transactions can be reversed per call"
+        )
+    _, account_ids = reversals.affected_accounts(db, reversal_data.transaction_ids)
+    return await run_in_threadpool(
+        run_serialized, db, account_ids, "reversal",
+        lambda: _reverse(db, reversal_data.transaction_ids, reversal_data.reason)
+    )
+
+
+@router.post("/{transaction_id}/reverse", response_model=ReversalResponse)
+async def reverse_transaction(
+    transaction_id: str,
+    reversal_data: Optional[ReversalRequest] = None,
+    current_user: User = Depends(get_current_operator),
+    db: Session = Depends(get_db)
+):
+    """Reverse a transaction and the fee charged with it (operators only)"""
+    found, account_ids = reversals.affected_accounts(db, (transaction_id,))
+    if transaction_id not in found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
+    reason = reversal_data.reason if reversal_data else None
+    return await run_in_threadpool(
+        run_serialized, db, account_ids, "reversal",
+        lambda: _reverse(db, [transaction_id], reason)
+    )
+
+
+def _reverse(db: Session, transaction_ids: List[str], reason: Optional[str]) -> FastJSONResponse:
+    pairs, accounts = reversals.reverse_transactions(db, transaction_ids, reason)
+    by_id = {account.id: account for account in accounts}
+    for original, compensation in pairs:
+        touched = [by_id[account_id] for account_id in (compensation.account_id, compensation.to_account_id)
+                   if account_id in by_id]
+        publish_transaction(compensation, *touched)
+        invalidate_spending(original, *touched)
+    return FastJSONResponse({
+        "reversals": [transaction_to_dict(compensation) for _, compensation in pairs],
+        "reversed_count": len(pairs),
+        "message": "Transactions reversed successfully"
+    })
@@ -0,0 +1,131 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from datetime import datetime
+
+from app.database import get_db
+from app.core.auth import get_current_active_user
+from app.models import User, Account, AccountStatus, StandingOrder, StandingOrderStatus
+from app.schemas.standing_order import (
+    StandingOrderCreateRequest,
+    StandingOrderResponse,
+    StandingOrderListResponse
+)
+
+router = APIRouter(prefix="/standing-orders", tags=["standing orders"])
+
+
+def _local_naive(value: datetime) -> datetime:
+    """Schedules are compared with naive local times, like the rest of the app."""
+    return value.astimezone().replace(tzinfo=None) if value.tzinfo else value
+
+
+@router.post("/", response_model=StandingOrderResponse, status_code=status.HTTP_201_CREATED)
+async def create_standing_order(
+    order_data: StandingOrderCreateRequest,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Create a recurring transfer from one of the user's accounts"""
+
+    from_account = db.query(Account).filter(
+        Account.id == order_data.from_account_id,
+        Account.user_id == current_user.id
+    ).first()
+
+    if not from_account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Source account not found or access denied"
+        )
+
+    to_account = db.query(Account).filter(Account.id == order_data.to_account_id).first()
+
+    if not to_account:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Destination account not found"
+        )
+
+    if from_account.status != AccountStatus.ACTIVE or to_account.status != AccountStatus.ACTIVE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Both accounts must be active"
+        )
+
+    if from_account.id == to_account.id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot transfer to the same account"
+        )
+
+    start_at = _local_naive(order_data.start_at)
+    end_at = _local_naive(order_data.end_at) if order_data.end_at else None
+    if end_at is not None and end_at < start_at:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="End time must not be before the start time"
+        )
+
+    order = StandingOrder(
+        user_id=current_user.id,
+        from_account_id=from_account.id,
+        to_account_id=to_account.id,
+        amount=order_data.amount,
+        description=order_data.description,
+        frequency=order_data.frequency,
+        start_at=start_at,
+        end_at=end_at,
+        next_run_at=start_at,
+        run_count=0,
+        status=StandingOrderStatus.ACTIVE,
+        failure_count=0
+    )
+    db.add(order)
+    db.commit()
+    db.refresh(order)
+
+    return StandingOrderResponse.model_validate(order)
+
+
+@router.get("/", response_model=StandingOrderListResponse)
+async def list_standing_orders(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """List the current user's standing orders"""
+
+    orders = db.query(StandingOrder).filter(
+        StandingOrder.user_id == current_user.id
+    ).order_by(StandingOrder.id).all()
+
+    return StandingOrderListResponse(
+        standing_orders=[StandingOrderResponse.model_validate(order) for order in orders],
+        total_count=len(orders)
+    )
+
+
+@router.delete("/{order_id}", response_model=StandingOrderResponse)
+async def cancel_standing_order(
+    order_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Cancel a standing order; runs already executed are not affected"""
+
+    order = db.query(StandingOrder).filter(
+        StandingOrder.id == order_id,
+        StandingOrder.user_id == current_user.id
+    ).first()
+
+    if not order:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Standing order not found"
+        )
+
+    if order.status == StandingOrderStatus.ACTIVE:
+        order.status = StandingOrderStatus.CANCELLED
+        db.commit()
+        db.refresh(order)
+
+    return StandingOrderResponse.model_validate(order)
@@ -3,19 +3,26 @@ from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime, date
 from decimal import Decimal
+import uuid
 
 from app.database import get_db
 from app.core.auth import get_current_active_user
-from app.models import User, Account, Transaction, Statement, TransactionType, AccountStatus
+from app.core import archive
+from app.core.versioning import bump_user_version
+from app.models import User, Account, Transaction, Statement, TransactionType, AccountStatus, POSTED_STATUSES
 from app.schemas.statement import (
     StatementRequest,
     StatementResponse,
     StatementDetailResponse,
     StatementListResponse
 )
+from app.core.singleflight import SingleFlight, coalesced_read
+from app.utils.serialization import FastJSONResponse, statement_to_dict
 
 router = APIRouter(prefix="/statements", tags=["statements"])
 
+list_statements_flight = SingleFlight("statements.list")
+
 
 @router.post("/generate", response_model=StatementResponse, status_code=status.HTTP_201_CREATED)
 async def generate_statement(
@@ -60,12 +67,19 @@ async def generate_statement(
             detail="Date range cannot exceed 12 months"
         )
     
-    # Get transactions for the period
+    # Get posted transactions for the period (older ones may live in archive files).
+    # Reversed originals stay in, as their compensating entries are posted too.
     transactions = db.query(Transaction).filter(
         Transaction.account_id == account.id,
+        Transaction.status.in_(POSTED_STATUSES),
         Transaction.created_at >= start_date,
         Transaction.created_at <= end_date
     ).order_by(Transaction.created_at).all()
+    transactions += [
+        transaction for transaction in archive.archived_in_range(db, account.id, start_date, end_date)
+        if transaction.status in POSTED_STATUSES
+    ]
+    transactions.sort(key=lambda t: t.created_at)
     
     # Calculate statement totals
     total_deposits = Decimal("0.00")
@@ -73,28 +87,31 @@ async def generate_statement(
     total_transfers_out = Decimal("0.00")
     total_transfers_in = Decimal("0.00")
     total_fees = Decimal("0.00")
+    total_interest = Decimal("0.00")
     
     for transaction in transactions:
         amount = Decimal(str(transaction.amount))
-        fee = Decimal(str(transaction.fee))
         
-        if transaction.transaction_type == TransactionType.deposit:
+        # Fees are posted as FEE transactions; the fee column only annotates the charged transaction
+        if transaction.transaction_type == TransactionType.FEE:
+            total_fees += amount
+        elif transaction.transaction_type == TransactionType.INTEREST:
+            total_interest += amount
+        elif transaction.transaction_type in (TransactionType.DEPOSIT, TransactionType.REFUND):
             total_deposits += amount
-        elif transaction.transaction_type == TransactionType.withdrawal:
+        elif transaction.transaction_type in (TransactionType.WITHDRAWAL, TransactionType.PAYMENT):
             total_withdrawals += amount
-        elif transaction.transaction_type == TransactionType.transfer:
+        elif transaction.transaction_type == TransactionType.TRANSFER:
             if transaction.from_account_id == account.id:
                 total_transfers_out += amount
             else:
                 total_transfers_in += amount
-        
-        total_fees += fee
     
     # Calculate net change
-    net_change = total_deposits + total_transfers_in - total_withdrawals - total_transfers_out - total_fees
+    net_change = total_deposits + total_transfers_in + total_interest - total_withdrawals - total_transfers_out - total_fees
     
     # Generate statement number
-    statement_number = f"STMT{account.account_number}{start_date.strftime('%Y%m')}{datetime.now().strftime('%H%M%S')}"
+    statement_number = f"STMT{account.account_number}{start_date.strftime('%Y%m')}{datetime.now().strftime('%H%M%S')}{uuid.uuid4().hex[:6].upper()}"
     
     # Create statement record
     statement = Statement(
@@ -107,13 +124,14 @@ async def generate_statement(
         total_deposits=total_deposits,
         total_withdrawals=total_withdrawals,
         total_fees=total_fees,
-        total_interest=Decimal("0.00"),  # Would calculate based on interest rates
+        total_interest=total_interest,
         total_transactions=len(transactions),
         currency=account.currency,
         is_generated=True
     )
     
     db.add(statement)
+    bump_user_version(db, current_user.id)
     db.commit()
     db.refresh(statement)
     
@@ -148,53 +166,40 @@ async def list_account_statements(
     db: Session = Depends(get_db)
 ):
     """List all statements for a specific account"""
+    user_id = current_user.id
+    data_version = current_user.data_version
     
-    # Verify account ownership
-    account = db.query(Account).filter(
-        Account.id == account_id,
-        Account.user_id == current_user.id
-    ).first()
-    
-    if not account:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found or access denied"
-        )
-    
-    # Get statements
-    statements = db.query(Statement).filter(
-        Statement.account_id == account_id
-    ).order_by(Statement.statement_period_start.desc()).offset(skip).limit(limit).all()
-    
-    total_count = db.query(Statement).filter(
-        Statement.account_id == account_id
-    ).count()
+    def load(db: Session) -> dict:
+        # Verify account ownership
+        account = db.query(Account).filter(
+            Account.id == account_id,
+            Account.user_id == user_id
+        ).first()
+        
+        if not account:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Account not found or access denied"
+            )
+        
+        # Get statements
+        statements = db.query(Statement).filter(
+            Statement.account_id == account_id
+        ).order_by(Statement.statement_period_start.desc()).offset(skip).limit(limit).all()
+        
+        total_count = db.query(Statement).filter(
+            Statement.account_id == account_id
+        ).count()
+        
+        return {
+            "statements": [statement_to_dict(stmt) for stmt in statements],
+            "total_count": total_count,
+            "message": "Statements retrieved successfully"
+        }
     
-    return StatementListResponse(
-        statements=[
-            StatementResponse(
-                id=stmt.id,
-                statement_number=stmt.statement_number,
-                statement_period_start=stmt.statement_period_start.date(),
-                statement_period_end=stmt.statement_period_end.date(),
-                account_id=stmt.account_id,
-                opening_balance=str(stmt.opening_balance),
-                closing_balance=str(stmt.closing_balance),
-                total_deposits=str(stmt.total_deposits),
-                total_withdrawals=str(stmt.total_withdrawals),
-                total_transfers_in="0.00",  # Not stored in model
-                total_transfers_out="0.00",  # Not stored in model
-                total_fees=str(stmt.total_fees),
-                total_interest=str(stmt.total_interest),
-                transaction_count=stmt.total_transactions,
-                currency=stmt.currency,
-                is_generated=stmt.is_generated,
-                created_at=stmt.created_at
-            ) for stmt in statements
-        ],
-        total_count=total_count,
-        message="Statements retrieved successfully"
-    )
+    # Generating a statement bumps the data version, so a list requested after it never joins an older load
+    payload = await coalesced_read(list_statements_flight, (user_id, data_version, account_id, skip, limit), load)
+    return FastJSONResponse(payload)
 
 
 @router.get("/{statement_id}", response_model=StatementDetailResponse)
@@ -227,12 +232,16 @@ async def get_statement_detail(
             detail="Access denied to this statement"
         )
     
-    # Get transactions for this statement period
+    # Get transactions for this statement period (older ones may live in archive files)
     transactions = db.query(Transaction).filter(
         Transaction.account_id == statement.account_id,
         Transaction.created_at >= statement.statement_period_start,
         Transaction.created_at <= statement.statement_period_end
     ).order_by(Transaction.created_at).all()
+    transactions += archive.archived_in_range(
+        db, statement.account_id, statement.statement_period_start, statement.statement_period_end
+    )
+    transactions.sort(key=lambda t: t.created_at)
     
     return StatementDetailResponse(
         statement=StatementResponse(
@@ -264,7 +273,7 @@ async def get_statement_detail(
                 "currency": t.currency,
                 "fee": str(t.fee),
                 "description": t.description,
-                "reference": t.reference,
+                "reference": t.reference_number,
                 "created_at": t.created_at
             } for t in transactions
         ],
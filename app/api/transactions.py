@@ -1,12 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from decimal import Decimal
 import uuid
 from datetime import datetime
 
 from app.database import get_db
 from app.core.auth import get_current_active_user
+from app.core.concurrency import run_serialized
+from app.core.versioning import bump_user_version
+from app.core.events import publish_transaction
+from app.core.analytics import invalidate_spending
+from app.core import fraud, fx
+from app.core.fees import fee_schedule
+from app.core.outbox import record_transaction
+from app.core import archive
+from app.core import settlement
+from app.config import settings
 from app.models import User, Account, Transaction, TransactionType, TransactionStatus, AccountStatus
 from app.schemas.transaction import (
     TransactionCreateRequest,
@@ -15,6 +26,7 @@ from app.schemas.transaction import (
     TransactionListResponse,
     TransferResponse
 )
+from app.utils.serialization import FastJSONResponse, transaction_to_dict
 
 router = APIRouter(prefix="/transactions", tags=["transactions"])
 
@@ -24,6 +36,24 @@ def generate_transaction_id() -> str:
     return f"TXN{uuid.uuid4().hex[:12].upper()}"
 
 
+def fee_transaction(transaction: Transaction, account_id: int, fee: Decimal) -> Transaction:
+    """The FEE transaction charged for `transaction`, posted in the same commit"""
+    charge = Transaction(
+        transaction_id=generate_transaction_id(),
+        transaction_type=TransactionType.FEE,
+        status=TransactionStatus.COMPLETED,
+        amount=fee,
+        currency=transaction.currency,
+        fee=Decimal("0.00"),
+        account_id=account_id,
+        description=f"Fee for {transaction.transaction_id}",
+        reference_number=transaction.transaction_id
+    )
+    if transaction.created_at is not None:
+        charge.created_at = transaction.created_at
+    return charge
+
+
 @router.post("/", response_model=TransactionResponse, status_code=status.HTTP_201_CREATED)
 async def create_transaction(
     transaction_data: TransactionCreateRequest,
@@ -31,6 +61,15 @@ async def create_transaction(
     db: Session = Depends(get_db)
 ):
     """Create a new transaction (deposit/withdrawal)"""
+    return await run_in_threadpool(
+        run_serialized, db, (transaction_data.account_id,), "transaction",
+        lambda: _create_transaction(transaction_data, current_user, db),
+        lambda committed: _transaction_created(db, *committed)
+    )
+
+
+def _create_transaction(transaction_data: TransactionCreateRequest, current_user: User, db: Session):
+    """Apply and commit a deposit/withdrawal while holding the account's lock"""
     
     # Get the account and verify ownership
     account = db.query(Account).filter(
@@ -58,9 +97,17 @@ async def create_transaction(
             detail="Transaction amount must be positive"
         )
     
+    # Look up the fee in the compiled schedule
+    fee = fee_schedule.fee(db, account.account_type, transaction_data.transaction_type, account.currency, amount)
+    if transaction_data.transaction_type == TransactionType.DEPOSIT and account.available_balance + amount < fee:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient funds"
+        )
+    
     # For withdrawals, check sufficient balance
     if transaction_data.transaction_type == TransactionType.WITHDRAWAL:
-        if account.available_balance < amount:
+        if account.available_balance < amount + fee:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Insufficient funds"
@@ -81,6 +128,10 @@ async def create_transaction(
                 detail="Daily withdrawal limit exceeded"
             )
     
+    # Screen with the fraud rules before anything is written
+    fraud_context = fraud.TransactionContext(transaction_data.transaction_type.value, account.id, amount)
+    fraud_decision = fraud.screen(fraud_context)
+    
     # Create transaction
     transaction = Transaction(
         transaction_id=generate_transaction_id(),
@@ -88,27 +139,58 @@ async def create_transaction(
         status=TransactionStatus.PENDING,
         amount=amount,
         currency=account.currency,
-        fee=Decimal("0.00"),  # No fees for basic transactions
+        fee=fee,
         account_id=account.id,
         description=transaction_data.description,
         reference_number=transaction_data.reference
     )
     
     db.add(transaction)
-    
-    # Update account balance
-    if transaction_data.transaction_type == TransactionType.DEPOSIT:
-        account.balance += amount
-        account.available_balance += amount
-        transaction.status = TransactionStatus.COMPLETED
-    else:  # withdrawal
-        account.balance -= amount
-        account.available_balance -= amount
-        transaction.status = TransactionStatus.COMPLETED
+    charge = fee_transaction(transaction, account.id, fee) if fee else None
+    if charge is not None:
+        db.add(charge)
+    
+    if settings.settlement_deferred:
+        # Debits reserve the available balance now; the settlement worker posts the balances
+        settlement.defer(transaction, charge)
+        if transaction_data.transaction_type != TransactionType.DEPOSIT:
+            account.available_balance -= amount
+        if charge is not None:
+            account.available_balance -= fee
+    else:
+        if charge is not None:
+            account.balance -= fee
+            account.available_balance -= fee
+        
+        # Update account balance
+        if transaction_data.transaction_type == TransactionType.DEPOSIT:
+            account.balance += amount
+            account.available_balance += amount
+            transaction.status = TransactionStatus.COMPLETED
+        else:  # withdrawal
+            account.balance -= amount
+            account.available_balance -= amount
+            transaction.status = TransactionStatus.COMPLETED
     
     account.last_activity = datetime.now()
+    bump_user_version(db, account.user_id)
+    record_transaction(db, transaction)
+    if charge is not None:
+        record_transaction(db, charge)
+    fraud.record_review(db, transaction, fraud_decision)
     db.commit()
+    return transaction, account, charge, fraud_context, fraud_decision
+
+
+def _transaction_created(db: Session, transaction: Transaction, account: Account, charge: Optional[Transaction],
+                         fraud_context: fraud.TransactionContext, fraud_decision: fraud.FraudDecision) -> TransactionResponse:
+    """Post-commit work of a deposit/withdrawal; runs once, outside the busy retry"""
     db.refresh(transaction)
+    fraud.record_committed(fraud_context)
+    publish_transaction(transaction, account)
+    invalidate_spending(transaction, account)
+    if charge is not None:
+        publish_transaction(charge, account)
     
     return TransactionResponse(
         id=transaction.id,
@@ -122,6 +204,8 @@ async def create_transaction(
         description=transaction.description,
         reference=transaction.reference_number,
         created_at=transaction.created_at,
+        fraud_decision=fraud_decision.decision,
+        fraud_rules=fraud_decision.rules,
         message="Transaction created successfully"
     )
 
@@ -133,6 +217,15 @@ async def transfer_money(
     db: Session = Depends(get_db)
 ):
     """Transfer money between accounts"""
+    return await run_in_threadpool(
+        run_serialized, db, (transfer_data.from_account_id, transfer_data.to_account_id), "transfer",
+        lambda: _transfer_money(transfer_data, current_user, db),
+        lambda committed: _transfer_completed(db, *committed)
+    )
+
+
+def _transfer_money(transfer_data: TransferRequest, current_user: User, db: Session):
+    """Apply and commit a transfer while holding both accounts' locks"""
     
     # Get source account and verify ownership
     from_account = db.query(Account).filter(
@@ -184,8 +277,11 @@ async def transfer_money(
             detail="Transfer amount must be positive"
         )
     
+    # Look up the fee in the compiled schedule; it is charged to the source
+    fee = fee_schedule.fee(db, from_account.account_type, TransactionType.TRANSFER, from_account.currency, amount)
+    
     # Check sufficient balance
-    if from_account.available_balance < amount:
+    if from_account.available_balance < amount + fee:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Insufficient funds"
@@ -206,6 +302,27 @@ async def transfer_money(
             detail="Daily transfer limit exceeded"
         )
     
+    # Cross-currency transfers credit the destination in its own currency
+    credited_amount, exchange_rate = amount, None
+    if to_account.currency != from_account.currency:
+        credited_amount, exchange_rate = fx.convert(db, amount, from_account.currency, to_account.currency)
+    
+    # Screen with the fraud rules before anything is written
+    is_new_payee = None
+    if fraud.needs_payee_history(amount):
+        is_new_payee = to_account.user_id != current_user.id and db.query(Transaction.id).filter(
+            Transaction.from_account_id == from_account.id,
+            Transaction.to_account_id == to_account.id,
+            # Deferred transfers stay pending until settlement, but are already history
+            Transaction.status.in_((TransactionStatus.COMPLETED, TransactionStatus.PENDING))
+        ).first() is None
+    fraud_context = fraud.TransactionContext(
+        "transfer", from_account.id, amount,
+        destination_account_id=to_account.id,
+        is_new_payee=is_new_payee
+    )
+    fraud_decision = fraud.screen(fraud_context)
+    
     # Create transfer transaction
     transfer_transaction = Transaction(
         transaction_id=generate_transaction_id(),
@@ -213,7 +330,10 @@ async def transfer_money(
         status=TransactionStatus.COMPLETED,
         amount=amount,
         currency=from_account.currency,
-        fee=Decimal("0.00"),  # No fees for internal transfers
+        fee=fee,
+        exchange_rate=exchange_rate,
+        converted_amount=credited_amount if exchange_rate is not None else None,
+        converted_currency=to_account.currency if exchange_rate is not None else None,
         account_id=from_account.id,
         from_account_id=from_account.id,
         to_account_id=to_account.id,
@@ -222,18 +342,42 @@ async def transfer_money(
     )
     
     db.add(transfer_transaction)
+    charge = fee_transaction(transfer_transaction, from_account.id, fee) if fee else None
+    if charge is not None:
+        db.add(charge)
     
     # Update account balances
-    from_account.balance -= amount
-    from_account.available_balance -= amount
+    if settings.settlement_deferred:
+        # The source's available balance is reserved now; the settlement worker posts the rest
+        settlement.defer(transfer_transaction, charge)
+        from_account.available_balance -= amount + fee
+    else:
+        from_account.balance -= amount + fee
+        from_account.available_balance -= amount + fee
+        to_account.balance += credited_amount
+        to_account.available_balance += credited_amount
+        to_account.last_activity = datetime.now()
     from_account.last_activity = datetime.now()
-    
-    to_account.balance += amount
-    to_account.available_balance += amount
-    to_account.last_activity = datetime.now()
+    bump_user_version(db, from_account.user_id, to_account.user_id)
+    record_transaction(db, transfer_transaction)
+    if charge is not None:
+        record_transaction(db, charge)
+    fraud.record_review(db, transfer_transaction, fraud_decision)
     
     db.commit()
+    return transfer_transaction, from_account, to_account, charge, fraud_context, fraud_decision, exchange_rate
+
+
+def _transfer_completed(db: Session, transfer_transaction: Transaction, from_account: Account, to_account: Account,
+                        charge: Optional[Transaction], fraud_context: fraud.TransactionContext,
+                        fraud_decision: fraud.FraudDecision, exchange_rate: Optional[Decimal]) -> TransferResponse:
+    """Post-commit work of a transfer; runs once, outside the busy retry"""
     db.refresh(transfer_transaction)
+    fraud.record_committed(fraud_context)
+    publish_transaction(transfer_transaction, from_account, to_account)
+    invalidate_spending(transfer_transaction, from_account, to_account)
+    if charge is not None:
+        publish_transaction(charge, from_account)
     
     return TransferResponse(
         from_transaction=TransactionResponse(
@@ -244,12 +388,17 @@ async def transfer_money(
             amount=str(transfer_transaction.amount),
             currency=transfer_transaction.currency,
             fee=str(transfer_transaction.fee),
+            exchange_rate=str(exchange_rate) if exchange_rate is not None else None,
+            converted_amount=str(transfer_transaction.converted_amount) if exchange_rate is not None else None,
+            converted_currency=transfer_transaction.converted_currency,
             account_id=transfer_transaction.account_id,
             from_account_id=transfer_transaction.from_account_id,
             to_account_id=transfer_transaction.to_account_id,
             description=transfer_transaction.description,
             reference=transfer_transaction.reference_number,
-            created_at=transfer_transaction.created_at
+            created_at=transfer_transaction.created_at,
+            fraud_decision=fraud_decision.decision,
+            fraud_rules=fraud_decision.rules
         ),
         to_transaction=TransactionResponse(
             id=transfer_transaction.id,
@@ -259,14 +408,19 @@ async def transfer_money(
             amount=str(transfer_transaction.amount),
             currency=transfer_transaction.currency,
             fee=str(transfer_transaction.fee),
+            exchange_rate=str(exchange_rate) if exchange_rate is not None else None,
+            converted_amount=str(transfer_transaction.converted_amount) if exchange_rate is not None else None,
+            converted_currency=transfer_transaction.converted_currency,
             account_id=to_account.id,
             from_account_id=transfer_transaction.from_account_id,
             to_account_id=transfer_transaction.to_account_id,
             description=transfer_transaction.description,
             reference=transfer_transaction.reference_number,
-            created_at=transfer_transaction.created_at
+            created_at=transfer_transaction.created_at,
+            fraud_decision=fraud_decision.decision,
+            fraud_rules=fraud_decision.rules
         ),
-        message="Transfer completed successfully"
+        message="Transfer accepted for settlement" if settings.settlement_deferred else "Transfer completed successfully"
     )
 
 
@@ -292,36 +446,36 @@ async def list_account_transactions(
             detail="Account not found or access denied"
         )
     
+    archived_count, newest_archived = archive.archive_summary(db, account_id)
+    
     # Get transactions
-    transactions = db.query(Transaction).filter(
+    query = db.query(Transaction).filter(
         Transaction.account_id == account_id
-    ).order_by(Transaction.created_at.desc()).offset(skip).limit(limit).all()
+    ).order_by(Transaction.created_at.desc())
+    
+    if not archived_count:
+        transactions = query.offset(skip).limit(limit).all()
+    else:
+        # Merge in archived rows only when the page reaches past the newest of them
+        window = skip + limit
+        transactions = query.limit(window).all()
+        if len(transactions) < window or transactions[-1].created_at <= newest_archived:
+            transactions = sorted(
+                transactions + archive.archived_history(db, account_id, window),
+                key=lambda t: t.created_at,
+                reverse=True
+            )
+        transactions = transactions[skip:window]
     
     total_count = db.query(Transaction).filter(
         Transaction.account_id == account_id
-    ).count()
-    
-    return TransactionListResponse(
-        transactions=[
-            TransactionResponse(
-                id=t.id,
-                transaction_id=t.transaction_id,
-                transaction_type=t.transaction_type,
-                status=t.status,
-                amount=str(t.amount),
-                currency=t.currency,
-                fee=str(t.fee),
-                account_id=t.account_id,
-                from_account_id=t.from_account_id,
-                to_account_id=t.to_account_id,
-                description=t.description,
-                reference=t.reference_number,
-                created_at=t.created_at
-            ) for t in transactions
-        ],
-        total_count=total_count,
-        message="Transactions retrieved successfully"
-    )
+    ).count() + archived_count
+    
+    return FastJSONResponse({
+        "transactions": [transaction_to_dict(t) for t in transactions],
+        "total_count": total_count,
+        "message": "Transactions retrieved successfully"
+    })
 
 
 @router.get("/{transaction_id}", response_model=TransactionResponse)
@@ -334,7 +488,7 @@ async def get_transaction(
     
     transaction = db.query(Transaction).filter(
         Transaction.transaction_id == transaction_id
-    ).first()
+    ).first() or archive.find_archived(db, transaction_id)
     
     if not transaction:
         raise HTTPException(
@@ -366,7 +520,7 @@ async def get_transaction(
         from_account_id=transaction.from_account_id,
         to_account_id=transaction.to_account_id,
         description=transaction.description,
-        reference=transaction.reference,
+        reference=transaction.reference_number,
         created_at=transaction.created_at,
         message="Transaction details retrieved successfully"
     )
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
 
 
 class Settings(BaseSettings):
@@ -19,6 +20,114 @@ class Settings(BaseSettings):
     # Security
     bcrypt_rounds: int = 12
     
+    # Metrics
+    metrics_enabled: bool = True
+    metrics_multiproc_dir: Optional[str] = None  # Shared directory for multi-worker aggregation
+    
+    # SQL profiling (per request via the X-SQL-Profile header in debug mode)
+    sql_profiler_enabled: bool = False  # Profile every request
+    sql_profiler_repeat_threshold: int = 3  # Repeats of one statement shape flagged as N+1
+    
+    # Server-Sent Events
+    sse_queue_size: int = 100  # Events buffered per subscriber
+    sse_replay_size: int = 256  # Events kept per user for Last-Event-ID resumption
+    sse_replay_users: int = 10000  # Users with a replay history; the least recently active is dropped first
+    sse_overflow_policy: str = "drop_oldest"  # or "disconnect"
+    sse_heartbeat_seconds: float = 15.0
+    
+    # Transaction change feed (transactional outbox)
+    change_feed_token: Optional[str] = None  # X-Feed-Token for consumers; feed disabled when unset
+    outbox_prune_consumed: bool = False  # Delete events all consumers have committed past
+    outbox_retention_hours: float = 168.0  # Minimum age of an event before it may be pruned
+    
+    # Write serialization for money movements
+    account_lock_timeout_seconds: float = 10.0  # 503 when an account lock can't be taken in time
+    db_busy_retries: int = 3  # Retries of a unit of work after SQLITE_BUSY
+    db_busy_backoff_ms: float = 50.0  # Base of the jittered exponential backoff
+    
+    # Transaction archival
+    archive_dir: str = "./archive"  # Per-month archive SQLite files
+    archive_horizon_days: int = 365  # Only transactions older than this are archived
+    archive_batch_size: int = 5000
+    
+    # Spending analytics cache, per (user, month)
+    analytics_cache_size: int = 10000
+    analytics_cache_ttl_seconds: float = 300.0  # Bounds staleness from writes in other workers
+    
+    # Fraud and velocity rules (sliding windows per account/card/destination)
+    fraud_enabled: bool = True
+    fraud_window_seconds: float = 600.0
+    fraud_max_withdrawals: int = 10  # Withdrawals and card payments per account per window
+    fraud_max_outflow_amount: float = 20000.00  # Money out of one account per window
+    fraud_max_card_transactions: int = 20  # Per card per window
+    fraud_max_incoming_transfers: int = 20  # Transfers into one account per window (flagged for review)
+    fraud_new_payee_threshold: float = 5000.00  # Transfers to a new payee at or above this are declined
+    fraud_max_tracked_keys: int = 100000
+    fraud_idle_key_seconds: float = 3600.0  # Counters untouched this long are evicted
+    
+    # Rate limiting (token buckets per user, or per client IP when unauthenticated)
+    rate_limit_enabled: bool = True
+    rate_limits: Dict[str, str] = {  # "METHOD /path/{param}" -> "count/period"
+        "POST /api/v1/auth/login": "10/minute",
+        "POST /api/v1/auth/signup": "5/minute",
+        "GET /api/v1/transactions/account/{account_id}": "120/minute",
+    }
+    rate_limit_default: Optional[str] = None  # Applied to every other route when set
+    rate_limit_backend: str = "memory"  # or "sqlite" to share buckets between workers
+    rate_limit_sqlite_path: str = "./ratelimit.db"
+    
+    # Request coalescing for identical concurrent reads
+    singleflight_enabled: bool = True
+    
+    # Standing orders
+    standing_order_batch_size: int = 1000  # Due orders executed per commit
+    
+    # Foreign exchange
+    fx_cache_refresh_seconds: float = 30.0  # How often to look for rate changes made by other processes
+    
+    # Fees
+    fee_rules_refresh_seconds: float = 30.0  # How often to look for fee rule changes made by other processes
+    
+    # Interest accrual: annual rates in percent per account type, as (balance floor, rate) tiers;
+    # each tier's rate applies to the part of the balance between its floor and the next
+    interest_rate_tiers: Dict[str, List[Tuple[Decimal, Decimal]]] = {
+        "savings": [(Decimal("0"), Decimal("0.50")), (Decimal("10000"), Decimal("1.00"))],
+        "money_market": [(Decimal("0"), Decimal("1.50")), (Decimal("25000"), Decimal("2.25")), (Decimal("100000"), Decimal("2.75"))],
+        "certificate_of_deposit": [(Decimal("0"), Decimal("4.00"))],
+    }
+    interest_day_count: int = 365  # Days per year used to derive the daily rate
+    interest_chunk_size: int = 10000  # Accounts accrued per commit
+    
+    # Holds (pre-authorizations reserving available balance)
+    hold_default_expiry_minutes: int = 7 * 24 * 60  # Holds not captured or released in time are expired
+    hold_sweep_batch_size: int = 1000  # Expired holds released per commit
+    hold_sweep_interval_seconds: float = 60.0  # Pause between sweeps when the sweeper runs in a loop
+    
+    # Settlement: when deferred, deposits, withdrawals and transfers land as pending and a worker posts them
+    settlement_deferred: bool = False
+    settlement_delay_seconds: float = 0.0  # Minimum time a transaction stays pending
+    settlement_batch_size: int = 500  # Transactions claimed and settled per commit
+    settlement_lease_seconds: float = 60.0  # Claims older than this may be taken over by another worker
+    settlement_interval_seconds: float = 1.0  # Pause between runs when the worker runs in a loop
+    
+    # Reversals (operator only)
+    operator_emails: List[str] = []  # Users allowed to reverse transactions
+    reversal_max_batch: int = 10000  # Transactions per bulk reversal call
+    
+    # Card network listener (binary authorization messages over TCP)
+    card_network_host: str = "127.0.0.1"
+    card_network_port: int = 8583
+    card_network_workers: int = 2  # Threads running authorizations; SQLite takes one writer at a time
+    card_network_max_in_flight: int = 64  # Pipelined authorizations per connection
+    
+    # Card numbers: 16-digit Luhn-valid PANs issued from these BINs, in order, per card type
+    card_bin_ranges: Dict[str, List[str]] = {
+        "debit": ["453210", "453211"],
+        "credit": ["545454"],
+        "prepaid": ["603456"],
+    }
+    card_number_block_size: int = 1000  # Sequences a worker reserves per database round trip
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
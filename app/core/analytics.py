@@ -0,0 +1,226 @@
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, and_, cast, func, or_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core import archive
+from app.models import Transaction, TransactionType, TransactionStatus
+
+UNCATEGORIZED = "uncategorized"
+UNKNOWN_MERCHANT = "unknown"
+
+# Money leaving the customer; transfers count only when they leave the user's accounts
+SPEND_TYPES = (TransactionType.WITHDRAWAL, TransactionType.PAYMENT, TransactionType.FEE)
+
+
+def parse_month(value: str) -> datetime:
+    """First instant of a YYYY-MM month."""
+    return datetime.strptime(value, "%Y-%m")
+
+
+def next_month(month_start: datetime) -> datetime:
+    return (month_start + timedelta(days=32)).replace(day=1)
+
+
+def format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    cents = abs(cents)
+    return f"{sign}{cents // 100}.{cents % 100:02d}"
+
+
+class SpendingCache:
+    """LRU cache of monthly spending breakdowns keyed by (user id, month).
+
+    Writers bump a per-key generation when they invalidate; a breakdown
+    computed concurrently with a write is only stored if the generation it
+    started from is still current, so it can never resurrect stale totals.
+    Generations come from one counter and only the `max_entries` most recent
+    are tracked; keys without one share a floor that rises past every
+    forgotten generation, so forgetting one never makes a stale load current.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[int, str], tuple]" = OrderedDict()
+        self._generations: "OrderedDict[Tuple[int, str], int]" = OrderedDict()  # oldest invalidation first
+        self._counter = itertools.count(1)
+        self._floor = 0  # Generation of keys not in _generations
+
+    def get(self, user_id: int, month: str) -> Tuple[Optional[dict], int]:
+        """Cached breakdown (or None) and the generation to pass to `put`."""
+        key = (user_id, month)
+        with self._lock:
+            generation = self._generations.get(key, self._floor)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, generation
+            value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None, generation
+            self._entries.move_to_end(key)
+            return value, generation
+
+    def put(self, user_id: int, month: str, value: dict, generation: int) -> None:
+        key = (user_id, month)
+        with self._lock:
+            if self._generations.get(key, self._floor) != generation:
+                return
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int, month: str) -> None:
+        key = (user_id, month)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._generations[key] = next(self._counter)
+            self._generations.move_to_end(key)
+            while len(self._generations) > self.max_entries:
+                _, forgotten = self._generations.popitem(last=False)
+                self._floor = forgotten
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._floor = next(self._counter)
+
+
+spending_cache = SpendingCache(
+    max_entries=settings.analytics_cache_size,
+    ttl=settings.analytics_cache_ttl_seconds
+)
+
+
+def invalidate_spending(transaction, *accounts) -> None:
+    """Drop the cached month of a committed transaction for each account owner."""
+    if transaction.created_at is None:
+        return
+    month = transaction.created_at.strftime("%Y-%m")
+    for user_id in {account.user_id for account in accounts}:
+        spending_cache.invalidate(user_id, month)
+
+
+def _spend_filter(account_ids: List[int]):
+    return and_(
+        Transaction.account_id.in_(account_ids),
+        Transaction.status == TransactionStatus.COMPLETED,
+        or_(
+            Transaction.transaction_type.in_(SPEND_TYPES),
+            and_(
+                Transaction.transaction_type == TransactionType.TRANSFER,
+                or_(Transaction.to_account_id.is_(None), Transaction.to_account_id.notin_(account_ids))
+            )
+        )
+    )
+
+
+def _is_spend(transaction: Transaction, account_ids: List[int]) -> bool:
+    if transaction.status != TransactionStatus.COMPLETED:
+        return False
+    if transaction.transaction_type in SPEND_TYPES:
+        return True
+    return transaction.transaction_type == TransactionType.TRANSFER and transaction.to_account_id not in account_ids
+
+
+def _to_cents(amount) -> int:
+    return int((Decimal(str(amount)) * 100).to_integral_value())
+
+
+def _aggregate(db: Session, account_ids: List[int], start: datetime, end: datetime) -> Dict[str, dict]:
+    """Integer-cent totals per month -> (category, merchant) for [start, end)."""
+    month = func.strftime("%Y-%m", Transaction.created_at)
+    category = func.coalesce(Transaction.merchant_category, UNCATEGORIZED)
+    merchant = func.coalesce(Transaction.merchant_name, UNKNOWN_MERCHANT)
+    rows = db.query(
+        month,
+        category,
+        merchant,
+        func.sum(cast(func.round(Transaction.amount * 100), Integer)),
+        func.count(Transaction.id)
+    ).filter(
+        _spend_filter(account_ids),
+        Transaction.created_at >= start,
+        Transaction.created_at < end
+    ).group_by(month, category, merchant).all()
+
+    totals: Dict[str, dict] = {}
+    for month_key, category_name, merchant_name, cents, count in rows:
+        bucket = totals.setdefault(month_key, {}).setdefault((category_name, merchant_name), [0, 0])
+        bucket[0] += cents
+        bucket[1] += count
+
+    # Archived months are aggregated from the archive files
+    for account_id in account_ids:
+        for t in archive.archived_in_range(db, account_id, start, end - timedelta(microseconds=1)):
+            if not _is_spend(t, account_ids):
+                continue
+            key = (t.merchant_category or UNCATEGORIZED, t.merchant_name or UNKNOWN_MERCHANT)
+            bucket = totals.setdefault(t.created_at.strftime("%Y-%m"), {}).setdefault(key, [0, 0])
+            bucket[0] += _to_cents(t.amount)
+            bucket[1] += 1
+    return totals
+
+
+def _breakdown(month: str, buckets: Dict[Tuple[str, str], list]) -> dict:
+    categories: Dict[str, dict] = {}
+    for (category_name, merchant_name), (cents, count) in buckets.items():
+        category = categories.setdefault(category_name, {"cents": 0, "count": 0, "merchants": []})
+        category["cents"] += cents
+        category["count"] += count
+        category["merchants"].append({"merchant": merchant_name, "total": format_cents(cents), "count": count, "_cents": cents})
+
+    result = []
+    for category_name, category in sorted(categories.items(), key=lambda item: -item[1]["cents"]):
+        merchants = sorted(category["merchants"], key=lambda m: -m["_cents"])
+        for merchant in merchants:
+            del merchant["_cents"]
+        result.append({
+            "category": category_name,
+            "total": format_cents(category["cents"]),
+            "count": category["count"],
+            "merchants": merchants
+        })
+    total_cents = sum(category["cents"] for category in categories.values())
+    return {
+        "month": month,
+        "total": format_cents(total_cents),
+        "transaction_count": sum(category["count"] for category in categories.values()),
+        "categories": result
+    }
+
+
+def spending_by_month(db: Session, user_id: int, account_ids: List[int], months: Iterable[str]) -> List[dict]:
+    """Spending breakdown of each requested month, served from the cache when possible.
+
+    Missing months are computed with one grouped query over their span.
+    """
+    months = list(months)
+    results: Dict[str, dict] = {}
+    missing: Dict[str, int] = {}
+    for month in months:
+        value, generation = spending_cache.get(user_id, month)
+        if value is None:
+            missing[month] = generation
+        else:
+            results[month] = value
+
+    if missing:
+        start = parse_month(min(missing))
+        end = next_month(parse_month(max(missing)))
+        totals = _aggregate(db, account_ids, start, end) if account_ids else {}
+        for month, generation in missing.items():
+            results[month] = _breakdown(month, totals.get(month, {}))
+            spending_cache.put(user_id, month, results[month], generation)
+
+    return [results[month] for month in months]
@@ -0,0 +1,193 @@
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, delete, exists, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models import Transaction, TransactionStatus, Statement, ArchiveManifest
+
+transactions_table = Transaction.__table__
+
+_engines: Dict[str, Engine] = {}
+_engines_lock = threading.Lock()
+
+
+def archive_file_name(period: str) -> str:
+    """Archive file holding the transactions created in a YYYY-MM period."""
+    return f"transactions_{period.replace('-', '_')}.db"
+
+
+def _archive_engine(file_name: str, create: bool = False) -> Engine:
+    path = os.path.join(settings.archive_dir, file_name)
+    with _engines_lock:
+        engine = _engines.get(path)
+        if engine is None:
+            if create:
+                os.makedirs(settings.archive_dir, exist_ok=True)
+            elif not os.path.exists(path):
+                # Never let a read silently create an empty archive
+                raise FileNotFoundError(f"Archive file {path} listed in the manifest is missing")
+            engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False})
+            _engines[path] = engine
+    if create:
+        transactions_table.create(bind=engine, checkfirst=True)
+    return engine
+
+
+def _read(entry: ArchiveManifest, *conditions, limit: Optional[int] = None) -> List[Transaction]:
+    """Archived rows of one manifest entry as detached Transaction objects, newest first."""
+    query = select(transactions_table).where(
+        transactions_table.c.account_id == entry.account_id, *conditions
+    ).order_by(transactions_table.c.created_at.desc(), transactions_table.c.id.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    with _archive_engine(entry.file_name).connect() as conn:
+        return [Transaction(**row._mapping) for row in conn.execute(query)]
+
+
+def archive_summary(db: Session, account_id: int) -> Tuple[int, Optional[datetime]]:
+    """Number of archived transactions of an account and the newest one's timestamp."""
+    count, newest = db.query(
+        func.coalesce(func.sum(ArchiveManifest.row_count), 0),
+        func.max(ArchiveManifest.last_created_at)
+    ).filter(ArchiveManifest.account_id == account_id).one()
+    return count, newest
+
+
+def archived_history(db: Session, account_id: int, limit: int) -> List[Transaction]:
+    """The newest `limit` archived transactions of an account, newest first.
+
+    Only as many month files are opened as are needed to fill the page.
+    """
+    entries = db.query(ArchiveManifest).filter(
+        ArchiveManifest.account_id == account_id
+    ).order_by(ArchiveManifest.period.desc()).all()
+    transactions = []
+    for entry in entries:
+        if len(transactions) >= limit:
+            break
+        transactions.extend(_read(entry, limit=limit - len(transactions)))
+    return transactions
+
+
+def archived_in_range(db: Session, account_id: int, start, end) -> List[Transaction]:
+    """Archived transactions of an account created within [start, end]."""
+    entries = db.query(ArchiveManifest).filter(
+        ArchiveManifest.account_id == account_id,
+        ArchiveManifest.last_created_at >= start,
+        ArchiveManifest.first_created_at <= end
+    ).all()
+    transactions = []
+    for entry in entries:
+        transactions.extend(_read(
+            entry,
+            transactions_table.c.created_at >= start,
+            transactions_table.c.created_at <= end
+        ))
+    return transactions
+
+
+def find_archived(db: Session, transaction_id: str) -> Optional[Transaction]:
+    """Look up an archived transaction by its public id, newest archives first."""
+    file_names = [name for (name,) in db.query(ArchiveManifest.file_name).distinct().order_by(
+        ArchiveManifest.file_name.desc()
+    )]
+    query = select(transactions_table).where(transactions_table.c.transaction_id == transaction_id)
+    for file_name in file_names:
+        with _archive_engine(file_name).connect() as conn:
+            row = conn.execute(query).first()
+        if row is not None:
+            return Transaction(**row._mapping)
+    return None
+
+
+def archive_transactions(db: Session, horizon_days: Optional[int] = None,
+                         batch_size: Optional[int] = None, now: Optional[datetime] = None) -> dict:
+    """Move settled transactions older than the horizon into monthly archive files.
+
+    A transaction is eligible once a generated statement covers it. Each
+    batch is written to its archive file first (idempotently, keyed by id)
+    and then deleted from the live table in the same commit that updates the
+    manifest, so an interrupted run loses nothing and can simply be re-run.
+    """
+    horizon_days = horizon_days if horizon_days is not None else settings.archive_horizon_days
+    batch_size = batch_size or settings.archive_batch_size
+    cutoff = (now or datetime.now()) - timedelta(days=horizon_days)
+
+    covered = exists().where(
+        Statement.account_id == transactions_table.c.account_id,
+        Statement.is_generated.is_(True),
+        Statement.statement_period_start <= transactions_table.c.created_at,
+        Statement.statement_period_end >= transactions_table.c.created_at
+    )
+    eligible = select(transactions_table).where(
+        transactions_table.c.created_at < cutoff,
+        transactions_table.c.status != TransactionStatus.PENDING,
+        covered
+    ).order_by(transactions_table.c.id).limit(batch_size)
+
+    archived = 0
+    periods = set()
+    while True:
+        rows = [dict(row) for row in db.execute(eligible).mappings()]
+        if not rows:
+            break
+
+        by_period = defaultdict(list)
+        for row in rows:
+            by_period[row["created_at"].strftime("%Y-%m")].append(row)
+        for period, period_rows in by_period.items():
+            with _archive_engine(archive_file_name(period), create=True).begin() as conn:
+                conn.execute(transactions_table.insert().prefix_with("OR REPLACE"), period_rows)
+
+        _update_manifest(db, by_period)
+        db.execute(delete(transactions_table).where(
+            transactions_table.c.id.in_([row["id"] for row in rows])
+        ))
+        db.commit()
+
+        archived += len(rows)
+        periods.update(by_period)
+
+    return {"archived": archived, "periods": sorted(periods), "cutoff": cutoff.isoformat()}
+
+
+def _update_manifest(db: Session, by_period: Dict[str, List[dict]]) -> None:
+    ranges: Dict[Tuple[int, str], list] = {}
+    for period, rows in by_period.items():
+        for row in rows:
+            key = (row["account_id"], period)
+            current = ranges.get(key)
+            if current is None:
+                ranges[key] = [1, row["created_at"], row["created_at"]]
+            else:
+                current[0] += 1
+                current[1] = min(current[1], row["created_at"])
+                current[2] = max(current[2], row["created_at"])
+
+    existing = {
+        (entry.account_id, entry.period): entry
+        for entry in db.query(ArchiveManifest).filter(
+            ArchiveManifest.account_id.in_({account_id for account_id, _ in ranges}),
+            ArchiveManifest.period.in_(set(by_period))
+        )
+    }
+    for (account_id, period), (count, first, last) in ranges.items():
+        entry = existing.get((account_id, period))
+        if entry is None:
+            db.add(ArchiveManifest(
+                account_id=account_id,
+                period=period,
+                file_name=archive_file_name(period),
+                row_count=count,
+                first_created_at=first,
+                last_created_at=last
+            ))
+        else:
+            entry.row_count += count
+            entry.first_created_at = min(entry.first_created_at, first)
+            entry.last_created_at = max(entry.last_created_at, last)
@@ -1,6 +1,7 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.database import get_db
 from app.models import User
 from app.core.security import verify_token, get_user_id_from_token
@@ -55,3 +56,17 @@ def get_current_active_user(current_user: User = Depends(get_current_user)) -> U
             detail="Inactive user"
         )
     return current_user
+
+
+def is_operator(user: User) -> bool:
+    return user.email in settings.operator_emails
+
+
+def get_current_operator(current_user: User = Depends(get_current_active_user)) -> User:
+    """Get the current user if they are a configured operator."""
+    if not is_operator(current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Operator access required"
+        )
+    return current_user
@@ -0,0 +1,223 @@
+import asyncio
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException, status
+from app.config import settings
+from app.database import SessionLocal
+from app.core.cards import authorize_card
+from app.core.metrics import REGISTRY
+
+# Wire format: every frame is a 2-byte big-endian length followed by the message.
+#
+# Authorization request (type 0x01):
+#   type B | trace number I | card id Q | amount in cents Q | flags B | MCC 4s | merchant name (rest, UTF-8)
+# Authorization response (type 0x02):
+#   type B | trace number I | response code B | hold id Q (0 when declined)
+#
+# The trace number is chosen by the sender and echoed back; responses on a
+# connection may arrive out of order.
+LENGTH = struct.Struct(">H")
+REQUEST = struct.Struct(">BIQQB4s")
+RESPONSE = struct.Struct(">BIBQ")
+
+# As in the cards API's authorization schema
+MAX_MERCHANT_NAME = 100
+
+AUTHORIZATION_REQUEST = 0x01
+AUTHORIZATION_RESPONSE = 0x02
+
+FLAG_INTERNATIONAL = 0x01
+FLAG_CONTACTLESS = 0x02
+
+# Response codes, after their ISO 8583 counterparts
+APPROVED = 0
+DO_NOT_HONOR = 5
+INVALID_CARD = 14
+FORMAT_ERROR = 30
+INSUFFICIENT_FUNDS = 51
+EXPIRED_CARD = 54
+NOT_PERMITTED = 57
+SUSPECTED_FRAUD = 59
+EXCEEDS_LIMIT = 61
+ISSUER_UNAVAILABLE = 91
+
+NETWORK_MESSAGES = REGISTRY.counter(
+    "card_network_messages_total",
+    "Authorization messages answered by the card network listener.",
+    ("code",)
+)
+NETWORK_LATENCY = REGISTRY.histogram(
+    "card_network_authorization_seconds",
+    "Time from receiving an authorization message to writing its response."
+)
+
+
+class AuthorizationMessage(NamedTuple):
+    trace: int
+    card_id: int
+    amount: int  # Cents
+    international: bool = False
+    contactless: bool = False
+    merchant_category: str = ""
+    merchant_name: str = ""
+
+
+def encode_request(message: AuthorizationMessage) -> bytes:
+    flags = (FLAG_INTERNATIONAL if message.international else 0) | (FLAG_CONTACTLESS if message.contactless else 0)
+    body = REQUEST.pack(
+        AUTHORIZATION_REQUEST, message.trace, message.card_id, message.amount, flags,
+        message.merchant_category.encode("ascii")
+    ) + message.merchant_name[:MAX_MERCHANT_NAME].encode()
+    return LENGTH.pack(len(body)) + body
+
+
+def decode_request(body: bytes) -> AuthorizationMessage:
+    """Parse a request message (without its length prefix); raises ValueError when malformed."""
+    if len(body) < REQUEST.size:
+        raise ValueError("Authorization request is too short")
+    kind, trace, card_id, amount, flags, category = REQUEST.unpack_from(body)
+    if kind != AUTHORIZATION_REQUEST:
+        raise ValueError(f"Unknown message type {kind}")
+    message = AuthorizationMessage(
+        trace, card_id, amount,
+        bool(flags & FLAG_INTERNATIONAL), bool(flags & FLAG_CONTACTLESS),
+        category.rstrip(b"\0 ").decode("ascii"), body[REQUEST.size:].decode()
+    )
+    validate(message)
+    return message
+
+
+def validate(message: AuthorizationMessage) -> None:
+    """The checks the HTTP schema applies; raises ValueError."""
+    if message.amount <= 0:
+        raise ValueError("Amount must be positive")
+    if len(message.merchant_name) > MAX_MERCHANT_NAME:
+        raise ValueError("Merchant name is too long")
+
+
+def encode_response(trace: int, code: int, hold_id: int = 0) -> bytes:
+    return LENGTH.pack(RESPONSE.size) + RESPONSE.pack(AUTHORIZATION_RESPONSE, trace, code, hold_id)
+
+
+def decode_response(body: bytes):
+    """(trace number, response code, hold id) of a response message."""
+    _, trace, code, hold_id = RESPONSE.unpack(body)
+    return trace, code, hold_id
+
+
+def response_code(exc: HTTPException) -> int:
+    """Network response code for a declined authorization."""
+    if exc.status_code == status.HTTP_404_NOT_FOUND:
+        return INVALID_CARD
+    if exc.status_code == status.HTTP_403_FORBIDDEN:
+        return SUSPECTED_FRAUD
+    if exc.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+        return ISSUER_UNAVAILABLE
+    detail = exc.detail if isinstance(exc.detail, str) else ""
+    if detail == "Insufficient funds":
+        return INSUFFICIENT_FUNDS
+    if detail == "Card has expired":
+        return EXPIRED_CARD
+    if detail.endswith("limit exceeded"):
+        return EXCEEDS_LIMIT
+    if detail.startswith("Card is") or detail.endswith("disabled for this card") or detail == "Account is not active":
+        return NOT_PERMITTED
+    return DO_NOT_HONOR
+
+
+def authorize_message(message: AuthorizationMessage):
+    """Run one message through `authorize_card`; returns (response code, hold id). Blocking."""
+    try:
+        validate(message)
+    except ValueError:
+        return FORMAT_ERROR, 0
+    db = SessionLocal()
+    try:
+        result = authorize_card(
+            db, message.card_id, Decimal(message.amount).scaleb(-2),
+            merchant_name=message.merchant_name or None,
+            merchant_category=message.merchant_category or None,
+            international=message.international,
+            contactless=message.contactless
+        )
+        return APPROVED, result.hold.id
+    except HTTPException as exc:
+        return response_code(exc), 0
+    except Exception:
+        # The network still needs an answer; failures show up as code 91 in the metrics
+        return ISSUER_UNAVAILABLE, 0
+    finally:
+        db.close()
+
+
+class CardNetworkListener:
+    """asyncio TCP server answering authorization messages.
+
+    Each message is authorized on a worker thread, as the cards API does, so
+    one connection can keep up to `max_in_flight` authorizations pipelined.
+    """
+
+    def __init__(self, host: Optional[str] = None, port: Optional[int] = None,
+                 workers: Optional[int] = None, max_in_flight: Optional[int] = None):
+        self.host = host or settings.card_network_host
+        self.port = settings.card_network_port if port is None else port
+        self.max_in_flight = max_in_flight or settings.card_network_max_in_flight
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or settings.card_network_workers, thread_name_prefix="card-network"
+        )
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self) -> asyncio.AbstractServer:
+        self.server = await asyncio.start_server(self._handle, self.host, self.port)
+        return self.server
+
+    @property
+    def bound_port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+        self.executor.shutdown(wait=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.max_in_flight)
+        pending = set()
+
+        async def answer(body: bytes, received: float) -> None:
+            try:
+                try:
+                    message = decode_request(body)
+                except (ValueError, UnicodeDecodeError):
+                    trace = struct.unpack_from(">I", body, 1)[0] if len(body) >= 5 else 0
+                    code, hold_id = FORMAT_ERROR, 0
+                else:
+                    trace = message.trace
+                    code, hold_id = await loop.run_in_executor(self.executor, authorize_message, message)
+                writer.write(encode_response(trace, code, hold_id))
+                NETWORK_MESSAGES.labels(str(code)).inc()
+                NETWORK_LATENCY.labels().observe(time.perf_counter() - received)
+            finally:
+                slots.release()
+
+        try:
+            while True:
+                (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+                body = await reader.readexactly(length)
+                await slots.acquire()
+                task = asyncio.create_task(answer(body, time.perf_counter()))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                if writer.transport.get_write_buffer_size() > 65536:
+                    await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            writer.close()
@@ -0,0 +1,146 @@
+import threading
+from typing import Callable, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Card, CardType, CardNumberSequence
+
+PAN_LENGTH = 16
+
+sequences_table = CardNumberSequence.__table__
+
+# Luhn weight of a digit in a doubled position
+_DOUBLED = tuple(2 * d if d < 5 else 2 * d - 9 for d in range(10))
+
+
+def luhn_check_digit(payload: str) -> str:
+    """Check digit that makes `payload` + digit pass the Luhn check."""
+    total = 0
+    for position, char in enumerate(reversed(payload)):
+        digit = ord(char) - 48
+        total += _DOUBLED[digit] if position % 2 == 0 else digit
+    return str(-total % 10)
+
+
+def is_luhn_valid(number: str) -> bool:
+    return number.isdigit() and luhn_check_digit(number[:-1]) == number[-1]
+
+
+def _capacity(bin_: str) -> int:
+    """Account sequences available under a BIN."""
+    return 10 ** (PAN_LENGTH - 1 - len(bin_))
+
+
+def _first_free(db: Session, bin_: str) -> int:
+    """Sequence after the highest PAN already issued under `bin_`, for a BIN's first use.
+
+    A range scan of the card number index; ':' sorts right after '9'.
+    """
+    used = [
+        int(number[len(bin_):-1]) for number in db.scalars(select(Card.card_number).where(
+            Card.card_number >= bin_, Card.card_number < bin_ + ":"
+        ))
+        if len(number) == PAN_LENGTH and number.isdigit()
+    ]
+    return max(used) + 1 if used else 0
+
+
+class CardNumberAllocator:
+    """Issues Luhn-valid PANs from the configured BIN ranges.
+
+    Each process reserves blocks of account sequences by advancing a BIN's
+    row in card_number_sequences, then formats numbers from its block in
+    memory: no per-card uniqueness query, and no collision left for the
+    unique index to catch. Sequences of a block that is never used are
+    skipped, not reissued. Reserve numbers before opening a write
+    transaction, since a reservation commits on its own connection.
+    """
+
+    def __init__(self, bin_ranges: Optional[Dict[str, List[str]]] = None, block_size: Optional[int] = None,
+                 session_factory: Callable[[], Session] = SessionLocal):
+        self._bin_ranges = bin_ranges
+        self._block_size = block_size
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._blocks: Dict[str, List[int]] = {}  # BIN -> [next sequence, end of block]
+        self._exhausted = set()
+
+    @property
+    def bin_ranges(self) -> Dict[str, List[str]]:
+        return self._bin_ranges or settings.card_bin_ranges
+
+    @property
+    def block_size(self) -> int:
+        return self._block_size or settings.card_number_block_size
+
+    def _reserve(self, bin_: str, size: int) -> Optional[List[int]]:
+        """Claim the next `size` sequences of a BIN in their own commit; None once it is exhausted."""
+        t = sequences_table
+        capacity = _capacity(bin_)
+        db = self._session_factory()
+        try:
+            while True:
+                end = db.execute(update(t).where(t.c.bin == bin_).values(
+                    next_value=t.c.next_value + size
+                ).returning(t.c.next_value)).scalar()
+                if end is not None:
+                    db.commit()
+                    start = end - size
+                    return [start, min(end, capacity)] if start < capacity else None
+                db.add(CardNumberSequence(bin=bin_, next_value=_first_free(db, bin_)))
+                try:
+                    db.commit()
+                except IntegrityError:
+                    # Another process created the row first
+                    db.rollback()
+        finally:
+            db.close()
+
+    def allocate_many(self, card_type: CardType, count: int) -> List[str]:
+        """`count` new card numbers for `card_type`.
+
+        A request larger than a block reserves exactly what it needs, so bulk
+        issuance costs one round trip per BIN.
+        """
+        numbers: List[str] = []
+        with self._lock:
+            for bin_ in self.bin_ranges.get(card_type.value, ()):
+                if bin_ in self._exhausted:
+                    continue
+                width = PAN_LENGTH - 1 - len(bin_)
+                while len(numbers) < count:
+                    block = self._blocks.get(bin_)
+                    if block is None or block[0] >= block[1]:
+                        block = self._reserve(bin_, max(self.block_size, count - len(numbers)))
+                        if block is None:
+                            self._exhausted.add(bin_)
+                            self._blocks.pop(bin_, None)
+                            break
+                        self._blocks[bin_] = block
+                    start = block[0]
+                    block[0] = min(block[1], start + count - len(numbers))
+                    for sequence in range(start, block[0]):
+                        payload = f"{bin_}{sequence:0{width}d}"
+                        numbers.append(payload + luhn_check_digit(payload))
+                if len(numbers) == count:
+                    return numbers
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"No {card_type.value} card numbers left in the configured BIN ranges"
+        )
+
+    def allocate(self, card_type: CardType) -> str:
+        return self.allocate_many(card_type, 1)[0]
+
+    def reset(self) -> None:
+        """Forget reserved blocks, e.g. after the BIN configuration changed."""
+        with self._lock:
+            self._blocks.clear()
+            self._exhausted.clear()
+
+
+card_number_allocator = CardNumberAllocator()
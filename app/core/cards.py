@@ -0,0 +1,160 @@
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy import Boolean, Date, Integer, Numeric, bindparam, case, false, or_, select, update
+from sqlalchemy.orm import Session
+from app.core import fraud
+from app.core.concurrency import run_serialized
+from app.core.events import publish_transaction
+from app.core.holds import place_hold
+from app.core.metrics import REGISTRY
+from app.models import Card, CardStatus
+
+cards_table = Card.__table__
+
+CARD_AUTHORIZATIONS = REGISTRY.counter(
+    "card_authorizations_total",
+    "Card authorizations by outcome.",
+    ("outcome",)
+)
+
+
+def _month_key(now: datetime) -> int:
+    return now.year * 100 + now.month
+
+
+def _count_spend_statement():
+    """The card checks and counter increment as one conditional UPDATE, built once.
+
+    Spend recorded on an earlier day or month counts as zero, so the
+    counters reset without a sweep. A credit card's monthly spend, its
+    billing cycle, is also capped by its credit limit.
+    """
+    c = cards_table
+    amount = bindparam("b_amount", type_=Numeric(15, 2))
+    today = bindparam("b_today", type_=Date)
+    month = bindparam("b_month", type_=Integer)
+    daily = case((c.c.daily_spent_on == today, c.c.daily_spent), else_=0)
+    monthly = case((c.c.monthly_spent_in == month, c.c.monthly_spent), else_=0)
+    return update(c).where(
+        c.c.id == bindparam("b_card"),
+        c.c.status == CardStatus.ACTIVE,
+        c.c.expiry_year * 100 + c.c.expiry_month >= month,
+        or_(c.c.daily_limit.is_(None), daily + amount <= c.c.daily_limit),
+        or_(c.c.monthly_limit.is_(None), monthly + amount <= c.c.monthly_limit),
+        or_(c.c.credit_limit.is_(None), monthly + amount <= c.c.credit_limit),
+        or_(bindparam("b_international", type_=Boolean) == false(), c.c.is_international_enabled.is_(True)),
+        or_(bindparam("b_contactless", type_=Boolean) == false(), c.c.is_contactless_enabled.is_(True))
+    ).values(
+        daily_spent=daily + amount,
+        daily_spent_on=today,
+        monthly_spent=monthly + amount,
+        monthly_spent_in=month,
+        last_used=bindparam("b_now")
+    ).returning(c.c.card_number, c.c.daily_spent, c.c.monthly_spent)
+
+
+_COUNT_SPEND = _count_spend_statement()
+
+
+def _declined(db: Session, card_id: int, amount: Decimal, now: datetime, international: bool,
+              contactless: bool) -> HTTPException:
+    """Why the conditional counter update matched no row; only read on decline."""
+    card = db.get(Card, card_id)
+    reason = "Authorization declined"
+    if card.status != CardStatus.ACTIVE:
+        reason = f"Card is {card.status.value}"
+    elif (card.expiry_year, card.expiry_month) < (now.year, now.month):
+        reason = "Card has expired"
+    elif international and not card.is_international_enabled:
+        reason = "International transactions are disabled for this card"
+    elif contactless and not card.is_contactless_enabled:
+        reason = "Contactless payments are disabled for this card"
+    else:
+        daily = card.daily_spent if card.daily_spent_on == now.date() else 0
+        monthly = card.monthly_spent if card.monthly_spent_in == _month_key(now) else 0
+        if card.daily_limit is not None and daily + amount > card.daily_limit:
+            reason = "Daily card limit exceeded"
+        elif card.monthly_limit is not None and monthly + amount > card.monthly_limit:
+            reason = "Monthly card limit exceeded"
+        elif card.credit_limit is not None and monthly + amount > card.credit_limit:
+            reason = "Credit limit exceeded"
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=reason)
+
+
+def _count_spend(db: Session, card_id: int, amount: Decimal, now: datetime, international: bool,
+                 contactless: bool):
+    """Check the card and add `amount` to its spend counters."""
+    row = db.execute(_COUNT_SPEND, {
+        "b_card": card_id, "b_amount": amount, "b_today": now.date(), "b_month": _month_key(now),
+        "b_international": international, "b_contactless": contactless, "b_now": now
+    }).first()
+    if row is None:
+        raise _declined(db, card_id, amount, now, international, contactless)
+    return row
+
+
+def authorize_card(db: Session, card_id: int, amount: Decimal, merchant_name: Optional[str] = None,
+                   merchant_category: Optional[str] = None, international: bool = False,
+                   contactless: bool = False, user_id: Optional[int] = None,
+                   now: Optional[datetime] = None) -> SimpleNamespace:
+    """Authorize a card payment and hold the amount on the card's account.
+
+    Every step is a primary-key statement: the card's status, expiry,
+    channel and limit checks are one prebuilt conditional UPDATE of its
+    spend counters, and the hold is `place_hold`'s conditional reservation,
+    so an approval reads only the card's account id. Both commit together under the account's
+    lock; a decline raises before anything is committed. Blocking: call it
+    from a worker thread.
+    """
+    now = now or datetime.now()
+    card = db.execute(select(cards_table.c.account_id, cards_table.c.user_id).where(
+        cards_table.c.id == card_id
+    )).first()
+    if card is None or (user_id is not None and card.user_id != user_id):
+        CARD_AUTHORIZATIONS.labels("declined").inc()
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Card not found or access denied"
+        )
+    if card.account_id is None:
+        CARD_AUTHORIZATIONS.labels("declined").inc()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Card has no linked account"
+        )
+    fraud_context = fraud.TransactionContext("card", card.account_id, amount, card_id=card_id)
+
+    def authorize() -> SimpleNamespace:
+        fraud_decision = fraud.screen(fraud_context)
+        counters = _count_spend(db, card_id, amount, now, international, contactless)
+        hold, transaction, account = place_hold(
+            db, card.account_id, amount,
+            description=f"Card ****{counters.card_number[-4:]} authorization",
+            merchant_name=merchant_name,
+            merchant_category=merchant_category,
+            card_id=card_id,
+            now=now
+        )
+        fraud.record_review(db, transaction, fraud_decision)
+        db.commit()
+        # Still under the account's lock, so concurrent authorizations see it in the velocity windows
+        fraud.record_committed(fraud_context)
+        return SimpleNamespace(
+            hold=hold, transaction=transaction, account=account,
+            daily_spent=counters.daily_spent, monthly_spent=counters.monthly_spent,
+            fraud_decision=fraud_decision
+        )
+
+    try:
+        result = run_serialized(db, (card.account_id,), "card_authorization", authorize)
+    except HTTPException:
+        db.rollback()
+        CARD_AUTHORIZATIONS.labels("declined").inc()
+        raise
+    publish_transaction(result.transaction, result.account)
+    CARD_AUTHORIZATIONS.labels("approved").inc()
+    return result
@@ -0,0 +1,158 @@
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, TypeVar
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.metrics import REGISTRY
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+ACCOUNT_LOCK_WAIT = REGISTRY.histogram(
+    "account_lock_wait_seconds",
+    "Time spent waiting for per-account locks.",
+    ("operation",)
+)
+ACCOUNT_LOCK_TIMEOUTS = REGISTRY.counter(
+    "account_lock_timeouts_total",
+    "Requests rejected because an account lock could not be acquired in time.",
+    ("operation",)
+)
+DB_BUSY_RETRIES = REGISTRY.counter(
+    "db_busy_retries_total",
+    "Units of work retried after the database reported it was busy or locked.",
+    ("operation",)
+)
+
+# SQLite primary result codes for a busy or locked database
+_SQLITE_BUSY_CODES = (5, 6)
+
+
+class AccountBusyError(Exception):
+    """An account lock could not be acquired within the timeout."""
+
+
+class AccountLocks:
+    """In-process locks keyed by account id.
+
+    Entries are reference counted and dropped once nobody holds or waits for
+    them, so memory stays proportional to the accounts in use.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._locks: Dict[int, list] = {}  # account id -> [lock, users]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def _checkout(self, account_ids: List[int]) -> List[list]:
+        with self._guard:
+            entries = []
+            for account_id in account_ids:
+                entry = self._locks.get(account_id)
+                if entry is None:
+                    entry = self._locks[account_id] = [threading.Lock(), 0]
+                entry[1] += 1
+                entries.append(entry)
+            return entries
+
+    def _checkin(self, account_ids: List[int]) -> None:
+        with self._guard:
+            for account_id in account_ids:
+                entry = self._locks[account_id]
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._locks[account_id]
+
+    @contextmanager
+    def hold(self, *account_ids: Optional[int], operation: str = "transaction", timeout: Optional[float] = None):
+        """Hold the locks of all given accounts.
+
+        Locks are always taken in ascending account id order, so two transfers
+        between the same accounts in opposite directions cannot deadlock.
+        """
+        ids = sorted({account_id for account_id in account_ids if account_id is not None})
+        entries = self._checkout(ids)
+        acquired = []
+        started = time.perf_counter()
+        deadline = None if timeout is None else started + timeout
+        try:
+            for entry in entries:
+                remaining = -1 if deadline is None else max(deadline - time.perf_counter(), 0)
+                if not entry[0].acquire(timeout=remaining):
+                    ACCOUNT_LOCK_TIMEOUTS.labels(operation).inc()
+                    raise AccountBusyError(f"Timed out waiting for account locks {ids}")
+                acquired.append(entry)
+            ACCOUNT_LOCK_WAIT.labels(operation).observe(time.perf_counter() - started)
+            yield
+        finally:
+            for entry in reversed(acquired):
+                entry[0].release()
+            self._checkin(ids)
+
+
+account_locks = AccountLocks()
+
+
+def is_busy_error(exc: OperationalError) -> bool:
+    """Whether a database error means SQLITE_BUSY / SQLITE_LOCKED."""
+    orig = exc.orig
+    if isinstance(orig, sqlite3.OperationalError):
+        code = getattr(orig, "sqlite_errorcode", None)
+        if code is not None:
+            return code & 0xFF in _SQLITE_BUSY_CODES
+        message = str(orig).lower()
+        return "locked" in message or "busy" in message
+    return False
+
+
+def retry_on_busy(db: Session, operation: str, fn: Callable[[], T],
+                  attempts: Optional[int] = None, base_delay: Optional[float] = None) -> T:
+    """Run a unit of work, retrying with jittered exponential backoff when busy.
+
+    `fn` must be safe to re-run from the start: the session is rolled back
+    before every retry.
+    """
+    attempts = attempts if attempts is not None else settings.db_busy_retries + 1
+    base_delay = base_delay if base_delay is not None else settings.db_busy_backoff_ms / 1000
+    for attempt in range(attempts):
+        try:
+            return fn()
+        except OperationalError as exc:
+            db.rollback()
+            if not is_busy_error(exc) or attempt == attempts - 1:
+                raise
+            DB_BUSY_RETRIES.labels(operation).inc()
+            # Full jitter keeps retrying writers from waking up in lockstep
+            time.sleep(random.uniform(0, base_delay * 2 ** attempt))
+
+
+def run_serialized(db: Session, account_ids, operation: str, fn: Callable[[], T],
+                   then: Optional[Callable[[T], R]] = None):
+    """Run `fn` holding the locks of `account_ids`, retrying when the database is busy.
+
+    Retries end at `fn`'s commit: work after it (refreshes, events) goes in
+    `then`, which gets `fn`'s result and runs once, still under the locks,
+    so a busy error there can never post the unit of work twice.
+
+    Blocking: call it from a worker thread (e.g. run_in_threadpool), never
+    directly on the event loop.
+    """
+    try:
+        with account_locks.hold(*account_ids, operation=operation,
+                                timeout=settings.account_lock_timeout_seconds):
+            result = retry_on_busy(db, operation, fn)
+            return then(result) if then is not None else result
+    except AccountBusyError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Account is busy, please retry",
+            headers={"Retry-After": "1"}
+        )
@@ -0,0 +1,200 @@
+import asyncio
+import itertools
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set
+
+from app.config import settings
+from app.core.metrics import REGISTRY
+from app.utils.serialization import dumps, transaction_to_dict
+
+SSE_SUBSCRIBERS = REGISTRY.gauge(
+    "sse_subscribers",
+    "Connected Server-Sent Events subscribers."
+)
+SSE_EVENTS_DROPPED = REGISTRY.counter(
+    "sse_events_dropped_total",
+    "Events discarded because a subscriber fell behind.",
+    ("policy",)
+)
+
+
+class Event:
+    """One published update, addressed to a single user."""
+
+    __slots__ = ("id", "epoch", "user_id", "type", "data")
+
+    def __init__(self, event_id: int, epoch: str, user_id: int, event_type: str, data: dict):
+        self.id = event_id
+        self.epoch = epoch
+        self.user_id = user_id
+        self.type = event_type
+        self.data = data
+
+    @property
+    def event_id(self) -> str:
+        """SSE id: the broker's boot epoch and the event's sequence number."""
+        return f"{self.epoch}-{self.id}"
+
+    def encode(self) -> bytes:
+        """Wire format of the event as an SSE frame."""
+        return b"id: %s\nevent: %s\ndata: %s\n\n" % (self.event_id.encode(), self.type.encode(), dumps(self.data))
+
+
+class Subscriber:
+    """Bounded queue of events for one connected client."""
+
+    def __init__(self, user_id: int, maxsize: int, policy: str):
+        self.user_id = user_id
+        self.maxsize = maxsize
+        self.policy = policy
+        self.queue: Deque[Event] = deque()
+        self.lagged = False  # events were dropped, client must resync
+        self.closed = False  # disconnected for falling behind
+        self.loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def _deliver(self, event: Event) -> None:
+        if self.closed:
+            return
+        if len(self.queue) >= self.maxsize:
+            SSE_EVENTS_DROPPED.labels(self.policy).inc()
+            if self.policy == "disconnect":
+                self.closed = True
+                self.queue.clear()
+            else:
+                self.queue.popleft()
+                self.lagged = True
+        if not self.closed:
+            self.queue.append(event)
+        self._ready.set()
+
+    def put(self, event: Event) -> None:
+        """Queue an event; safe to call from any thread."""
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            self._deliver(event)
+        else:
+            self.loop.call_soon_threadsafe(self._deliver, event)
+
+    async def get(self, timeout: float) -> List[Event]:
+        """Wait up to `timeout` seconds and return all queued events."""
+        if not self.queue and not self.closed:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+        events = list(self.queue)
+        self.queue.clear()
+        return events
+
+
+class EventBroker:
+    """In-process pub/sub of per-user events with a short replay history.
+
+    Histories are kept for the `replay_users` most recently active users.
+    Event ids start over with each broker, so they carry its boot epoch and
+    ids from another epoch are never replayed.
+    """
+
+    def __init__(self, queue_size: int = 100, replay_size: int = 256, policy: str = "drop_oldest",
+                 replay_users: int = 10000):
+        self.queue_size = queue_size
+        self.replay_size = replay_size
+        self.replay_users = replay_users
+        self.policy = policy
+        self.epoch = format(time.time_ns() // 1000, "x")
+        self._ids = itertools.count(1)
+        self._last_id = 0
+        self._lock = threading.Lock()
+        self._subscribers: Dict[int, Set[Subscriber]] = {}
+        self._history: "OrderedDict[int, Deque[Event]]" = OrderedDict()  # least recently active first
+        self._evicted: Dict[int, int] = {}  # newest event id no longer replayable
+        self._dropped_through = 0  # newest event id of any dropped history
+
+    def publish(self, user_id: int, event_type: str, data: dict) -> Event:
+        """Record an event and fan it out to the user's subscribers."""
+        with self._lock:
+            event = Event(next(self._ids), self.epoch, user_id, event_type, data)
+            self._last_id = event.id
+            history = self._history.get(user_id)
+            if history is None:
+                if len(self._history) >= self.replay_users:
+                    dropped_user, dropped = self._history.popitem(last=False)
+                    del self._evicted[dropped_user]
+                    self._dropped_through = dropped[-1].id
+                history = self._history[user_id] = deque(maxlen=self.replay_size)
+                # Earlier events of the user may have been in a dropped history
+                self._evicted[user_id] = self._dropped_through
+            else:
+                self._history.move_to_end(user_id)
+                if len(history) == self.replay_size:
+                    self._evicted[user_id] = history[0].id
+            history.append(event)
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscriber in subscribers:
+            subscriber.put(event)
+        return event
+
+    def subscribe(self, user_id: int) -> Subscriber:
+        subscriber = Subscriber(user_id, self.queue_size, self.policy)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+        SSE_SUBSCRIBERS.labels().inc()
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscriber.user_id)
+            if subscribers is not None and subscriber in subscribers:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self._subscribers[subscriber.user_id]
+                SSE_SUBSCRIBERS.labels().dec()
+
+    def replay(self, user_id: int, last_event_id: str) -> Optional[List[Event]]:
+        """Events after the SSE id `last_event_id`, or None if the gap can't be filled."""
+        epoch, _, sequence = last_event_id.partition("-")
+        # Ids from before a restart, or malformed
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        last = int(sequence)
+        with self._lock:
+            # Ids older than the replay window (or than a dropped history)
+            if last > self._last_id or last < self._evicted.get(user_id, self._dropped_through):
+                return None
+            return [event for event in self._history.get(user_id, ()) if event.id > last]
+
+
+broker = EventBroker(
+    queue_size=settings.sse_queue_size,
+    replay_size=settings.sse_replay_size,
+    policy=settings.sse_overflow_policy,
+    replay_users=settings.sse_replay_users,
+)
+
+
+def publish_transaction(transaction, *accounts) -> None:
+    """Publish a committed transaction and the resulting balances.
+
+    Each account's owner receives the transaction and that account's balance;
+    call only after the commit so subscribers never see rolled-back data.
+    """
+    payload = transaction_to_dict(transaction)
+    payload.pop("message")
+    notified = set()
+    for account in accounts:
+        if account.user_id not in notified:
+            broker.publish(account.user_id, "transaction", payload)
+            notified.add(account.user_id)
+        broker.publish(account.user_id, "balance", {
+            "account_id": account.id,
+            "balance": str(account.balance),
+            "available_balance": str(account.available_balance),
+            "currency": account.currency,
+        })
@@ -0,0 +1,132 @@
+import threading
+import time
+from bisect import bisect_right
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.metrics import REGISTRY
+from app.models import FeeRule, AccountType, TransactionType
+
+CENT = Decimal("0.01")
+ZERO = Decimal("0.00")
+
+FEE_SCHEDULE_COMPILES = REGISTRY.counter(
+    "fee_schedule_compiles_total",
+    "Times the fee rules were compiled into the in-process lookup table."
+)
+
+
+class FeeSpec(NamedTuple):
+    rule_id: int
+    flat_fee: Decimal
+    percent_fee: Decimal
+    max_fee: Optional[Decimal]
+
+
+# (account type, transaction type, currency or None) -> (tier lower bounds, specs)
+FeeTable = Dict[Tuple[AccountType, TransactionType, Optional[str]], Tuple[List[Decimal], List[FeeSpec]]]
+
+
+def _specificity(rule) -> int:
+    return sum(value is not None for value in (rule.account_type, rule.transaction_type, rule.currency))
+
+
+def compile_rules(rules) -> FeeTable:
+    """Resolve rules into one tier list per (account type, transaction type, currency).
+
+    Wildcards are expanded over the enums, so the hot path never matches
+    rules. Within a key, each tier takes the applicable rule with the most
+    specific match, then the highest `min_amount`. Keys with currency None
+    hold the schedule for currencies no rule names.
+    """
+    rules = list(rules)
+    table: FeeTable = {}
+    currencies = {rule.currency for rule in rules if rule.currency is not None}
+    for account_type in AccountType:
+        for transaction_type in TransactionType:
+            for currency in currencies | {None}:
+                candidates = [
+                    rule for rule in rules
+                    if rule.account_type in (None, account_type)
+                    and rule.transaction_type in (None, transaction_type)
+                    and rule.currency in (None, currency)
+                ]
+                if not candidates:
+                    continue
+                bounds, specs = [], []
+                for bound in sorted({rule.min_amount for rule in candidates}):
+                    best = max(
+                        (rule for rule in candidates if rule.min_amount <= bound),
+                        key=lambda rule: (_specificity(rule), rule.min_amount, rule.id)
+                    )
+                    spec = FeeSpec(best.id, best.flat_fee, best.percent_fee, best.max_fee)
+                    if specs and specs[-1] == spec:
+                        continue
+                    bounds.append(bound)
+                    specs.append(spec)
+                table[(account_type, transaction_type, currency)] = (bounds, specs)
+    return table
+
+
+def compute_fee(spec: FeeSpec, amount: Decimal) -> Decimal:
+    fee = spec.flat_fee + Decimal(amount) * spec.percent_fee / 100
+    if spec.max_fee is not None:
+        fee = min(fee, spec.max_fee)
+    return fee.quantize(CENT, rounding=ROUND_HALF_UP)
+
+
+class FeeSchedule:
+    """Active fee rules compiled into an in-process lookup table.
+
+    Local rule changes call `invalidate`; changes made by other processes are
+    noticed by comparing the rule count, highest id and latest update at most
+    every `refresh_seconds`, and trigger a recompile.
+    """
+
+    def __init__(self, refresh_seconds: float = 30.0):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._table: FeeTable = {}
+        self._version: Optional[tuple] = None
+        self._checked_at = 0.0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+
+    def _refresh(self, db: Session) -> None:
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.refresh_seconds:
+            return
+        version = tuple(db.query(
+            func.count(FeeRule.id), func.max(FeeRule.id), func.max(FeeRule.updated_at)
+        ).one())
+        with self._lock:
+            self._checked_at = now
+            if version == self._version:
+                return
+            rules = db.query(
+                FeeRule.id, FeeRule.account_type, FeeRule.transaction_type, FeeRule.currency,
+                FeeRule.min_amount, FeeRule.flat_fee, FeeRule.percent_fee, FeeRule.max_fee
+            ).filter(FeeRule.is_active.is_(True)).all()
+            self._table = compile_rules(rules)
+            self._version = version
+        FEE_SCHEDULE_COMPILES.labels().inc()
+
+    def fee(self, db: Session, account_type: AccountType, transaction_type: TransactionType,
+            currency: str, amount: Decimal) -> Decimal:
+        """Fee charged to an account of `account_type` for a transaction of `amount`."""
+        self._refresh(db)
+        entry = self._table.get((account_type, transaction_type, currency))
+        if entry is None:
+            entry = self._table.get((account_type, transaction_type, None))
+            if entry is None:
+                return ZERO
+        index = bisect_right(entry[0], amount)
+        return compute_fee(entry[1][index - 1], amount) if index else ZERO
+
+
+fee_schedule = FeeSchedule(settings.fee_rules_refresh_seconds)
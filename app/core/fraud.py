@@ -0,0 +1,318 @@
+import threading
+import time
+from collections import OrderedDict
+from decimal import Decimal
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from app.config import settings
+from app.core.metrics import REGISTRY
+from app.core.outbox import record_fraud_review
+
+APPROVE = "approve"
+REVIEW = "review"
+DECLINE = "decline"
+_SEVERITY = {APPROVE: 0, REVIEW: 1, DECLINE: 2}
+
+FRAUD_DECISIONS = REGISTRY.counter(
+    "fraud_decisions_total",
+    "Fraud rule engine decisions.",
+    ("decision",)
+)
+FRAUD_RULE_HITS = REGISTRY.counter(
+    "fraud_rule_hits_total",
+    "Times each fraud rule triggered.",
+    ("rule",)
+)
+FRAUD_EVALUATION = REGISTRY.histogram(
+    "fraud_evaluation_seconds",
+    "Time spent evaluating fraud rules for one transaction.",
+    buckets=(0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)
+)
+
+
+def to_cents(amount) -> int:
+    return int((Decimal(str(amount)) * 100).to_integral_value())
+
+
+class SlidingWindow:
+    """Event count and amount over a sliding time window.
+
+    A ring buffer of fixed-width buckets with running totals: adding an event
+    and reading the totals are O(1) amortized, since every bucket is expired
+    at most once per rotation.
+    """
+
+    __slots__ = ("bucket_seconds", "counts", "amounts", "head", "count", "amount", "last_seen")
+
+    def __init__(self, window_seconds: float, buckets: int = 30):
+        self.bucket_seconds = window_seconds / buckets
+        self.counts = [0] * buckets
+        self.amounts = [0] * buckets
+        self.head: Optional[int] = None  # bucket epoch of the newest bucket
+        self.count = 0
+        self.amount = 0
+        self.last_seen = 0.0
+
+    def _advance(self, now: float) -> int:
+        epoch = int(now // self.bucket_seconds)
+        if self.head is None:
+            self.head = epoch
+        elif epoch > self.head:
+            size = len(self.counts)
+            for step in range(1, min(epoch - self.head, size) + 1):
+                slot = (self.head + step) % size
+                self.count -= self.counts[slot]
+                self.amount -= self.amounts[slot]
+                self.counts[slot] = 0
+                self.amounts[slot] = 0
+            self.head = epoch
+        self.last_seen = now
+        return self.head % len(self.counts)
+
+    def add(self, now: float, amount: int = 0) -> None:
+        slot = self._advance(now)
+        self.counts[slot] += 1
+        self.amounts[slot] += amount
+        self.count += 1
+        self.amount += amount
+
+    def totals(self, now: float) -> Tuple[int, int]:
+        """(event count, amount) within the window ending at `now`."""
+        self._advance(now)
+        return self.count, self.amount
+
+
+class WindowStore:
+    """Sliding windows keyed by (rule, subject) with bounded memory.
+
+    Keys are kept in least-recently-used order; idle keys and, past
+    `max_keys`, the least recently used ones are evicted on insertion.
+    """
+
+    def __init__(self, max_keys: int = 100000, idle_seconds: float = 3600.0):
+        self.max_keys = max_keys
+        self.idle_seconds = idle_seconds
+        self._windows: "OrderedDict[tuple, SlidingWindow]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._windows)
+
+    def peek(self, key: tuple) -> Optional[SlidingWindow]:
+        return self._windows.get(key)
+
+    def get(self, key: tuple, window_seconds: float, now: float) -> SlidingWindow:
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = SlidingWindow(window_seconds)
+            window.last_seen = now
+            self._evict(now)
+        else:
+            self._windows.move_to_end(key)
+        return window
+
+    def _evict(self, now: float) -> None:
+        windows = self._windows
+        while windows:
+            key, oldest = next(iter(windows.items()))
+            if len(windows) <= self.max_keys and now - oldest.last_seen < self.idle_seconds:
+                break
+            del windows[key]
+
+
+class TransactionContext:
+    """Facts about a pending money movement that rules evaluate."""
+
+    __slots__ = ("kind", "account_id", "amount", "destination_account_id", "card_id",
+                 "is_new_payee", "now")
+
+    def __init__(self, kind: str, account_id: int, amount, destination_account_id: Optional[int] = None,
+                 card_id: Optional[int] = None, is_new_payee: Optional[bool] = None,
+                 now: Optional[float] = None):
+        self.kind = kind  # "deposit", "withdrawal", "transfer" or "card"
+        self.account_id = account_id
+        self.amount = to_cents(amount)
+        self.destination_account_id = destination_account_id
+        self.card_id = card_id
+        self.is_new_payee = is_new_payee
+        self.now = now if now is not None else time.time()
+
+
+class Rule:
+    """Base class for fraud rules.
+
+    `evaluate` returns REVIEW or DECLINE when the rule triggers (None
+    otherwise) and must not change state; `record` updates the rule's
+    counters once the transaction has been committed.
+    """
+
+    rule_id = "rule"
+    action = DECLINE
+
+    def evaluate(self, ctx: TransactionContext, store: WindowStore) -> Optional[str]:
+        raise NotImplementedError
+
+    def record(self, ctx: TransactionContext, store: WindowStore) -> None:
+        pass
+
+
+class VelocityRule(Rule):
+    """Too many (or too much) movements for one subject within a window."""
+
+    def __init__(self, rule_id: str, kinds: Tuple[str, ...], subject: Callable[[TransactionContext], Optional[int]],
+                 window_seconds: float, max_count: Optional[int] = None, max_amount: Optional[int] = None,
+                 action: str = DECLINE):
+        self.rule_id = rule_id
+        self.kinds = kinds
+        self.subject = subject
+        self.window_seconds = window_seconds
+        self.max_count = max_count
+        self.max_amount = max_amount  # in cents
+        self.action = action
+
+    def evaluate(self, ctx, store):
+        subject = self.subject(ctx)
+        if ctx.kind not in self.kinds or subject is None:
+            return None
+        window = store.peek((self.rule_id, subject))
+        count, amount = window.totals(ctx.now) if window else (0, 0)
+        if self.max_count is not None and count + 1 > self.max_count:
+            return self.action
+        if self.max_amount is not None and amount + ctx.amount > self.max_amount:
+            return self.action
+        return None
+
+    def record(self, ctx, store):
+        subject = self.subject(ctx)
+        if ctx.kind in self.kinds and subject is not None:
+            store.get((self.rule_id, subject), self.window_seconds, ctx.now).add(ctx.now, ctx.amount)
+
+
+class NewPayeeRule(Rule):
+    """Large transfer to a destination the source account never paid before."""
+
+    rule_id = "transfer.large_new_payee"
+
+    def __init__(self, threshold: int, action: str = DECLINE):
+        self.threshold = threshold  # in cents
+        self.action = action
+
+    def evaluate(self, ctx, store):
+        if ctx.kind == "transfer" and ctx.is_new_payee and ctx.amount >= self.threshold:
+            return self.action
+        return None
+
+
+class FraudDecision:
+    __slots__ = ("decision", "rules")
+
+    def __init__(self, decision: str, rules: List[str]):
+        self.decision = decision
+        self.rules = rules
+
+    @property
+    def declined(self) -> bool:
+        return self.decision == DECLINE
+
+
+class FraudEngine:
+    """Evaluates registered rules against in-memory sliding-window counters."""
+
+    def __init__(self, store: Optional[WindowStore] = None):
+        self.store = store or WindowStore()
+        self.rules: List[Rule] = []
+        self._lock = threading.Lock()
+
+    def register(self, rule: Rule) -> Rule:
+        self.rules.append(rule)
+        return rule
+
+    def evaluate(self, ctx: TransactionContext) -> FraudDecision:
+        started = time.perf_counter()
+        decision = APPROVE
+        triggered = []
+        with self._lock:
+            for rule in self.rules:
+                action = rule.evaluate(ctx, self.store)
+                if action is not None:
+                    triggered.append(rule.rule_id)
+                    if _SEVERITY[action] > _SEVERITY[decision]:
+                        decision = action
+        FRAUD_EVALUATION.labels().observe(time.perf_counter() - started)
+        FRAUD_DECISIONS.labels(decision).inc()
+        for rule_id in triggered:
+            FRAUD_RULE_HITS.labels(rule_id).inc()
+        return FraudDecision(decision, triggered)
+
+    def record(self, ctx: TransactionContext) -> None:
+        """Count a committed transaction in every rule's windows."""
+        with self._lock:
+            for rule in self.rules:
+                rule.record(ctx, self.store)
+
+
+def build_engine() -> FraudEngine:
+    """Engine with the built-in rules, configured from settings."""
+    engine = FraudEngine(WindowStore(settings.fraud_max_tracked_keys, settings.fraud_idle_key_seconds))
+    window = settings.fraud_window_seconds
+    engine.register(VelocityRule(
+        "withdrawal.velocity", ("withdrawal", "card"), lambda ctx: ctx.account_id,
+        window, max_count=settings.fraud_max_withdrawals
+    ))
+    engine.register(VelocityRule(
+        "account.outflow", ("withdrawal", "transfer", "card"), lambda ctx: ctx.account_id,
+        window, max_amount=to_cents(settings.fraud_max_outflow_amount)
+    ))
+    engine.register(VelocityRule(
+        "card.velocity", ("card",), lambda ctx: ctx.card_id,
+        window, max_count=settings.fraud_max_card_transactions
+    ))
+    engine.register(VelocityRule(
+        "destination.fan_in", ("transfer",), lambda ctx: ctx.destination_account_id,
+        window, max_count=settings.fraud_max_incoming_transfers, action=REVIEW
+    ))
+    engine.register(NewPayeeRule(to_cents(settings.fraud_new_payee_threshold)))
+    return engine
+
+
+fraud_engine = build_engine()
+
+
+def needs_payee_history(amount) -> bool:
+    """Whether a transfer is large enough for the new-payee rule to need payee history."""
+    return settings.fraud_enabled and to_cents(amount) >= to_cents(settings.fraud_new_payee_threshold)
+
+
+def screen(ctx: TransactionContext) -> FraudDecision:
+    """Run the fraud rules for a pending transaction; declines raise 403.
+
+    Call before anything is written, and `record_committed` after the commit.
+    """
+    if not settings.fraud_enabled:
+        return FraudDecision(APPROVE, [])
+    decision = fraud_engine.evaluate(ctx)
+    if decision.declined:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail={
+                "message": "Transaction declined by fraud screening",
+                "decision": decision.decision,
+                "rules": decision.rules
+            }
+        )
+    return decision
+
+
+def record_review(db, transaction, decision: FraudDecision) -> None:
+    """Flag a transaction the rules sent to review with a `fraud.review` outbox event.
+
+    Call in the unit of work that writes the transaction; other decisions
+    add nothing.
+    """
+    if decision.decision == REVIEW:
+        record_fraud_review(db, transaction, decision.rules)
+
+
+def record_committed(ctx: TransactionContext) -> None:
+    if settings.fraud_enabled:
+        fraud_engine.record(ctx)
@@ -0,0 +1,116 @@
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.metrics import REGISTRY
+from app.models import FxRate
+
+CENT = Decimal("0.01")
+RATE_QUANTUM = Decimal("0.00000001")
+
+FX_CACHE_RELOADS = REGISTRY.counter(
+    "fx_rate_cache_reloads_total",
+    "Times the in-process FX rate table was reloaded from the database."
+)
+
+
+class FxRateCache:
+    """In-process copy of the fx_rates table.
+
+    Each currency pair keeps its rates sorted by effective time, so a lookup
+    is a dict access plus a bisect. Local writes call `invalidate`; changes
+    made by other processes are noticed by comparing the table's row count
+    and highest id at most every `refresh_seconds`.
+    """
+
+    def __init__(self, refresh_seconds: float = 30.0):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._pairs: Dict[Tuple[str, str], Tuple[List[datetime], List[Decimal]]] = {}
+        self._version: Optional[tuple] = None
+        self._checked_at = 0.0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version = None
+
+    def _refresh(self, db: Session) -> None:
+        now = time.monotonic()
+        if self._version is not None and now - self._checked_at < self.refresh_seconds:
+            return
+        version = tuple(db.query(func.count(FxRate.id), func.max(FxRate.id)).one())
+        with self._lock:
+            self._checked_at = now
+            if version == self._version:
+                return
+            pairs: Dict[Tuple[str, str], Tuple[List[datetime], List[Decimal]]] = {}
+            rows = db.query(FxRate.base_currency, FxRate.quote_currency, FxRate.effective_at, FxRate.rate).order_by(
+                FxRate.base_currency, FxRate.quote_currency, FxRate.effective_at
+            )
+            for base, quote, effective_at, rate in rows:
+                times, rates = pairs.setdefault((base, quote), ([], []))
+                times.append(effective_at)
+                rates.append(Decimal(str(rate)))
+            self._pairs = pairs
+            self._version = version
+        FX_CACHE_RELOADS.labels().inc()
+
+    def _lookup(self, pair: Tuple[str, str], at: datetime) -> Optional[Decimal]:
+        entry = self._pairs.get(pair)
+        if entry is None:
+            return None
+        index = bisect_right(entry[0], at)
+        return entry[1][index - 1] if index else None
+
+    def rate(self, db: Session, base: str, quote: str, at: Optional[datetime] = None) -> Optional[Decimal]:
+        """Units of `quote` per unit of `base` effective at `at` (default: now).
+
+        Falls back to the inverse of the opposite pair when only that is quoted.
+        """
+        if base == quote:
+            return Decimal(1)
+        self._refresh(db)
+        at = at or datetime.now()
+        direct = self._lookup((base, quote), at)
+        if direct is not None:
+            return direct
+        inverse = self._lookup((quote, base), at)
+        if inverse is not None:
+            return (Decimal(1) / inverse).quantize(RATE_QUANTUM)
+        return None
+
+    def latest(self, db: Session, at: Optional[datetime] = None) -> List[Tuple[str, str, Decimal, datetime]]:
+        """(base, quote, rate, effective_at) in force at `at` for every quoted pair."""
+        self._refresh(db)
+        at = at or datetime.now()
+        result = []
+        for (base, quote), (times, rates) in sorted(self._pairs.items()):
+            index = bisect_right(times, at)
+            if index:
+                result.append((base, quote, rates[index - 1], times[index - 1]))
+        return result
+
+
+fx_cache = FxRateCache(settings.fx_cache_refresh_seconds)
+
+
+def convert(db: Session, amount: Decimal, from_currency: str, to_currency: str,
+            at: Optional[datetime] = None) -> Tuple[Decimal, Decimal]:
+    """Convert an amount; returns (converted amount rounded to cents, rate used).
+
+    Raises 400 when no rate is quoted for the pair.
+    """
+    rate = fx_cache.rate(db, from_currency, to_currency, at)
+    if rate is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No exchange rate available for {from_currency}/{to_currency}"
+        )
+    return (Decimal(amount) * rate).quantize(CENT, rounding=ROUND_HALF_UP), rate
@@ -0,0 +1,298 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Date, Integer, Numeric, bindparam, case, select, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.api.transactions import generate_transaction_id
+from app.core.concurrency import run_serialized
+from app.core.outbox import TRANSACTION_UPDATED, record_transaction, record_transactions
+from app.core.versioning import bump_user_version
+from app.models import (
+    Account, AccountStatus, Card, Transaction, TransactionType, TransactionStatus, Hold, HoldStatus
+)
+
+accounts_table = Account.__table__
+cards_table = Card.__table__
+
+_RETURNED = (
+    accounts_table.c.id, accounts_table.c.user_id, accounts_table.c.balance,
+    accounts_table.c.available_balance, accounts_table.c.currency
+)
+
+
+def _account_row(row) -> SimpleNamespace:
+    """Plain account row; enough for events and version bumps."""
+    return SimpleNamespace(**row._mapping)
+
+
+def _reserve_statement(owned: bool):
+    a = accounts_table
+    amount = bindparam("b_amount", type_=Numeric(15, 2))
+    conditions = [a.c.id == bindparam("b_account"), a.c.status == AccountStatus.ACTIVE, a.c.available_balance >= amount]
+    if owned:
+        conditions.append(a.c.user_id == bindparam("b_user"))
+    return update(a).where(*conditions).values(
+        available_balance=a.c.available_balance - amount
+    ).returning(*_RETURNED)
+
+
+# Built once: constructing the statement costs more than executing it
+_RESERVE = {owned: _reserve_statement(owned) for owned in (False, True)}
+
+
+def _unspend_statement():
+    """Take an unused card authorization back out of the card's spend counters.
+
+    Only counters still on the authorization's day or month are reduced; an
+    earlier period's spend already counts as zero.
+    """
+    c = cards_table
+    amount = bindparam("b_amount", type_=Numeric(15, 2))
+    return update(c).where(c.c.id == bindparam("b_card")).values(
+        daily_spent=case(
+            (c.c.daily_spent_on == bindparam("b_day", type_=Date), c.c.daily_spent - amount),
+            else_=c.c.daily_spent
+        ),
+        monthly_spent=case(
+            (c.c.monthly_spent_in == bindparam("b_month", type_=Integer), c.c.monthly_spent - amount),
+            else_=c.c.monthly_spent
+        )
+    )
+
+
+_UNSPEND = _unspend_statement()
+
+
+def _unspend_params(card_id: int, authorized_at: datetime, amount: Decimal) -> dict:
+    return {
+        "b_card": card_id, "b_amount": amount, "b_day": authorized_at.date(),
+        "b_month": authorized_at.year * 100 + authorized_at.month
+    }
+
+
+def _rejected(db: Session, account_id: int, user_id: Optional[int]) -> HTTPException:
+    """Why the conditional reservation matched no row; only read on failure."""
+    account = db.execute(select(
+        accounts_table.c.user_id, accounts_table.c.status
+    ).where(accounts_table.c.id == account_id)).first()
+    if account is None or (user_id is not None and account.user_id != user_id):
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Account not found or access denied"
+        )
+    if account.status != AccountStatus.ACTIVE:
+        return HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Account is not active"
+        )
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Insufficient funds"
+    )
+
+
+def place_hold(db: Session, account_id: int, amount: Decimal, expires_at: Optional[datetime] = None,
+               user_id: Optional[int] = None, transaction_type: TransactionType = TransactionType.PAYMENT,
+               description: Optional[str] = None, reference: Optional[str] = None,
+               merchant_name: Optional[str] = None, merchant_category: Optional[str] = None,
+               card_id: Optional[int] = None,
+               now: Optional[datetime] = None) -> Tuple[Hold, Transaction, SimpleNamespace]:
+    """Reserve `amount` of an account's available balance.
+
+    The status and funds checks and the reservation are a single conditional
+    UPDATE ... RETURNING, so the happy path reads nothing first. The hold and
+    its PENDING transaction are added to the caller's unit of work; call
+    under the account's lock and commit afterwards. A card authorization
+    passes its `now`, the hold's creation time, which dates the spend it
+    gives back to the card's counters if it is not captured.
+    """
+    row = db.execute(_RESERVE[user_id is not None], {
+        "b_account": account_id, "b_amount": amount, "b_user": user_id
+    }).first()
+    if row is None:
+        raise _rejected(db, account_id, user_id)
+    account = _account_row(row)
+
+    transaction = Transaction(
+        transaction_id=generate_transaction_id(),
+        transaction_type=transaction_type,
+        status=TransactionStatus.PENDING,
+        amount=amount,
+        currency=account.currency,
+        fee=Decimal("0.00"),
+        account_id=account.id,
+        description=description,
+        reference_number=reference,
+        merchant_name=merchant_name,
+        merchant_category=merchant_category
+    )
+    hold = Hold(
+        account_id=account.id,
+        amount=amount,
+        currency=account.currency,
+        status=HoldStatus.ACTIVE,
+        transaction_id=transaction.transaction_id,
+        description=description,
+        card_id=card_id,
+        expires_at=expires_at or (now or datetime.now()) + timedelta(minutes=settings.hold_default_expiry_minutes)
+    )
+    if now is not None:
+        hold.created_at = now
+    db.add(transaction)
+    db.add(hold)
+    record_transaction(db, transaction)
+    bump_user_version(db, account.user_id)
+    return hold, transaction, account
+
+
+def _check_active(hold: Hold, now: datetime) -> None:
+    if hold.status != HoldStatus.ACTIVE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Hold is already {hold.status.value}"
+        )
+    if hold.expires_at <= now:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Hold has expired"
+        )
+
+
+def _pending_transaction(db: Session, hold: Hold) -> Transaction:
+    return db.query(Transaction).filter(Transaction.transaction_id == hold.transaction_id).one()
+
+
+def capture_hold(db: Session, hold: Hold, amount: Optional[Decimal] = None,
+                 now: Optional[datetime] = None) -> Tuple[Transaction, SimpleNamespace]:
+    """Post a held amount, or part of it; the rest is released.
+
+    Adds the changes to the caller's unit of work; call under the account's
+    lock and commit afterwards.
+    """
+    now = now or datetime.now()
+    _check_active(hold, now)
+    amount = hold.amount if amount is None else amount
+    if amount > hold.amount:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Capture amount exceeds the held amount"
+        )
+
+    a = accounts_table
+    account = _account_row(db.execute(update(a).where(a.c.id == hold.account_id).values(
+        balance=a.c.balance - amount,
+        available_balance=a.c.available_balance + (hold.amount - amount),
+        last_activity=now
+    ).returning(*_RETURNED)).one())
+
+    if hold.card_id is not None and amount < hold.amount:
+        db.execute(_UNSPEND, _unspend_params(hold.card_id, hold.created_at, hold.amount - amount))
+
+    transaction = _pending_transaction(db, hold)
+    transaction.status = TransactionStatus.COMPLETED
+    transaction.amount = amount
+    transaction.processed_at = now
+    hold.status = HoldStatus.CAPTURED
+    hold.captured_amount = amount
+    hold.resolved_at = now
+    record_transaction(db, transaction, TRANSACTION_UPDATED)
+    bump_user_version(db, account.user_id)
+    return transaction, account
+
+
+def release_hold(db: Session, hold: Hold, now: Optional[datetime] = None) -> Tuple[Transaction, SimpleNamespace]:
+    """Return a held amount to the available balance and cancel its transaction.
+
+    Adds the changes to the caller's unit of work; call under the account's
+    lock and commit afterwards.
+    """
+    now = now or datetime.now()
+    if hold.status != HoldStatus.ACTIVE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Hold is already {hold.status.value}"
+        )
+
+    a = accounts_table
+    account = _account_row(db.execute(update(a).where(a.c.id == hold.account_id).values(
+        available_balance=a.c.available_balance + hold.amount
+    ).returning(*_RETURNED)).one())
+    if hold.card_id is not None:
+        db.execute(_UNSPEND, _unspend_params(hold.card_id, hold.created_at, hold.amount))
+
+    transaction = _pending_transaction(db, hold)
+    transaction.status = TransactionStatus.CANCELLED
+    transaction.processed_at = now
+    hold.status = HoldStatus.RELEASED
+    hold.resolved_at = now
+    record_transaction(db, transaction, TRANSACTION_UPDATED)
+    bump_user_version(db, account.user_id)
+    return transaction, account
+
+
+def _expire_batch(db: Session, hold_ids: List[int], now: datetime) -> int:
+    """Expire one batch of holds in a single commit."""
+    # Re-read under the locks: a hold may have been captured or released meanwhile
+    holds = db.execute(select(
+        Hold.id, Hold.account_id, Hold.amount, Hold.transaction_id, Hold.card_id, Hold.created_at
+    ).where(
+        Hold.id.in_(hold_ids), Hold.status == HoldStatus.ACTIVE
+    )).all()
+    if not holds:
+        return 0
+
+    released = defaultdict(Decimal)
+    for hold in holds:
+        released[hold.account_id] += hold.amount
+    a = accounts_table
+    db.execute(update(a).where(a.c.id == bindparam("b_id")).values(
+        available_balance=a.c.available_balance + bindparam("b_amount")
+    ), [{"b_id": account_id, "b_amount": amount} for account_id, amount in released.items()])
+    card_holds = [hold for hold in holds if hold.card_id is not None]
+    if card_holds:
+        db.execute(_UNSPEND, [_unspend_params(hold.card_id, hold.created_at, hold.amount) for hold in card_holds])
+    db.execute(update(Hold), [
+        {"id": hold.id, "status": HoldStatus.EXPIRED, "resolved_at": now} for hold in holds
+    ])
+
+    transactions = db.query(Transaction).filter(
+        Transaction.transaction_id.in_([hold.transaction_id for hold in holds])
+    ).all()
+    for transaction in transactions:
+        transaction.status = TransactionStatus.CANCELLED
+        transaction.processed_at = now
+    record_transactions(db, transactions, TRANSACTION_UPDATED)
+    bump_user_version(db, *db.scalars(select(a.c.user_id).where(a.c.id.in_(released))).all())
+    db.commit()
+    return len(holds)
+
+
+def expire_holds(db: Session, now: Optional[datetime] = None, batch_size: Optional[int] = None) -> dict:
+    """Release every active hold whose expiry time has passed.
+
+    Due holds come from the (status, expires_at) index in batches; each batch
+    holds its accounts' locks and commits the released balances, hold
+    statuses and cancelled transactions together. Other processes learn
+    about the cancellations from the outbox.
+    """
+    now = now or datetime.now()
+    batch_size = batch_size or settings.hold_sweep_batch_size
+    totals = {"expired": 0, "batches": 0}
+    while True:
+        due = db.execute(select(Hold.id, Hold.account_id).where(
+            Hold.status == HoldStatus.ACTIVE,
+            Hold.expires_at <= now
+        ).order_by(Hold.expires_at).limit(batch_size)).all()
+        if not due:
+            break
+        totals["expired"] += run_serialized(
+            db, {row.account_id for row in due}, "hold_expiry",
+            lambda: _expire_batch(db, [row.id for row in due], now)
+        )
+        totals["batches"] += 1
+    return totals
@@ -0,0 +1,185 @@
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from sqlalchemy import Integer, bindparam, cast, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.api.transactions import generate_transaction_id
+from app.core.concurrency import run_serialized
+from app.core.outbox import record_transactions
+from app.core.versioning import bump_user_version
+from app.models import Account, AccountType, AccountStatus, Transaction, TransactionType, TransactionStatus
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is listed in requirements.txt
+    np = None
+
+accounts_table = Account.__table__
+transactions_table = Transaction.__table__
+
+ELIGIBLE_TYPES = (AccountType.SAVINGS, AccountType.MONEY_MARKET, AccountType.CERTIFICATE_OF_DEPOSIT)
+
+# Interest is computed in millionths of a cent; the remainder below a cent is
+# carried on the account to the next accrual instead of being rounded away
+MICROS = 1_000_000
+
+
+class RateTiers(NamedTuple):
+    floors: List[int]  # Balance floor of each tier, in cents
+    rates: List[int]  # Annual rate of each tier, in parts per million
+
+
+def compile_tiers(tiers: Dict[str, Sequence]) -> Dict[AccountType, RateTiers]:
+    """Fixed-point form of the configured (balance floor, annual percent) tiers."""
+    compiled = {}
+    for account_type, rows in tiers.items():
+        rows = sorted((Decimal(str(floor)), Decimal(str(rate))) for floor, rate in rows)
+        compiled[AccountType(account_type)] = RateTiers(
+            [int(floor * 100) for floor, _ in rows],
+            [int(rate * 10000) for _, rate in rows]
+        )
+    return compiled
+
+
+def accrue(balances: Sequence[int], carried: Sequence[int], days: Sequence[int],
+           tiers: RateTiers, day_count: int):
+    """Interest for `days` days on balances in cents, plus the carried remainder.
+
+    Each tier's rate applies to the part of the balance between its floor
+    and the next one. Returns (whole cents to post, new remainder in
+    millionths of a cent) as arrays, or lists without numpy.
+    """
+    bounds = tiers.floors[1:] + [None]
+    if np is not None:
+        balances = np.asarray(balances, dtype=np.int64)
+        yearly = np.zeros(len(balances), dtype=np.int64)
+        for floor, ceiling, rate in zip(tiers.floors, bounds, tiers.rates):
+            portion = np.maximum(balances - floor, 0)
+            if ceiling is not None:
+                portion = np.minimum(portion, ceiling - floor)
+            yearly += portion * rate
+        total = yearly * np.asarray(days, dtype=np.int64) // day_count + np.asarray(carried, dtype=np.int64)
+        return total // MICROS, total % MICROS
+
+    posted, remainders = [], []
+    for balance, carry, n in zip(balances, carried, days):
+        yearly = 0
+        for floor, ceiling, rate in zip(tiers.floors, bounds, tiers.rates):
+            portion = max(balance - floor, 0)
+            if ceiling is not None:
+                portion = min(portion, ceiling - floor)
+            yearly += portion * rate
+        total = yearly * n // day_count + carry
+        posted.append(total // MICROS)
+        remainders.append(total % MICROS)
+    return posted, remainders
+
+
+def _due(day: date):
+    a = accounts_table
+    return (
+        a.c.account_type.in_(ELIGIBLE_TYPES),
+        a.c.status == AccountStatus.ACTIVE,
+        or_(a.c.interest_accrued_through.is_(None), a.c.interest_accrued_through < day)
+    )
+
+
+def _accrue_chunk(db: Session, account_ids: List[int], day: date, now: datetime,
+                  tiers: Dict[AccountType, RateTiers], day_count: int) -> dict:
+    """Accrue one chunk of accounts and post its INTEREST transactions in one commit."""
+    a = accounts_table
+    # Re-read under the locks: balances may have moved since the chunk was listed
+    rows = db.execute(select(
+        a.c.id, a.c.user_id, a.c.account_type, a.c.currency, a.c.accrued_interest,
+        a.c.interest_accrued_through, cast(func.round(a.c.balance * 100), Integer).label("cents")
+    ).where(a.c.id.in_(account_ids), *_due(day))).all()
+
+    transactions = []
+    account_updates = []
+    users = set()
+    for account_type in ELIGIBLE_TYPES:
+        group = [row for row in rows if row.account_type == account_type]
+        if not group or account_type not in tiers:
+            continue
+        # Accounts the job missed earlier catch up for every day since their last accrual
+        days = [(day - row.interest_accrued_through).days if row.interest_accrued_through else 1 for row in group]
+        posted, remainders = accrue(
+            [row.cents for row in group], [row.accrued_interest or 0 for row in group],
+            days, tiers[account_type], day_count
+        )
+        for row, cents, remainder in zip(group, posted, remainders):
+            amount = Decimal(int(cents)).scaleb(-2)
+            account_updates.append({
+                "b_id": row.id, "b_amount": amount, "b_remainder": int(remainder)
+            })
+            if not cents:
+                continue
+            transactions.append({
+                "transaction_id": generate_transaction_id(),
+                "transaction_type": TransactionType.INTEREST,
+                "status": TransactionStatus.COMPLETED,
+                "amount": amount,
+                "currency": row.currency,
+                "fee": Decimal("0.00"),
+                "account_id": row.id,
+                "description": f"Interest through {day.isoformat()}",
+                "reference_number": f"INT{day:%Y%m%d}",
+                "created_at": now,
+            })
+            users.add(row.user_id)
+
+    if transactions:
+        db.execute(insert(transactions_table), transactions)
+        record_transactions(db, [
+            SimpleNamespace(exchange_rate=None, converted_amount=None, converted_currency=None,
+                            from_account_id=None, to_account_id=None, **row)
+            for row in transactions
+        ])
+    if account_updates:
+        db.execute(update(a).where(a.c.id == bindparam("b_id")).values(
+            balance=a.c.balance + bindparam("b_amount"),
+            available_balance=a.c.available_balance + bindparam("b_amount"),
+            accrued_interest=bindparam("b_remainder"),
+            interest_accrued_through=day
+        ), account_updates)
+    bump_user_version(db, *users)
+    db.commit()
+    return {"accounts": len(account_updates), "posted": len(transactions),
+            "interest": sum(t["amount"] for t in transactions)}
+
+
+def accrue_interest(db: Session, day: Optional[date] = None, chunk_size: Optional[int] = None,
+                    now: Optional[datetime] = None) -> dict:
+    """Accrue daily interest on every eligible account not yet accrued for `day`.
+
+    Accounts are walked in primary-key chunks; each chunk holds its accounts'
+    locks and commits its INTEREST transactions, balance updates and accrual
+    markers together, so an interrupted run resumes where it stopped and a
+    repeated run posts nothing twice. Other processes learn about the new
+    transactions from the outbox rather than in-process events.
+    """
+    day = day or date.today()
+    now = now or datetime.now()
+    chunk_size = chunk_size or settings.interest_chunk_size
+    tiers = compile_tiers(settings.interest_rate_tiers)
+    totals = {"accounts": 0, "posted": 0, "interest": Decimal("0.00"), "chunks": 0}
+    last_id = 0
+    while True:
+        account_ids = db.scalars(select(accounts_table.c.id).where(
+            accounts_table.c.id > last_id, *_due(day)
+        ).order_by(accounts_table.c.id).limit(chunk_size)).all()
+        if not account_ids:
+            break
+        last_id = account_ids[-1]
+        result = run_serialized(
+            db, account_ids, "interest",
+            lambda: _accrue_chunk(db, account_ids, day, now, tiers, settings.interest_day_count)
+        )
+        for key in ("accounts", "posted", "interest"):
+            totals[key] += result[key]
+        totals["chunks"] += 1
+    totals["interest"] = str(totals["interest"])
+    return totals
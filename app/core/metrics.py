@@ -0,0 +1,445 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from app.config import settings
+
+# Default latency buckets in seconds (tuned for an API backed by SQLite)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Buckets for the number of SQL statements issued by a single request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+# Route label used for requests that did not match any route (keeps cardinality bounded)
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text exposition format."""
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str]) -> str:
+    """Render a label set as `name="value",...` (without braces)."""
+    return ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(labelnames, labelvalues))
+
+
+# Cache of id(route) -> full route template (routes live as long as the app)
+_route_templates: Dict[int, str] = {}
+
+
+def route_template(scope) -> str:
+    """Return the matched route template for an ASGI scope (e.g. /api/v1/accounts/{account_id})."""
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    template = _route_templates.get(id(route))
+    if template is None:
+        own_path = getattr(route, "path_format", route.path)
+        # Routes of included routers may only know their own path, so recover
+        # the router prefix from the request path (computed once per route)
+        segments = scope["path"].split("/")
+        prefix = "/".join(segments[:max(len(segments) - own_path.count("/"), 0)])
+        template = prefix + own_path
+        _route_templates[id(route)] = template
+    return template
+
+
+def _format_value(value: float) -> str:
+    """Render a sample value, keeping integers free of a trailing `.0`."""
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+class _CounterChild:
+    """A single counter time series."""
+
+    __slots__ = ("value", "_lock")
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+
+class _GaugeChild(_CounterChild):
+    """A single gauge time series."""
+
+    __slots__ = ()
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+
+class _HistogramChild:
+    """A single histogram time series with fixed upper bounds."""
+
+    __slots__ = ("upper_bounds", "counts", "sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        # One slot per bucket plus the implicit +Inf bucket
+        self.counts = [0] * (len(upper_bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.upper_bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def snapshot(self):
+        with self._lock:
+            return {"counts": list(self.counts), "sum": self.sum}
+
+
+class _Metric:
+    """Base class for a labelled metric family."""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *labelvalues):
+        """Return the child series for the given label values, creating it once."""
+        child = self._children.get(labelvalues)
+        if child is None:
+            if len(labelvalues) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}")
+            with self._lock:
+                child = self._children.get(labelvalues)
+                if child is None:
+                    child = self._new_child()
+                    self._children[labelvalues] = child
+        return child
+
+    def collect(self) -> dict:
+        """Return a JSON-serialisable snapshot of every series."""
+        return {
+            "type": self.type_name,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "series": [[list(key), child.snapshot()] for key, child in list(self._children.items())],
+        }
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.upper_bounds = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.upper_bounds)
+
+    def collect(self) -> dict:
+        family = super().collect()
+        family["buckets"] = list(self.upper_bounds)
+        return family
+
+
+class MetricsRegistry:
+    """Holds metric families and renders them in the Prometheus text format.
+
+    When ``multiproc_dir`` is set every worker periodically dumps its own
+    snapshot into that directory and a scrape on any worker merges all of them,
+    so counters and histograms are aggregated across the whole worker pool.
+    """
+
+    def __init__(self, multiproc_dir: Optional[str] = None, flush_interval: float = 1.0):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self.multiproc_dir = multiproc_dir
+        self.flush_interval = flush_interval
+        self._last_flush = 0.0
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def collect(self) -> Dict[str, dict]:
+        """Snapshot all metric families of this process."""
+        return {name: metric.collect() for name, metric in list(self._metrics.items())}
+
+    # Multi-worker support
+
+    def _snapshot_path(self, pid: int) -> str:
+        return os.path.join(self.multiproc_dir, f"metrics_{pid}.json")
+
+    def flush(self, force: bool = False) -> None:
+        """Write this worker's snapshot to the shared directory (rate limited)."""
+        if not self.multiproc_dir:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_interval:
+            return
+        self._last_flush = now
+        os.makedirs(self.multiproc_dir, exist_ok=True)
+        path = self._snapshot_path(os.getpid())
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pid": os.getpid(), "families": self.collect()}, f)
+        os.replace(tmp_path, path)
+
+    def _load_snapshots(self) -> List[Tuple[bool, Dict[str, dict]]]:
+        snapshots = []
+        for filename in os.listdir(self.multiproc_dir):
+            if not (filename.startswith("metrics_") and filename.endswith(".json")):
+                continue
+            try:
+                with open(os.path.join(self.multiproc_dir, filename)) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if data.get("pid") == os.getpid():
+                continue
+            snapshots.append((_pid_alive(data.get("pid")), data.get("families", {})))
+        return snapshots
+
+    def collect_all(self) -> Dict[str, dict]:
+        """Merge this process's metrics with the snapshots of the other workers."""
+        families = self.collect()
+        if not self.multiproc_dir:
+            return families
+
+        self.flush(force=True)
+        for alive, other in self._load_snapshots():
+            for name, family in other.items():
+                # Gauges describe current state, so dead workers must not contribute
+                if family["type"] == "gauge" and not alive:
+                    continue
+                if name not in families:
+                    families[name] = {**family, "series": []}
+                _merge_family(families[name], family)
+        return families
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, family in sorted(self.collect_all().items()):
+            lines.append(f"# HELP {name} {family['help']}")
+            lines.append(f"# TYPE {name} {family['type']}")
+            labelnames = family["labelnames"]
+            for labelvalues, value in family["series"]:
+                labels = _format_labels(labelnames, labelvalues)
+                if family["type"] == "histogram":
+                    lines.extend(_render_histogram(name, labels, family["buckets"], value))
+                else:
+                    suffix = f"{{{labels}}}" if labels else ""
+                    lines.append(f"{name}{suffix} {_format_value(value)}")
+        lines.append("")
+        return "\n".join(lines)
+
+
+def _pid_alive(pid: Optional[int]) -> bool:
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _merge_family(target: dict, other: dict) -> None:
+    """Sum the series of ``other`` into ``target`` (same metric family)."""
+    index = {tuple(labels): i for i, (labels, _) in enumerate(target["series"])}
+    for labels, value in other["series"]:
+        position = index.get(tuple(labels))
+        if position is None:
+            if isinstance(value, dict):
+                value = {"counts": list(value["counts"]), "sum": value["sum"]}
+            index[tuple(labels)] = len(target["series"])
+            target["series"].append([labels, value])
+            continue
+        current = target["series"][position][1]
+        if isinstance(current, dict):
+            current["counts"] = [a + b for a, b in zip(current["counts"], value["counts"])]
+            current["sum"] += value["sum"]
+        else:
+            target["series"][position][1] = current + value
+
+
+def _render_histogram(name: str, labels: str, upper_bounds: List[float], value: dict) -> List[str]:
+    prefix = f"{labels}," if labels else ""
+    braces = f"{{{labels}}}" if labels else ""
+    lines = []
+    cumulative = 0
+    for bound, count in zip(upper_bounds, value["counts"]):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{prefix}le="{_format_value(bound)}"}} {cumulative}')
+    cumulative += value["counts"][-1]
+    lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {cumulative}')
+    lines.append(f"{name}_sum{braces} {_format_value(value['sum'])}")
+    lines.append(f"{name}_count{braces} {cumulative}")
+    return lines
+
+
+# Global registry used by the application
+REGISTRY = MetricsRegistry(multiproc_dir=settings.metrics_multiproc_dir)
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total",
+    "Total HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by method, route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_IN_PROGRESS = REGISTRY.gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served.",
+    ("method",),
+)
+DB_QUERIES_PER_REQUEST = REGISTRY.histogram(
+    "http_request_db_queries",
+    "Number of SQL statements executed per HTTP request.",
+    ("method", "route"),
+    buckets=QUERY_COUNT_BUCKETS,
+)
+DB_TIME_PER_REQUEST = REGISTRY.histogram(
+    "http_request_db_duration_seconds",
+    "Time spent executing SQL statements per HTTP request.",
+    ("method", "route"),
+)
+
+
+class RequestQueryStats:
+    """Per-request SQL counters filled in by the engine event hooks."""
+
+    __slots__ = ("count", "duration")
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+# Stats object of the request currently being served (None outside requests)
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["metrics_query_start"].pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and exception_context.execution_context is not None:
+        starts = conn.info.get("metrics_query_start")
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine) -> None:
+    """Attach the query counting hooks to a SQLAlchemy engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request counts, latency and DB usage per route."""
+
+    def __init__(self, app, registry: MetricsRegistry = REGISTRY):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_query_stats.reset(token)
+            in_progress.dec()
+
+            # Label by route template, never the raw path
+            template = route_template(scope)
+            HTTP_REQUESTS.labels(method, template, status_code).inc()
+            HTTP_LATENCY.labels(method, template, status_code).observe(elapsed)
+            DB_QUERIES_PER_REQUEST.labels(method, template).observe(stats.count)
+            DB_TIME_PER_REQUEST.labels(method, template).observe(stats.duration)
+            self.registry.flush()
@@ -0,0 +1,156 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional
+
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session
+from app.models import OutboxEvent, ConsumerOffset
+from app.utils.serialization import dumps, loads
+
+TRANSACTION_CREATED = "transaction.created"
+TRANSACTION_UPDATED = "transaction.updated"
+FRAUD_REVIEW = "fraud.review"
+
+CENT = Decimal("0.01")
+
+
+def _money(value) -> str:
+    # Values are still unrounded Python Decimals before the row is flushed
+    return str(Decimal(value if value is not None else 0).quantize(CENT))
+
+
+def _transaction_payload(transaction) -> dict:
+    return {
+        "transaction_id": transaction.transaction_id,
+        "transaction_type": transaction.transaction_type.value,
+        "status": transaction.status.value,
+        "amount": _money(transaction.amount),
+        "currency": transaction.currency,
+        "fee": _money(transaction.fee),
+        "exchange_rate": str(transaction.exchange_rate) if transaction.exchange_rate is not None else None,
+        "converted_amount": _money(transaction.converted_amount) if transaction.converted_amount is not None else None,
+        "converted_currency": transaction.converted_currency,
+        "account_id": transaction.account_id,
+        "from_account_id": transaction.from_account_id,
+        "to_account_id": transaction.to_account_id,
+        "description": transaction.description,
+        "reference": transaction.reference_number,
+    }
+
+
+def record_transaction(db: Session, transaction, event_type: str = TRANSACTION_CREATED) -> OutboxEvent:
+    """Add an outbox event for a transaction to the caller's unit of work.
+
+    Call just before the commit that persists the transaction, so the event
+    exists if and only if the money movement does.
+    """
+    event = OutboxEvent(
+        event_type=event_type,
+        aggregate_id=transaction.transaction_id,
+        payload=dumps(_transaction_payload(transaction)).decode()
+    )
+    db.add(event)
+    return event
+
+
+def record_fraud_review(db: Session, transaction, rules: List[str]) -> OutboxEvent:
+    """Add an event flagging a transaction for review, with the fraud rules that triggered."""
+    event = OutboxEvent(
+        event_type=FRAUD_REVIEW,
+        aggregate_id=transaction.transaction_id,
+        payload=dumps({
+            "transaction_id": transaction.transaction_id,
+            "account_id": transaction.account_id,
+            "amount": _money(transaction.amount),
+            "currency": transaction.currency,
+            "rules": rules,
+        }).decode()
+    )
+    db.add(event)
+    return event
+
+
+def record_transactions(db: Session, transactions, event_type: str = TRANSACTION_CREATED) -> None:
+    """Bulk form of `record_transaction`: one executemany INSERT for a batch."""
+    db.execute(insert(OutboxEvent.__table__), [
+        {
+            "event_type": event_type,
+            "aggregate_id": transaction.transaction_id,
+            "payload": dumps(_transaction_payload(transaction)).decode()
+        }
+        for transaction in transactions
+    ])
+
+
+def read_events(db: Session, after: int, limit: int) -> List[OutboxEvent]:
+    """Next batch of events with an offset greater than `after`.
+
+    A primary-key range scan; SQLite serializes writers, so offsets become
+    visible in commit order and a consumer never skips an event.
+    """
+    return db.query(OutboxEvent).filter(
+        OutboxEvent.id > after
+    ).order_by(OutboxEvent.id).limit(limit).all()
+
+
+def latest_offset(db: Session) -> int:
+    return db.query(func.max(OutboxEvent.id)).scalar() or 0
+
+
+def oldest_offset(db: Session) -> Optional[int]:
+    """Offset of the oldest retained event (None when the feed is empty)."""
+    return db.query(func.min(OutboxEvent.id)).scalar()
+
+
+def is_retained(db: Session, offset: int) -> bool:
+    """Whether reading after `offset` still returns every later event.
+
+    Offsets are contiguous (AUTOINCREMENT ids are never reused, and a rolled
+    back insert rolls back its id too), so events are missing exactly when
+    the oldest retained one is further ahead than the next offset.
+    """
+    oldest = oldest_offset(db)
+    return oldest is None or offset >= oldest - 1
+
+
+def get_offset(db: Session, consumer: str) -> int:
+    """Committed offset of a consumer (0 for one never seen before)."""
+    row = db.query(ConsumerOffset).filter(ConsumerOffset.consumer == consumer).first()
+    return row.offset if row else 0
+
+
+def commit_offset(db: Session, consumer: str, offset: int) -> ConsumerOffset:
+    """Store a consumer's position; committing a lower offset rewinds it."""
+    row = db.query(ConsumerOffset).filter(ConsumerOffset.consumer == consumer).first()
+    if row is None:
+        row = ConsumerOffset(consumer=consumer, offset=offset)
+        db.add(row)
+    else:
+        row.offset = offset
+    return row
+
+
+def prune_consumed(db: Session, created_before: datetime) -> int:
+    """Delete events every registered consumer has committed past and that
+    were created before `created_before` (UTC, like `created_at`).
+
+    The event at the lowest committed offset is kept, so the newest event
+    (and with it the latest offset) always survives.
+    """
+    low_watermark = db.query(func.min(ConsumerOffset.offset)).scalar()
+    if not low_watermark:
+        return 0
+    return db.query(OutboxEvent).filter(
+        OutboxEvent.id < low_watermark,
+        OutboxEvent.created_at < created_before
+    ).delete(synchronize_session=False)
+
+
+def event_to_dict(event: OutboxEvent) -> dict:
+    return {
+        "offset": event.id,
+        "event_type": event.event_type,
+        "aggregate_id": event.aggregate_id,
+        "payload": loads(event.payload),
+        "created_at": event.created_at,
+    }
@@ -0,0 +1,175 @@
+import itertools
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from app.config import settings
+from app.core.metrics import route_template
+
+# Header clients send to opt in, and the header the summary is returned in
+PROFILE_HEADER = b"x-sql-profile"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_NUMBER_RE = re.compile(r"\b\d+(\.\d+)?\b")
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+# Expanded IN lists such as "IN (?, ?, ?)" collapse to a single placeholder
+_IN_LIST_RE = re.compile(r"\(\s*\?(\s*,\s*\?)*\s*\)")
+
+
+def normalize_statement(statement: str) -> str:
+    """Reduce a SQL statement to its shape (literals and IN-lists replaced by `?`)."""
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _STRING_RE.sub("?", shape)
+    shape = _NUMBER_RE.sub("?", shape)
+    return _IN_LIST_RE.sub("(?)", shape)
+
+
+class SQLProfile:
+    """All SQL statements executed while serving one request."""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, method: str, path: str):
+        self.id = next(self._ids)
+        self.method = method
+        self.path = path
+        self.route = path
+        self.status_code: Optional[int] = None
+        self.statements: List[tuple] = []  # (statement, duration in seconds)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.statements.append((statement, duration))
+
+    @property
+    def total_time(self) -> float:
+        return sum(duration for _, duration in self.statements)
+
+    def groups(self) -> List[dict]:
+        """Group statements by normalized shape, most frequent first."""
+        grouped: Dict[str, dict] = {}
+        for statement, duration in self.statements:
+            shape = normalize_statement(statement)
+            group = grouped.get(shape)
+            if group is None:
+                group = grouped[shape] = {"statement": shape, "count": 0, "total_ms": 0.0}
+            group["count"] += 1
+            group["total_ms"] += duration * 1000
+        for group in grouped.values():
+            group["total_ms"] = round(group["total_ms"], 3)
+        return sorted(grouped.values(), key=lambda g: (-g["count"], -g["total_ms"]))
+
+    def n_plus_one_suspects(self, groups: Optional[List[dict]] = None) -> List[dict]:
+        """Statement shapes repeated often enough to look like N+1 access."""
+        groups = groups if groups is not None else self.groups()
+        threshold = settings.sql_profiler_repeat_threshold
+        return [group for group in groups if group["count"] >= threshold]
+
+    def header_value(self) -> str:
+        """Compact summary returned in the X-SQL-Profile response header."""
+        return (
+            f"id={self.id}; queries={len(self.statements)}; "
+            f"time_ms={self.total_time * 1000:.3f}; n_plus_one={len(self.n_plus_one_suspects())}"
+        )
+
+    def to_dict(self) -> dict:
+        groups = self.groups()
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "route": self.route,
+            "status_code": self.status_code,
+            "query_count": len(self.statements),
+            "total_ms": round(self.total_time * 1000, 3),
+            "groups": groups,
+            "n_plus_one_suspects": self.n_plus_one_suspects(groups),
+        }
+
+
+# Profile of the request currently being served (None when profiling is off)
+current_profile: ContextVar[Optional[SQLProfile]] = ContextVar("current_profile", default=None)
+
+# Most recent profiles, served by the debug endpoint
+recent_profiles: deque = deque(maxlen=100)
+
+
+def get_profile(profile_id: int) -> Optional[SQLProfile]:
+    """Look up a recent profile by id."""
+    for profile in recent_profiles:
+        if profile.id == profile_id:
+            return profile
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_profile.get() is not None:
+        conn.info.setdefault("profiler_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = current_profile.get()
+    if profile is not None:
+        started = conn.info["profiler_query_start"].pop()
+        profile.record(statement, time.perf_counter() - started)
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    conn = exception_context.connection
+    if conn is not None and exception_context.execution_context is not None and current_profile.get() is not None:
+        starts = conn.info.get("profiler_query_start")
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine) -> None:
+    """Attach the profiling hooks to a SQLAlchemy engine."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+def _profiling_requested(scope) -> bool:
+    if settings.sql_profiler_enabled:
+        return True
+    # The opt-in header is only honoured in debug mode
+    if not settings.debug:
+        return False
+    for name, value in scope.get("headers", ()):
+        if name == PROFILE_HEADER:
+            return value.lower() in (b"1", b"true", b"yes")
+    return False
+
+
+class SQLProfilerMiddleware:
+    """ASGI middleware capturing every SQL statement of opted-in requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = SQLProfile(scope["method"], scope["path"])
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_HEADER, profile.header_value().encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        token = current_profile.set(profile)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_profile.reset(token)
+            profile.route = route_template(scope)
+            recent_profiles.append(profile)
@@ -0,0 +1,201 @@
+import math
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from app.config import settings
+from app.core.metrics import REGISTRY
+from app.core.security import get_user_id_from_token
+from app.utils.serialization import dumps
+
+RATE_LIMITED = REGISTRY.counter(
+    "rate_limited_requests_total",
+    "Requests rejected with 429 by the rate limiter.",
+    ("limit",)
+)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+_PARAM_RE = re.compile(r"\{[^}/]+\}")
+
+
+def parse_rate(value: str) -> Tuple[int, float]:
+    """Parse "10/minute" (or "10/60") into (bucket capacity, tokens refilled per second)."""
+    count, _, period = value.partition("/")
+    seconds = _PERIODS[period] if period in _PERIODS else float(period)
+    capacity = int(count)
+    return capacity, capacity / seconds
+
+
+class RouteLimit:
+    """Token bucket parameters for one "METHOD /path/{template}" pattern."""
+
+    __slots__ = ("key", "method", "pattern", "capacity", "rate")
+
+    def __init__(self, key: str, rate: str):
+        self.key = key
+        method, _, path = key.partition(" ")
+        self.method = method.upper() if path else "*"
+        path = path or method
+        literals = [re.escape(part) for part in _PARAM_RE.split(path)]
+        self.pattern = re.compile("^" + "[^/]+".join(literals) + "$")
+        self.capacity, self.rate = parse_rate(rate)
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method == "*" or self.method == method) and self.pattern.match(path) is not None
+
+
+class MemoryBucketStore:
+    """Token buckets held in this process (LRU-bounded)."""
+
+    blocking = False
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+
+    def take(self, key: str, capacity: int, rate: float) -> Tuple[bool, float, float]:
+        """Take one token: (allowed, tokens remaining, seconds until the next token)."""
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(capacity), now]
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            return _take(bucket, capacity, rate, now)
+
+
+class SQLiteBucketStore:
+    """Token buckets in a SQLite file shared by all workers on the host.
+
+    `take` may wait on the file lock, so the middleware calls it off the event loop.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets "
+            "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+        )
+
+    def take(self, key: str, capacity: int, rate: float) -> Tuple[bool, float, float]:
+        now = time.time()
+        with self._lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT tokens, updated_at FROM rate_limit_buckets WHERE key = ?", (key,)
+                ).fetchone()
+                bucket = list(row) if row else [float(capacity), now]
+                result = _take(bucket, capacity, rate, now)
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_limit_buckets (key, tokens, updated_at) VALUES (?, ?, ?)",
+                    (key, bucket[0], bucket[1])
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return result
+
+
+def _take(bucket: list, capacity: int, rate: float, now: float) -> Tuple[bool, float, float]:
+    tokens = min(float(capacity), bucket[0] + max(now - bucket[1], 0.0) * rate)
+    bucket[1] = now
+    if tokens >= 1.0:
+        bucket[0] = tokens - 1.0
+        return True, bucket[0], 0.0
+    bucket[0] = tokens
+    return False, tokens, (1.0 - tokens) / rate
+
+
+def build_store():
+    if settings.rate_limit_backend == "sqlite":
+        return SQLiteBucketStore(settings.rate_limit_sqlite_path)
+    return MemoryBucketStore()
+
+
+def _identity(scope) -> str:
+    """Authenticated user id from the bearer token, otherwise the client IP."""
+    for name, value in scope.get("headers", ()):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                user_id = get_user_id_from_token(token)
+                if user_id is not None:
+                    return f"user:{user_id}"
+            break
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class RateLimitMiddleware:
+    """ASGI middleware applying per-route token buckets per user (or IP)."""
+
+    def __init__(self, app, limits: Optional[Dict[str, str]] = None,
+                 default: Optional[str] = None, store=None):
+        self.app = app
+        limits = settings.rate_limits if limits is None else limits
+        self.limits: List[RouteLimit] = [RouteLimit(key, rate) for key, rate in limits.items()]
+        default = settings.rate_limit_default if default is None else default
+        self.default = RouteLimit("*", default) if default else None
+        self.store = store or build_store()
+
+    def _limit_for(self, method: str, path: str) -> Optional[RouteLimit]:
+        for limit in self.limits:
+            if limit.matches(method, path):
+                return limit
+        return self.default
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.rate_limit_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        limit = self._limit_for(scope["method"], scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = f"{limit.key}|{_identity(scope)}"
+        if self.store.blocking:
+            allowed, remaining, retry_after = await run_in_threadpool(self.store.take, key, limit.capacity, limit.rate)
+        else:
+            allowed, remaining, retry_after = self.store.take(key, limit.capacity, limit.rate)
+        rate_headers = [
+            (b"x-ratelimit-limit", str(limit.capacity).encode()),
+            (b"x-ratelimit-remaining", str(int(remaining)).encode()),
+        ]
+        if not allowed:
+            RATE_LIMITED.labels(limit.key).inc()
+            body = dumps({"detail": "Rate limit exceeded"})
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+                ] + rate_headers,
+            })
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": list(message.get("headers", [])) + rate_headers}
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
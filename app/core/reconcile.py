@@ -0,0 +1,268 @@
+import csv
+import json
+import multiprocessing
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Integer, String, and_, case, cast, create_engine, false, func, literal, select, union, update
+from sqlalchemy.engine import Connection, Engine
+from app.config import settings
+from app.core.analytics import format_cents
+from app.models import Account, ArchiveManifest, Transaction, TransactionType, CREDIT_TYPES, POSTED_STATUSES
+
+transactions_table = Transaction.__table__
+accounts_table = Account.__table__
+
+REPORT_COLUMNS = ["account_id", "user_id", "stored_balance", "ledger_balance", "difference"]
+
+Partition = Tuple[int, int, Optional[List[int]]]  # (first id, last id, only these ids)
+
+
+def _cents(column):
+    return cast(func.round(column * 100), Integer)
+
+
+def _in_partition(column, partition: Partition):
+    lo, hi, account_ids = partition
+    condition = column.between(lo, hi)
+    if account_ids is not None:
+        condition = and_(condition, column.in_(account_ids))
+    return condition
+
+
+def ledger_queries(partition: Partition):
+    """Grouped per-account sums (in cents) of posted transactions in a partition.
+
+    Transfers are stored once, on the source account, so incoming transfers
+    are summed separately by destination, in its currency when converted.
+    """
+    t = transactions_table
+    cents = _cents(t.c.amount)
+    posted = t.c.status.in_(POSTED_STATUSES)
+    own = select(
+        t.c.account_id,
+        func.sum(case((t.c.transaction_type.in_(CREDIT_TYPES), cents), else_=-cents))
+    ).where(_in_partition(t.c.account_id, partition), posted).group_by(t.c.account_id)
+    incoming = select(
+        t.c.to_account_id,
+        func.sum(_cents(func.coalesce(t.c.converted_amount, t.c.amount)))
+    ).where(
+        _in_partition(t.c.to_account_id, partition),
+        t.c.transaction_type == TransactionType.TRANSFER,
+        posted
+    ).group_by(t.c.to_account_id)
+    return own, incoming
+
+
+def _add_ledger(conn: Connection, partition: Partition, ledger: Dict[int, int]) -> None:
+    for query in ledger_queries(partition):
+        for account_id, cents in conn.execute(query):
+            ledger[account_id] = ledger.get(account_id, 0) + cents
+
+
+def reconcile_partition(engine: Engine, archive_engines: Iterable[Engine],
+                        partition: Partition) -> Tuple[int, List[dict]]:
+    """Compare stored balances of one partition with its ledger.
+
+    Returns the number of accounts checked and their discrepancies.
+    """
+    ledger: Dict[int, int] = {}
+    # Archives first: rows only ever move from the live table into archives
+    for archive_engine in archive_engines:
+        with archive_engine.connect() as conn:
+            _add_ledger(conn, partition, ledger)
+
+    a = accounts_table
+    with engine.connect() as conn, conn.begin():
+        # One read transaction: stored balances and live rows from the same snapshot
+        stored = conn.execute(select(a.c.id, a.c.user_id, _cents(a.c.balance)).where(
+            _in_partition(a.c.id, partition)
+        )).all()
+        _add_ledger(conn, partition, ledger)
+
+    discrepancies = [
+        {
+            "account_id": account_id,
+            "user_id": user_id,
+            "stored_balance": format_cents(balance),
+            "ledger_balance": format_cents(ledger.get(account_id, 0)),
+            "difference": format_cents(balance - ledger.get(account_id, 0))
+        }
+        for account_id, user_id, balance in stored
+        if balance != ledger.get(account_id, 0)
+    ]
+    return len(stored), discrepancies
+
+
+def plan_partitions(conn: Connection, partition_size: int, since: Optional[int] = None,
+                    until: Optional[int] = None, updated_since: Optional[str] = None) -> List[Partition]:
+    """Account id ranges of `partition_size` ids.
+
+    With `since`, only accounts touched by transactions with an id in
+    (since, until], or by older transactions updated at or after
+    `updated_since` (a captured hold, a settled or reversed row), are included.
+    """
+    if since is None:
+        lo, hi = conn.execute(select(func.min(accounts_table.c.id), func.max(accounts_table.c.id))).one()
+        if lo is None:
+            return []
+        return [(start, min(start + partition_size - 1, hi), None) for start in range(lo, hi + 1, partition_size)]
+
+    t = transactions_table
+    window = and_(t.c.id > since, t.c.id <= until)
+    if updated_since is not None:
+        # Compared as text: both sides are in the format of SQLite's CURRENT_TIMESTAMP
+        window = window | and_(t.c.id <= since, t.c.updated_at >= literal(updated_since, String))
+    touched = union(
+        select(t.c.account_id.label("id")).where(window),
+        select(t.c.to_account_id).where(window, t.c.to_account_id.isnot(None))
+    )
+    partitions: Dict[int, List[int]] = {}
+    for (account_id,) in conn.execute(touched):
+        partitions.setdefault(account_id - (account_id - 1) % partition_size, []).append(account_id)
+    return [(start, start + partition_size - 1, sorted(ids)) for start, ids in sorted(partitions.items())]
+
+
+def _watermarks(conn: Connection) -> Tuple[int, str]:
+    """Newest transaction id and the database time, read holding the write lock.
+
+    No writer is mid-transaction then, so every later change gets a larger
+    id or an `updated_at` at or after the returned time.
+    """
+    t = transactions_table
+    conn.execute(update(t).where(false()).values(id=t.c.id))  # Takes SQLite's write lock
+    return conn.execute(select(func.coalesce(func.max(t.c.id), 0), func.datetime("now"))).one()
+
+
+_worker: dict = {}
+
+
+def _init_worker(database_url: str, archive_paths: List[str]) -> None:
+    # Fresh engines per process: pooled connections must not cross a fork
+    for path in archive_paths:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Archive file {path} listed in the manifest is missing")
+    _worker["engine"] = create_engine(database_url)
+    _worker["archives"] = [create_engine(f"sqlite:///{path}") for path in archive_paths]
+
+
+def _run_partition(partition: Partition) -> Tuple[Partition, int, List[dict]]:
+    engine, archives = _worker["engine"], _worker["archives"]
+    checked, discrepancies = reconcile_partition(engine, archives, partition)
+    if discrepancies:
+        # Re-check flagged accounts once, so a batch archived mid-read is not reported
+        recheck = (partition[0], partition[1], [row["account_id"] for row in discrepancies])
+        _, discrepancies = reconcile_partition(engine, archives, recheck)
+    return partition, checked, discrepancies
+
+
+def _load_checkpoint(path: Optional[str]) -> Optional[dict]:
+    if not path or not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _save_checkpoint(path: Optional[str], state: dict) -> None:
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def reconcile_balances(database_url: str, report_path: str, checkpoint_path: Optional[str] = None,
+                       workers: int = 1, partition_size: int = 10000, incremental: bool = False) -> dict:
+    """Recompute every account balance from its transactions and report mismatches.
+
+    Accounts are split into id ranges reconciled in parallel by a process
+    pool. Progress is saved to the checkpoint after each partition, so an
+    interrupted run resumes where it stopped. With `incremental`, only
+    accounts with transactions added or updated since the last finished
+    run's watermarks are checked.
+    Archived transactions are included; don't run this concurrently with
+    the archive job.
+    """
+    started = time.perf_counter()
+    engine = create_engine(database_url)
+    with engine.begin() as conn:
+        # The ledger sums are range scans on these indexes
+        for index in transactions_table.indexes:
+            index.create(conn, checkfirst=True)
+
+    previous = _load_checkpoint(checkpoint_path)
+    resuming = previous is not None and not previous["finished"]
+    with engine.connect() as conn:
+        if resuming:
+            state = previous
+        else:
+            # Checkpoints written before updated_at was tracked can't drive an incremental run
+            since = previous if incremental and previous and "updated_watermark" in previous else None
+            with conn.begin():
+                watermark, updated_watermark = _watermarks(conn)
+            state = {
+                "started_at": datetime.now().isoformat(),
+                "since_watermark": since["watermark"] if since else None,
+                "since_updated": since["updated_watermark"] if since else None,
+                "watermark": watermark,
+                "updated_watermark": updated_watermark,
+                "partition_size": partition_size,
+                "report": report_path,
+                "completed_partitions": [],
+                "accounts_checked": 0,
+                "discrepancies": 0,
+                "finished": False
+            }
+            with open(report_path, "w", newline="") as f:
+                csv.writer(f).writerow(REPORT_COLUMNS)
+            _save_checkpoint(checkpoint_path, state)
+        partitions = plan_partitions(
+            conn, state["partition_size"], state["since_watermark"], state["watermark"], state.get("since_updated")
+        )
+        archive_paths = [
+            os.path.join(settings.archive_dir, file_name)
+            for (file_name,) in conn.execute(select(ArchiveManifest.file_name).distinct())
+        ]
+    engine.dispose()
+
+    completed = set(state["completed_partitions"])
+    pending = [partition for partition in partitions if partition[0] not in completed]
+    init_args = (database_url, archive_paths)
+    if workers <= 1:
+        _init_worker(*init_args)
+        results = map(_run_partition, pending)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers, initializer=_init_worker, initargs=init_args)
+        results = pool.imap_unordered(_run_partition, pending)
+
+    try:
+        with open(state["report"], "a", newline="") as report:
+            writer = csv.DictWriter(report, fieldnames=REPORT_COLUMNS)
+            for partition, checked, discrepancies in results:
+                writer.writerows(discrepancies)
+                report.flush()
+                state["completed_partitions"].append(partition[0])
+                state["accounts_checked"] += checked
+                state["discrepancies"] += len(discrepancies)
+                _save_checkpoint(checkpoint_path, state)
+    finally:
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    state["finished"] = True
+    _save_checkpoint(checkpoint_path, state)
+    return {
+        "mode": "incremental" if state["since_watermark"] is not None else "full",
+        "resumed": resuming,
+        "partitions": len(partitions),
+        "accounts_checked": state["accounts_checked"],
+        "discrepancies": state["discrepancies"],
+        "watermark": state["watermark"],
+        "report": state["report"],
+        "elapsed_seconds": round(time.perf_counter() - started, 3)
+    }
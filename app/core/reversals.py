@@ -0,0 +1,209 @@
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import bindparam, insert, or_, select, update
+from sqlalchemy.orm import Session
+from app.api.transactions import generate_transaction_id
+from app.core.metrics import REGISTRY
+from app.core.outbox import TRANSACTION_UPDATED, record_transactions
+from app.core.versioning import bump_user_version
+from app.models import Account, Transaction, TransactionType, TransactionStatus, CREDIT_TYPES
+
+transactions_table = Transaction.__table__
+accounts_table = Account.__table__
+
+RATE_PLACES = Decimal("0.00000001")
+
+REVERSED_TRANSACTIONS = REGISTRY.counter(
+    "reversed_transactions_total",
+    "Transactions reversed with a compensating entry."
+)
+
+_COLUMNS = tuple(transactions_table.c[name] for name in (
+    "id", "transaction_id", "transaction_type", "status", "amount", "currency", "fee",
+    "exchange_rate", "converted_amount", "converted_currency", "account_id",
+    "from_account_id", "to_account_id", "description", "reference_number", "created_at"
+))
+
+
+def _originals(db: Session, transaction_ids: Iterable[str]) -> List[SimpleNamespace]:
+    """The named transactions plus the fee charged with each, in one IN query."""
+    transaction_ids = list(transaction_ids)
+    t = transactions_table
+    return [SimpleNamespace(**row._mapping) for row in db.execute(select(*_COLUMNS).where(or_(
+        t.c.transaction_id.in_(transaction_ids),
+        t.c.reference_number.in_(transaction_ids)
+        & (t.c.transaction_type == TransactionType.FEE)
+        & (t.c.status == TransactionStatus.COMPLETED)
+    )))]
+
+
+def affected_accounts(db: Session, transaction_ids: Iterable[str]) -> Tuple[set, set]:
+    """Transaction ids found and every account their reversal would touch.
+
+    Read before taking the account locks; the reversal itself re-reads.
+    """
+    rows = _originals(db, transaction_ids)
+    return (
+        {row.transaction_id for row in rows},
+        {row.account_id for row in rows} | {row.to_account_id for row in rows}
+    )
+
+
+def _compensation(original: SimpleNamespace, reason: Optional[str], now: datetime) -> dict:
+    """The entry that undoes `original`'s balance effect.
+
+    Debits are refunded, credits are withdrawn again and transfers flow back
+    from the destination in its own currency.
+    """
+    description = f"Reversal of {original.transaction_id}"
+    if reason:
+        description = f"{description}: {reason}"[:255]
+    entry = {
+        "transaction_id": generate_transaction_id(),
+        "status": TransactionStatus.REVERSED,
+        "amount": original.amount,
+        "currency": original.currency,
+        "fee": Decimal("0.00"),
+        "exchange_rate": None,
+        "converted_amount": None,
+        "converted_currency": None,
+        "account_id": original.account_id,
+        "from_account_id": None,
+        "to_account_id": None,
+        "description": description,
+        "reference_number": original.transaction_id,
+        "created_at": now,
+        "processed_at": now,
+        "settled_at": now,
+    }
+    if original.transaction_type == TransactionType.TRANSFER and original.to_account_id is not None:
+        converted = original.converted_amount is not None
+        entry.update(
+            transaction_type=TransactionType.TRANSFER,
+            amount=original.converted_amount if converted else original.amount,
+            currency=original.converted_currency if converted else original.currency,
+            account_id=original.to_account_id,
+            from_account_id=original.to_account_id,
+            to_account_id=original.from_account_id or original.account_id,
+        )
+        if converted:
+            entry.update(
+                exchange_rate=(original.amount / original.converted_amount).quantize(RATE_PLACES),
+                converted_amount=original.amount,
+                converted_currency=original.currency,
+            )
+    elif original.transaction_type in CREDIT_TYPES:
+        entry["transaction_type"] = TransactionType.WITHDRAWAL
+    else:
+        entry["transaction_type"] = TransactionType.REFUND
+    return entry
+
+
+def _balance_effects(entries: List[dict]) -> Dict[int, Decimal]:
+    """Per-account balance change of posting the compensating entries."""
+    effects: Dict[int, Decimal] = defaultdict(Decimal)
+    for entry in entries:
+        if entry["transaction_type"] == TransactionType.REFUND:
+            effects[entry["account_id"]] += entry["amount"]
+            continue
+        effects[entry["account_id"]] -= entry["amount"]
+        if entry["to_account_id"] is not None:
+            effects[entry["to_account_id"]] += entry["converted_amount"] or entry["amount"]
+    return effects
+
+
+def _rejected(errors: List[dict]) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail={"message": "No transactions were reversed", "errors": errors}
+    )
+
+
+def reverse_transactions(db: Session, transaction_ids: List[str], reason: Optional[str] = None,
+                         now: Optional[datetime] = None) -> Tuple[list, list]:
+    """Reverse completed transactions, and the fees charged with them, in one commit.
+
+    The originals come from a single IN query; their compensating entries
+    are one executemany INSERT, the balance restores one executemany UPDATE
+    and the originals are marked REVERSED by one IN UPDATE. Nothing is
+    written unless every transaction can be reversed: a 400 lists each one
+    that cannot. Call under the locks of `affected_accounts`.
+
+    Returns the (original, compensating entry) pairs and the updated accounts.
+    """
+    now = now or datetime.now()
+    requested = list(dict.fromkeys(transaction_ids))
+    named = set(requested)
+    rows = _originals(db, requested)
+    by_id = {row.transaction_id: row for row in rows}
+
+    errors = []
+    for transaction_id in requested:
+        original = by_id.get(transaction_id)
+        if original is None:
+            errors.append({"transaction_id": transaction_id, "reason": "Transaction not found"})
+        elif original.status != TransactionStatus.COMPLETED:
+            errors.append({
+                "transaction_id": transaction_id,
+                "reason": f"Only completed transactions can be reversed (status is {original.status.value})"
+            })
+    if errors:
+        raise _rejected(errors)
+
+    # Fees follow their parent unless they were named themselves
+    originals = [by_id[transaction_id] for transaction_id in requested] + [
+        row for row in rows
+        if row.transaction_id not in named and row.reference_number in named
+        and row.transaction_type == TransactionType.FEE
+    ]
+    entries = [_compensation(original, reason, now) for original in originals]
+    effects = _balance_effects(entries)
+
+    a = accounts_table
+    balances = {row.id: row for row in db.execute(select(
+        a.c.id, a.c.available_balance
+    ).where(a.c.id.in_(effects)))}
+    overdrawn = {
+        account_id for account_id, change in effects.items()
+        if change < 0 and balances[account_id].available_balance + change < 0
+    }
+    if overdrawn:
+        raise _rejected([
+            {"transaction_id": entry["reference_number"], "reason": "Insufficient funds to reverse"}
+            for entry in entries
+            if entry["account_id"] in overdrawn and entry["transaction_type"] != TransactionType.REFUND
+        ])
+
+    t = transactions_table
+    inserted = db.execute(
+        insert(t).returning(t.c.id, sort_by_parameter_order=True), entries
+    ).scalars().all()
+    for entry, transaction_id in zip(entries, inserted):
+        entry["id"] = transaction_id
+    db.execute(update(t).where(t.c.id.in_([original.id for original in originals])).values(
+        status=TransactionStatus.REVERSED,
+        processed_at=now
+    ))
+    db.execute(update(a).where(a.c.id == bindparam("b_id")).values(
+        balance=a.c.balance + bindparam("b_amount"),
+        available_balance=a.c.available_balance + bindparam("b_amount"),
+        last_activity=now
+    ), [{"b_id": account_id, "b_amount": change} for account_id, change in effects.items()])
+
+    compensations = [SimpleNamespace(**entry) for entry in entries]
+    for original in originals:
+        original.status = TransactionStatus.REVERSED
+    record_transactions(db, compensations)
+    record_transactions(db, originals, TRANSACTION_UPDATED)
+    accounts = [SimpleNamespace(**row._mapping) for row in db.execute(select(
+        a.c.id, a.c.user_id, a.c.balance, a.c.available_balance, a.c.currency
+    ).where(a.c.id.in_(effects)))]
+    bump_user_version(db, *{account.user_id for account in accounts})
+    db.commit()
+    REVERSED_TRANSACTIONS.labels().inc(len(originals))
+    return list(zip(originals, compensations)), accounts
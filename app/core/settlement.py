@@ -0,0 +1,149 @@
+import os
+import socket
+from collections import defaultdict
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.core.concurrency import run_serialized
+from app.core.metrics import REGISTRY
+from app.core.outbox import TRANSACTION_UPDATED, record_transactions
+from app.core.versioning import bump_user_version
+from app.models import Account, Transaction, TransactionType, TransactionStatus, CREDIT_TYPES
+
+transactions_table = Transaction.__table__
+accounts_table = Account.__table__
+
+SETTLED_TRANSACTIONS = REGISTRY.counter(
+    "settled_transactions_total",
+    "Pending transactions posted by the settlement worker."
+)
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def defer(*transactions: Optional[Transaction], now: Optional[datetime] = None) -> None:
+    """Leave transactions pending for the settlement worker."""
+    settles_at = (now or datetime.now()) + timedelta(seconds=settings.settlement_delay_seconds)
+    for transaction in transactions:
+        if transaction is not None:
+            transaction.status = TransactionStatus.PENDING
+            transaction.settles_at = settles_at
+
+
+def claim(db: Session, worker: str, now: datetime, batch_size: int) -> List[SimpleNamespace]:
+    """Lease a batch of due pending transactions to `worker` and commit the lease.
+
+    Rows leased by a worker that died become claimable again once the lease
+    expires; live leases are skipped, so workers never settle the same row.
+    """
+    t = transactions_table
+    claimable = select(t.c.id).where(
+        t.c.status == TransactionStatus.PENDING,
+        t.c.settles_at <= now,
+        or_(t.c.lease_expires_at.is_(None), t.c.lease_expires_at < now)
+    ).order_by(t.c.settles_at, t.c.id).limit(batch_size)
+    rows = db.execute(update(t).where(t.c.id.in_(claimable.scalar_subquery())).values(
+        lease_owner=worker,
+        lease_expires_at=now + timedelta(seconds=settings.settlement_lease_seconds)
+    ).returning(t.c.id, t.c.account_id, t.c.to_account_id)).all()
+    db.commit()
+    return [SimpleNamespace(**row._mapping) for row in rows]
+
+
+def _balance_effects(rows) -> Dict[int, List[Decimal]]:
+    """Per-account [balance, available balance] changes of settling `rows`.
+
+    Debits already reserved the available balance when they were accepted.
+    """
+    effects: Dict[int, List[Decimal]] = defaultdict(lambda: [Decimal("0.00"), Decimal("0.00")])
+    for row in rows:
+        if row.transaction_type in CREDIT_TYPES:
+            effect = effects[row.account_id]
+            effect[0] += row.amount
+            effect[1] += row.amount
+            continue
+        effects[row.account_id][0] -= row.amount
+        if row.transaction_type == TransactionType.TRANSFER and row.to_account_id is not None:
+            credited = row.converted_amount if row.converted_amount is not None else row.amount
+            effect = effects[row.to_account_id]
+            effect[0] += credited
+            effect[1] += credited
+    return effects
+
+
+def _settle_claimed(db: Session, transaction_ids: List[int], worker: str, now: datetime) -> int:
+    """Post the balance effects of claimed transactions and complete them in one commit."""
+    t = transactions_table
+    # Only rows still leased to this worker: an expired lease may have been taken over.
+    # Completing them returns exactly the rows whose balance effects are posted.
+    rows = [SimpleNamespace(**row._mapping) for row in db.execute(update(t).where(
+        t.c.id.in_(transaction_ids),
+        t.c.status == TransactionStatus.PENDING,
+        t.c.lease_owner == worker
+    ).values(
+        status=TransactionStatus.COMPLETED,
+        processed_at=now,
+        settled_at=now,
+        lease_owner=None,
+        lease_expires_at=None
+    ).returning(
+        t.c.id, t.c.transaction_id, t.c.transaction_type, t.c.amount, t.c.currency, t.c.fee,
+        t.c.exchange_rate, t.c.converted_amount, t.c.converted_currency, t.c.account_id,
+        t.c.from_account_id, t.c.to_account_id, t.c.description, t.c.reference_number
+    ))]
+    if not rows:
+        db.rollback()
+        return 0
+
+    a = accounts_table
+    effects = _balance_effects(rows)
+    db.execute(update(a).where(a.c.id == bindparam("b_id")).values(
+        balance=a.c.balance + bindparam("b_balance"),
+        available_balance=a.c.available_balance + bindparam("b_available"),
+        last_activity=now
+    ), [
+        {"b_id": account_id, "b_balance": balance, "b_available": available}
+        for account_id, (balance, available) in effects.items()
+    ])
+
+    for row in rows:
+        row.status = TransactionStatus.COMPLETED
+    record_transactions(db, rows, TRANSACTION_UPDATED)
+    bump_user_version(db, *db.scalars(select(a.c.user_id).where(a.c.id.in_(effects))).all())
+    db.commit()
+    SETTLED_TRANSACTIONS.labels().inc(len(rows))
+    return len(rows)
+
+
+def settle_pending(db: Session, worker: Optional[str] = None, now: Optional[datetime] = None,
+                   batch_size: Optional[int] = None) -> dict:
+    """Settle every pending transaction that is due, one claimed batch per commit.
+
+    The request path only validates, reserves and inserts; balances are
+    posted here with executemany updates, so settlement throughput scales
+    with batch size rather than request latency. Each batch is claimed at
+    the current time unless `now` is given, so a long run keeps its leases
+    fresh and picks up rows that fall due meanwhile.
+    """
+    worker = worker or default_worker_id()
+    batch_size = batch_size or settings.settlement_batch_size
+    totals = {"settled": 0, "batches": 0}
+    while True:
+        batch_now = now or datetime.now()
+        claimed = claim(db, worker, batch_now, batch_size)
+        if not claimed:
+            break
+        account_ids = {row.account_id for row in claimed} | {row.to_account_id for row in claimed}
+        totals["settled"] += run_serialized(
+            db, account_ids, "settlement",
+            lambda: _settle_claimed(db, [row.id for row in claimed], worker, batch_now)
+        )
+        totals["batches"] += 1
+    return totals
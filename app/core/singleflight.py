@@ -0,0 +1,76 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.core.metrics import REGISTRY
+from app.database import SessionLocal
+
+T = TypeVar("T")
+
+SINGLEFLIGHT_REQUESTS = REGISTRY.counter(
+    "singleflight_requests_total",
+    "Coalescable reads by group; result is \"executed\" or \"coalesced\".",
+    ("group", "result")
+)
+SINGLEFLIGHT_IN_FLIGHT = REGISTRY.gauge(
+    "singleflight_in_flight",
+    "Distinct reads currently executing per group.",
+    ("group",)
+)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller starts the work as a task; callers arriving while it
+    runs await the same task and get the same result (or exception). The
+    key is forgotten as soon as the task finishes, so nothing is cached.
+    Results are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, group: str):
+        self.group = group
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            SINGLEFLIGHT_REQUESTS.labels(self.group, "executed").inc()
+            SINGLEFLIGHT_IN_FLIGHT.labels(self.group).inc()
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._forget(key, done))
+        else:
+            SINGLEFLIGHT_REQUESTS.labels(self.group, "coalesced").inc()
+        # Shielded: a disconnecting caller must not cancel the others' result
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        self._calls.pop(key, None)
+        SINGLEFLIGHT_IN_FLIGHT.labels(self.group).dec()
+        if not task.cancelled():
+            task.exception()  # retrieved, even if every caller went away
+
+
+def _run_with_session(load: Callable[[Any], T]) -> T:
+    db = SessionLocal()
+    try:
+        return load(db)
+    finally:
+        db.close()
+
+
+async def coalesced_read(flight: SingleFlight, key: Hashable, load: Callable[[Any], T]) -> T:
+    """Run `load(db)` in a worker thread, shared by identical concurrent requests.
+
+    `load` gets its own session rather than the request's, since it may
+    outlive the request that started it. `key` must identify everything the
+    result depends on, including the user.
+    """
+    if not settings.singleflight_enabled:
+        return await run_in_threadpool(_run_with_session, load)
+    return await flight.do(key, lambda: run_in_threadpool(_run_with_session, load))
@@ -0,0 +1,268 @@
+import calendar
+from datetime import datetime, timedelta
+from decimal import Decimal
+from itertools import groupby
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.api.transactions import generate_transaction_id, fee_transaction
+from app.core import fraud, fx, settlement
+from app.core.analytics import invalidate_spending
+from app.core.concurrency import run_serialized
+from app.core.fees import fee_schedule
+from app.core.events import publish_transaction
+from app.core.outbox import record_transactions
+from app.core.versioning import bump_user_version
+from app.models import (
+    Account, AccountStatus, Transaction, TransactionType, TransactionStatus,
+    StandingOrder, StandingOrderFrequency, StandingOrderStatus
+)
+
+accounts_table = Account.__table__
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Same day-of-month `months` later, clamped to the end of shorter months."""
+    month = value.month - 1 + months
+    year = value.year + month // 12
+    month = month % 12 + 1
+    return value.replace(year=year, month=month, day=min(value.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrence(start_at: datetime, frequency: StandingOrderFrequency, n: int) -> datetime:
+    """Due time of the n-th occurrence (0-based) of a schedule.
+
+    Always computed from the start, so monthly orders starting on the 31st
+    run on the last day of shorter months without drifting.
+    """
+    if frequency == StandingOrderFrequency.DAILY:
+        return start_at + timedelta(days=n)
+    if frequency == StandingOrderFrequency.WEEKLY:
+        return start_at + timedelta(weeks=n)
+    return add_months(start_at, n)
+
+
+def next_occurrence(start_at: datetime, frequency: StandingOrderFrequency, run_count: int,
+                    now: datetime) -> Tuple[int, datetime]:
+    """(run count, due time) of the first occurrence after `now`.
+
+    A scheduler that was down runs a late order once and skips the
+    occurrences it missed rather than replaying them all.
+    """
+    n = run_count + 1
+    due = occurrence(start_at, frequency, n)
+    while due <= now:
+        n += 1
+        due = occurrence(start_at, frequency, n)
+    return n, due
+
+
+def _load_accounts(db: Session, account_ids) -> Dict[int, SimpleNamespace]:
+    """Plain mutable rows: cheaper than ORM instances and still usable for events."""
+    a = accounts_table
+    rows = db.execute(select(
+        a.c.id, a.c.user_id, a.c.account_type, a.c.status, a.c.balance, a.c.available_balance,
+        a.c.currency, a.c.daily_transfer_limit
+    ).where(a.c.id.in_(account_ids)))
+    return {row.id: SimpleNamespace(**row._mapping) for row in rows}
+
+
+def _check(order, source: Optional[SimpleNamespace], destination: Optional[SimpleNamespace],
+           daily_total: Decimal, fee: Decimal) -> Optional[str]:
+    """Why one run of an order cannot execute, or None."""
+    if source is None or source.status != AccountStatus.ACTIVE:
+        return "Source account is not active"
+    if destination is None or destination.status != AccountStatus.ACTIVE:
+        return "Destination account is not active"
+    if source.available_balance < order.amount + fee:
+        return "Insufficient funds"
+    if daily_total + order.amount > Decimal(str(source.daily_transfer_limit)):
+        return "Daily transfer limit exceeded"
+    return None
+
+
+def _execute_batch(db: Session, order_ids: List[int], now: datetime) -> dict:
+    """Run one batch of due orders in a single commit."""
+    s = StandingOrder
+    # Re-read under the locks: an order may have been cancelled meanwhile
+    orders = db.execute(select(
+        s.id, s.user_id, s.from_account_id, s.to_account_id, s.amount, s.description,
+        s.frequency, s.start_at, s.end_at, s.run_count, s.failure_count
+    ).where(
+        s.id.in_(order_ids), s.status == StandingOrderStatus.ACTIVE, s.next_run_at <= now
+    ).order_by(s.from_account_id, s.next_run_at, s.id)).all()
+    if not orders:
+        return {"executed": 0, "failed": 0}
+
+    account_ids = {o.from_account_id for o in orders} | {o.to_account_id for o in orders}
+    accounts = _load_accounts(db, account_ids)
+    sources = {o.from_account_id for o in orders}
+    daily_totals = dict(db.query(Transaction.from_account_id, func.sum(Transaction.amount)).filter(
+        Transaction.from_account_id.in_(sources),
+        Transaction.transaction_type == TransactionType.TRANSFER,
+        Transaction.created_at >= now.replace(hour=0, minute=0, second=0, microsecond=0)
+    ).group_by(Transaction.from_account_id))
+
+    transactions = []
+    charges = []
+    touched = set()
+    fraud_contexts = []
+    fraud_decisions = []
+    schedule_updates = []
+    for source_id, group in groupby(orders, key=lambda o: o.from_account_id):
+        # One balance and limit check per source, carried across its orders
+        source = accounts.get(source_id)
+        daily_total = Decimal(str(daily_totals.get(source_id) or 0))
+        for order in group:
+            destination = accounts.get(order.to_account_id)
+            fee = Decimal("0.00")
+            if source is not None:
+                fee = fee_schedule.fee(db, source.account_type, TransactionType.TRANSFER, source.currency, order.amount)
+            reason = _check(order, source, destination, daily_total, fee)
+            fraud_context = fraud.TransactionContext(
+                "transfer", source_id, order.amount,
+                destination_account_id=order.to_account_id, is_new_payee=False
+            )
+            credited_amount, exchange_rate = order.amount, None
+            if reason is None and destination.currency != source.currency:
+                try:
+                    credited_amount, exchange_rate = fx.convert(
+                        db, order.amount, source.currency, destination.currency, now
+                    )
+                except HTTPException as exc:
+                    reason = exc.detail
+            fraud_decision = None
+            if reason is None:
+                try:
+                    fraud_decision = fraud.screen(fraud_context)
+                except HTTPException as exc:
+                    reason = exc.detail["message"]
+
+            run_count, next_run_at = next_occurrence(order.start_at, order.frequency, order.run_count, now)
+            finished = order.end_at is not None and next_run_at > order.end_at
+            update_row = {
+                "id": order.id,
+                "run_count": run_count,
+                "next_run_at": next_run_at,
+                "status": StandingOrderStatus.COMPLETED if finished else StandingOrderStatus.ACTIVE,
+                "last_run_at": now,
+            }
+            if reason is not None:
+                update_row.update(last_failure_reason=reason, failure_count=order.failure_count + 1)
+                schedule_updates.append(update_row)
+                continue
+
+            transaction = Transaction(
+                transaction_id=generate_transaction_id(),
+                transaction_type=TransactionType.TRANSFER,
+                status=TransactionStatus.COMPLETED,
+                amount=order.amount,
+                currency=source.currency,
+                fee=fee,
+                exchange_rate=exchange_rate,
+                converted_amount=credited_amount if exchange_rate is not None else None,
+                converted_currency=destination.currency if exchange_rate is not None else None,
+                account_id=source_id,
+                from_account_id=source_id,
+                to_account_id=order.to_account_id,
+                description=order.description or f"Standing order {order.id}",
+                reference_number=f"SO{order.id}",
+                created_at=now
+            )
+            charge = fee_transaction(transaction, source_id, fee) if fee else None
+            if settings.settlement_deferred:
+                # Like API transfers: reserve the source's funds, the settlement worker posts the rest
+                settlement.defer(transaction, charge, now=now)
+                source.available_balance -= order.amount + fee
+                touched.add(source_id)
+            else:
+                source.balance -= order.amount + fee
+                source.available_balance -= order.amount + fee
+                destination.balance += credited_amount
+                destination.available_balance += credited_amount
+                touched.update((source_id, order.to_account_id))
+            daily_total += order.amount
+
+            transactions.append((transaction, source_id, order.to_account_id))
+            if charge is not None:
+                charges.append((charge, source_id))
+            fraud_contexts.append(fraud_context)
+            fraud_decisions.append(fraud_decision)
+            update_row.update(last_transaction_id=transaction.transaction_id, last_failure_reason=None)
+            schedule_updates.append(update_row)
+
+    if transactions:
+        # executemany INSERT of transfers and their fees; ids are fetched back with one query for the events
+        posted = [t for t, _, _ in transactions] + [t for t, _ in charges]
+        columns = [c.key for c in Transaction.__table__.columns if c.key != "id"]
+        db.execute(insert(Transaction), [{key: getattr(t, key) for key in columns} for t in posted])
+        ids = dict(db.query(Transaction.transaction_id, Transaction.id).filter(
+            Transaction.transaction_id.in_([t.transaction_id for t in posted])
+        ))
+        for transaction in posted:
+            transaction.id = ids[transaction.transaction_id]
+        record_transactions(db, posted)
+        for (transaction, _, _), fraud_decision in zip(transactions, fraud_decisions):
+            fraud.record_review(db, transaction, fraud_decision)
+
+        # Final balances of every touched account with one executemany UPDATE
+        a = accounts_table
+        db.execute(update(a).where(a.c.id == bindparam("b_id")).values(
+            balance=bindparam("b_balance"),
+            available_balance=bindparam("b_available_balance"),
+            last_activity=now
+        ), [
+            {"b_id": account_id, "b_balance": accounts[account_id].balance,
+             "b_available_balance": accounts[account_id].available_balance}
+            for account_id in touched
+        ])
+
+    # Advance every schedule of the batch with one executemany UPDATE
+    db.execute(update(StandingOrder), schedule_updates)
+    bump_user_version(db, *{accounts[account_id].user_id for account_id in touched})
+    db.commit()
+
+    for (transaction, source_id, destination_id), fraud_context in zip(transactions, fraud_contexts):
+        fraud.record_committed(fraud_context)
+        publish_transaction(transaction, accounts[source_id], accounts[destination_id])
+        invalidate_spending(transaction, accounts[source_id], accounts[destination_id])
+    for charge, source_id in charges:
+        publish_transaction(charge, accounts[source_id])
+    return {"executed": len(transactions), "failed": len(schedule_updates) - len(transactions)}
+
+
+def run_due_standing_orders(db: Session, now: Optional[datetime] = None,
+                            batch_size: Optional[int] = None) -> dict:
+    """Execute every standing order due at `now`.
+
+    Due orders come from the (status, next_run_at) index in batches; each
+    batch holds the locks of its accounts and commits its transfers, balance
+    updates and schedule advances together. Failed runs (inactive account,
+    insufficient funds, limits, fraud) are recorded on the order and its
+    schedule still advances.
+    """
+    now = now or datetime.now()
+    batch_size = batch_size or settings.standing_order_batch_size
+    totals = {"executed": 0, "failed": 0, "batches": 0}
+    while True:
+        due = db.execute(select(
+            StandingOrder.id, StandingOrder.from_account_id, StandingOrder.to_account_id
+        ).where(
+            StandingOrder.status == StandingOrderStatus.ACTIVE,
+            StandingOrder.next_run_at <= now
+        ).order_by(StandingOrder.next_run_at, StandingOrder.id).limit(batch_size)).all()
+        if not due:
+            break
+        account_ids = {row.from_account_id for row in due} | {row.to_account_id for row in due}
+        result = run_serialized(
+            db, account_ids, "standing_orders",
+            lambda: _execute_batch(db, [row.id for row in due], now)
+        )
+        totals["executed"] += result["executed"]
+        totals["failed"] += result["failed"]
+        totals["batches"] += 1
+    return totals
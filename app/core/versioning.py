@@ -0,0 +1,52 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy.orm import Session
+from app.models import User
+
+
+def bump_user_version(db: Session, *user_ids: Optional[int]) -> None:
+    """Invalidate cached list representations for the given users.
+
+    Runs in the caller's transaction, so the new version becomes visible in
+    the same commit as the mutation it describes.
+    """
+    ids = {user_id for user_id in user_ids if user_id is not None}
+    if not ids:
+        return
+    db.query(User).filter(User.id.in_(ids)).update(
+        {User.data_version: User.data_version + 1},
+        synchronize_session=False
+    )
+
+
+def make_etag(resource: str, user: User, request: Request) -> str:
+    """Strong ETag for a user-scoped list, varying with query parameters."""
+    tag = f"{resource}-{user.id}-{user.data_version}"
+    query = request.url.query
+    if query:
+        tag += "-" + hashlib.blake2s(query.encode(), digest_size=6).hexdigest()
+    return f'"{tag}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header covers the given ETag."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        # If-None-Match uses weak comparison
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response carrying the current ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
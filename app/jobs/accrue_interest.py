@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Accrue daily interest on savings, money market and certificate of deposit accounts.
+
+Meant to run once a day from cron; re-running for the same day only picks
+up accounts that were not accrued yet.
+
+Usage:
+    python -m app.jobs.accrue_interest [--day 2024-01-31] [--chunk-size 10000]
+"""
+
+import argparse
+import json
+from datetime import date
+
+from app.config import settings
+from app.database import SessionLocal, engine, Base
+from app.core.interest import accrue_interest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accrue daily interest")
+    parser.add_argument("--day", type=date.fromisoformat, default=None,
+                        help="Day to accrue through (ISO format), defaults to today")
+    parser.add_argument("--chunk-size", type=int, default=settings.interest_chunk_size,
+                        help="Accounts accrued per commit")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        result = accrue_interest(db, args.day, args.chunk_size)
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Move old, statement-covered transactions into per-month archive files.
+
+Usage:
+    python -m app.jobs.archive_transactions --horizon-days 365
+"""
+
+import argparse
+import json
+from datetime import datetime
+
+from app.config import settings
+from app.database import SessionLocal, engine, Base
+from app.core.archive import archive_transactions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Archive old transactions into monthly SQLite files")
+    parser.add_argument("--horizon-days", type=int, default=settings.archive_horizon_days,
+                        help="Archive transactions older than this many days")
+    parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size,
+                        help="Transactions moved per commit")
+    parser.add_argument("--now", type=datetime.fromisoformat, default=None,
+                        help="Reference time (ISO format), defaults to the current time")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        result = archive_transactions(db, args.horizon_days, args.batch_size, args.now)
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
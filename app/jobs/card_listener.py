@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Serve card authorizations over the binary card network protocol.
+
+Listens on CARD_NETWORK_HOST:CARD_NETWORK_PORT until interrupted. Messages
+are authorized with the same logic as POST /cards/{id}/authorize; see
+app.core.card_network for the wire format.
+
+Usage:
+    python -m app.jobs.card_listener [--host 127.0.0.1] [--port 8583] [--workers 2]
+"""
+
+import argparse
+import asyncio
+
+from app.config import settings
+from app.database import engine, Base
+from app.core.card_network import CardNetworkListener
+
+
+async def serve(listener: CardNetworkListener) -> None:
+    server = await listener.start()
+    print(f"Card network listener on {listener.host}:{listener.bound_port}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        listener.executor.shutdown(wait=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve card authorizations over TCP")
+    parser.add_argument("--host", default=settings.card_network_host)
+    parser.add_argument("--port", type=int, default=settings.card_network_port)
+    parser.add_argument("--workers", type=int, default=settings.card_network_workers,
+                        help="Threads running authorizations")
+    parser.add_argument("--max-in-flight", type=int, default=settings.card_network_max_in_flight,
+                        help="Pipelined authorizations per connection")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    try:
+        asyncio.run(serve(CardNetworkListener(args.host, args.port, args.workers, args.max_in_flight)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Expire holds that were neither captured nor released in time.
+
+Runs once by default (e.g. from cron); with --loop it keeps sweeping every
+HOLD_SWEEP_INTERVAL_SECONDS as a background worker.
+
+Usage:
+    python -m app.jobs.expire_holds [--loop] [--batch-size 1000]
+"""
+
+import argparse
+import json
+import time
+
+from app.config import settings
+from app.database import SessionLocal, engine, Base
+from app.core.holds import expire_holds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Expire stale holds")
+    parser.add_argument("--batch-size", type=int, default=settings.hold_sweep_batch_size,
+                        help="Holds expired per commit")
+    parser.add_argument("--loop", action="store_true",
+                        help="Keep sweeping every HOLD_SWEEP_INTERVAL_SECONDS")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    while True:
+        db = SessionLocal()
+        try:
+            result = expire_holds(db, batch_size=args.batch_size)
+        finally:
+            db.close()
+        print(json.dumps(result), flush=True)
+        if not args.loop:
+            break
+        time.sleep(settings.hold_sweep_interval_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Replace the active fee schedule with the rules in a JSON file.
+
+The file holds a list of rules, for example:
+
+    [
+        {"transaction_type": "withdrawal", "flat_fee": "1.00"},
+        {"account_type": "checking", "transaction_type": "transfer", "currency": "USD",
+         "min_amount": "1000.00", "percent_fee": "0.5", "max_fee": "25.00"}
+    ]
+
+Omitted account_type, transaction_type or currency match any value. The
+previous rules are kept, deactivated, for auditing. Running API processes
+recompile their fee table within FEE_RULES_REFRESH_SECONDS.
+
+Usage:
+    python -m app.jobs.load_fee_rules fees.json
+"""
+
+import argparse
+import json
+from decimal import Decimal
+
+from app.database import SessionLocal, engine, Base
+from app.core.fees import fee_schedule
+from app.models import FeeRule, AccountType, TransactionType
+
+
+def replace_rules(db, rules) -> dict:
+    """Deactivate the active rules and insert `rules` in one commit."""
+    new_rules = [
+        FeeRule(
+            account_type=AccountType(rule["account_type"]) if rule.get("account_type") else None,
+            transaction_type=TransactionType(rule["transaction_type"]) if rule.get("transaction_type") else None,
+            currency=rule["currency"].upper() if rule.get("currency") else None,
+            min_amount=Decimal(str(rule.get("min_amount", "0.00"))),
+            flat_fee=Decimal(str(rule.get("flat_fee", "0.00"))),
+            percent_fee=Decimal(str(rule.get("percent_fee", "0.00"))),
+            max_fee=Decimal(str(rule["max_fee"])) if rule.get("max_fee") is not None else None,
+            is_active=True
+        )
+        for rule in rules
+    ]
+    deactivated = db.query(FeeRule).filter(FeeRule.is_active.is_(True)).update(
+        {FeeRule.is_active: False}, synchronize_session=False
+    )
+    db.add_all(new_rules)
+    db.commit()
+    fee_schedule.invalidate()
+    return {"loaded": len(new_rules), "deactivated": deactivated}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replace the active fee schedule")
+    parser.add_argument("path", help="JSON file with a list of fee rules")
+    args = parser.parse_args(argv)
+
+    with open(args.path) as f:
+        rules = json.load(f)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        result = replace_rules(db, rules)
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
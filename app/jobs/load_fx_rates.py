@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Load exchange rates from a CSV file into the fx_rates table.
+
+The file has a header row and the columns base,quote,rate,effective_at
+(effective_at in ISO format). Rows already loaded for the same pair and
+effective time are skipped, so a feed can be re-imported safely. Running
+API processes pick the new rates up within FX_CACHE_REFRESH_SECONDS.
+
+Usage:
+    python -m app.jobs.load_fx_rates rates.csv
+"""
+
+import argparse
+import csv
+import json
+from datetime import datetime
+from decimal import Decimal
+
+from app.database import SessionLocal, engine, Base
+from app.core.fx import fx_cache
+from app.models import FxRate
+
+
+def load_rates(db, rows) -> dict:
+    """Insert new (base, quote, rate, effective_at) rows; returns counts."""
+    existing = set(db.query(FxRate.base_currency, FxRate.quote_currency, FxRate.effective_at))
+    new_rates = []
+    for base, quote, rate, effective_at in rows:
+        key = (base.upper(), quote.upper(), effective_at)
+        if key in existing:
+            continue
+        existing.add(key)
+        new_rates.append(FxRate(base_currency=key[0], quote_currency=key[1], rate=Decimal(rate), effective_at=effective_at))
+    db.add_all(new_rates)
+    db.commit()
+    fx_cache.invalidate()
+    return {"loaded": len(new_rates), "skipped": len(rows) - len(new_rates)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load exchange rates from a CSV file")
+    parser.add_argument("path", help="CSV file with base,quote,rate,effective_at columns")
+    args = parser.parse_args(argv)
+
+    with open(args.path, newline="") as f:
+        rows = [
+            (row["base"], row["quote"], row["rate"], datetime.fromisoformat(row["effective_at"]))
+            for row in csv.DictReader(f)
+        ]
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        result = load_rates(db, rows)
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
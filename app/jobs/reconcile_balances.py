@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Verify stored account balances against their transaction ledgers.
+
+Writes one CSV row per mismatching account. Re-running with the same
+checkpoint resumes an interrupted run; --incremental checks only accounts
+touched since the last finished run.
+
+Usage:
+    python -m app.jobs.reconcile_balances --workers 4 --report discrepancies.csv \\
+        --checkpoint reconcile.json [--incremental]
+"""
+
+import argparse
+import json
+import os
+
+from app.config import settings
+from app.core.reconcile import reconcile_balances
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reconcile account balances with their transactions")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--report", default="reconciliation_report.csv", help="Discrepancy report (CSV)")
+    parser.add_argument("--checkpoint", default=None, help="Progress file used to resume and for --incremental")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--partition-size", type=int, default=10000, help="Account ids per partition")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Only check accounts with transactions since the last finished run")
+    args = parser.parse_args(argv)
+
+    if args.incremental and not args.checkpoint:
+        parser.error("--incremental requires --checkpoint")
+
+    result = reconcile_balances(args.database_url, args.report, args.checkpoint, args.workers,
+                                args.partition_size, args.incremental)
+    print(json.dumps(result, indent=2))
+    return 1 if result["discrepancies"] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
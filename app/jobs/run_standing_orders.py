@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Execute all standing orders that are due.
+
+Meant to run from cron (e.g. every minute); a run that finds nothing due
+costs one indexed query.
+
+Usage:
+    python -m app.jobs.run_standing_orders [--now 2024-01-01T00:00:00] [--batch-size 1000]
+"""
+
+import argparse
+import json
+from datetime import datetime
+
+from app.config import settings
+from app.database import SessionLocal, engine, Base
+from app.core.standing_orders import run_due_standing_orders
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Execute due standing orders")
+    parser.add_argument("--now", type=datetime.fromisoformat, default=None,
+                        help="Reference time (ISO format), defaults to the current time")
+    parser.add_argument("--batch-size", type=int, default=settings.standing_order_batch_size,
+                        help="Orders executed per commit")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        result = run_due_standing_orders(db, args.now, args.batch_size)
+    finally:
+        db.close()
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
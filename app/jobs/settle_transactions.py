@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Settle pending transactions (used with SETTLEMENT_DEFERRED=True).
+
+Runs once by default; with --loop it keeps settling every
+SETTLEMENT_INTERVAL_SECONDS. Several workers can run side by side: each
+claims its own batches through the transactions' lease columns.
+
+Usage:
+    python -m app.jobs.settle_transactions [--loop] [--batch-size 500] [--worker-id settle-1]
+"""
+
+import argparse
+import json
+import time
+
+from app.config import settings
+from app.database import SessionLocal, engine, Base
+from app.core.settlement import default_worker_id, settle_pending
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Settle pending transactions")
+    parser.add_argument("--batch-size", type=int, default=settings.settlement_batch_size,
+                        help="Transactions settled per commit")
+    parser.add_argument("--worker-id", default=default_worker_id(),
+                        help="Lease owner name, defaults to host:pid")
+    parser.add_argument("--loop", action="store_true",
+                        help="Keep settling every SETTLEMENT_INTERVAL_SECONDS")
+    args = parser.parse_args(argv)
+
+    Base.metadata.create_all(bind=engine)
+    while True:
+        db = SessionLocal()
+        try:
+            result = settle_pending(db, args.worker_id, batch_size=args.batch_size)
+        finally:
+            db.close()
+        if result["settled"] or not args.loop:
+            print(json.dumps(result), flush=True)
+        if not args.loop:
+            break
+        time.sleep(settings.settlement_interval_seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.config import settings
 from app.database import engine, Base
+from app.core.metrics import REGISTRY, MetricsMiddleware, instrument_engine
+from app.core import profiler
+from app.core.ratelimit import RateLimitMiddleware
 
 # Import all models to register them with SQLAlchemy
-from app.models import User, Account, Transaction, Card, Statement
+from app.models import User, Account, Transaction, Card, Statement, OutboxEvent, ConsumerOffset, ArchiveManifest, StandingOrder, FxRate, FeeRule, Hold, CardNumberSequence
 
 # Import API routes
-from app.api import auth, accounts, transactions, cards, statements
+from app.api import auth, accounts, transactions, cards, statements, standing_orders, fx, holds, reversals, analytics, events, feed, debug
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -19,6 +23,9 @@ app = FastAPI(
     openapi_url=f"{settings.api_v1_str}/openapi.json"
 )
 
+# Add rate limiting (inside CORS, so 429 responses carry CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -28,12 +35,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Add SQL profiler (opt-in per request in debug mode, or always when enabled)
+if settings.debug or settings.sql_profiler_enabled:
+    profiler.instrument_engine(engine)
+    app.add_middleware(profiler.SQLProfilerMiddleware)
+
+# Add metrics middleware (outermost, so it times the full request)
+if settings.metrics_enabled:
+    instrument_engine(engine)
+    app.add_middleware(MetricsMiddleware)
+
 # Include API routes
 app.include_router(auth.router, prefix=settings.api_v1_str)
 app.include_router(accounts.router, prefix=settings.api_v1_str)
 app.include_router(transactions.router, prefix=settings.api_v1_str)
 app.include_router(cards.router, prefix=settings.api_v1_str)
 app.include_router(statements.router, prefix=settings.api_v1_str)
+app.include_router(standing_orders.router, prefix=settings.api_v1_str)
+app.include_router(fx.router, prefix=settings.api_v1_str)
+app.include_router(holds.router, prefix=settings.api_v1_str)
+app.include_router(reversals.router, prefix=settings.api_v1_str)
+app.include_router(analytics.router, prefix=settings.api_v1_str)
+app.include_router(events.router, prefix=settings.api_v1_str)
+app.include_router(feed.router, prefix=settings.api_v1_str)
+if settings.debug or settings.sql_profiler_enabled:
+    app.include_router(debug.router, prefix=settings.api_v1_str)
 
 
 @app.get("/")
@@ -46,6 +72,14 @@ async def health_check():
     return {"status": "healthy", "message": "Banking API is running"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(
+        REGISTRY.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
 @app.get("/api/v1/")
 async def api_root():
     return {"message": "Banking API v1", "endpoints": "/docs"}
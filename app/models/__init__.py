@@ -2,9 +2,16 @@
 
 from .user import User
 from .account import Account, AccountType, AccountStatus
-from .transaction import Transaction, TransactionType, TransactionStatus
+from .transaction import Transaction, TransactionType, TransactionStatus, CREDIT_TYPES, POSTED_STATUSES
 from .card import Card, CardType, CardStatus
 from .statement import Statement
+from .outbox import OutboxEvent, ConsumerOffset
+from .archive import ArchiveManifest
+from .standing_order import StandingOrder, StandingOrderFrequency, StandingOrderStatus
+from .fx_rate import FxRate
+from .fee_rule import FeeRule
+from .hold import Hold, HoldStatus
+from .card_number_sequence import CardNumberSequence
 
 # Export all models for easy importing
 __all__ = [
@@ -15,8 +22,21 @@ __all__ = [
     "Transaction", 
     "TransactionType", 
     "TransactionStatus",
+    "CREDIT_TYPES",
+    "POSTED_STATUSES",
     "Card", 
     "CardType", 
     "CardStatus",
-    "Statement"
+    "Statement",
+    "OutboxEvent",
+    "ConsumerOffset",
+    "ArchiveManifest",
+    "StandingOrder",
+    "StandingOrderFrequency",
+    "StandingOrderStatus",
+    "FxRate",
+    "FeeRule",
+    "Hold",
+    "HoldStatus",
+    "CardNumberSequence"
 ]
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, BigInteger, String, Numeric, Boolean, Date, DateTime, ForeignKey, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -47,6 +47,10 @@ class Account(Base):
     daily_transfer_limit = Column(Numeric(15, 2), default=10000.00)
     daily_withdrawal_limit = Column(Numeric(15, 2), default=1000.00)
     
+    # Interest accrual
+    accrued_interest = Column(BigInteger, default=0, nullable=False)  # Sub-cent remainder, in millionths of a cent
+    interest_accrued_through = Column(Date, nullable=True)  # Last day interest was accrued for
+    
     # Foreign keys
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     
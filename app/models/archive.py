@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ArchiveManifest(Base):
+    """Index of archived transactions: one row per account and month archive file."""
+    
+    __tablename__ = "archive_manifest"
+    __table_args__ = (UniqueConstraint("account_id", "period", name="uq_archive_manifest_account_period"),)
+    
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True)
+    
+    # Archive location
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    period = Column(String(7), nullable=False)  # YYYY-MM of created_at
+    file_name = Column(String(100), nullable=False)
+    
+    # Archived range
+    row_count = Column(Integer, nullable=False, default=0)
+    first_created_at = Column(DateTime(timezone=True), nullable=False)
+    last_created_at = Column(DateTime(timezone=True), nullable=False)
+    
+    # Timestamps
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<ArchiveManifest(account_id={self.account_id}, period='{self.period}', rows={self.row_count})>"
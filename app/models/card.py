@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Enum, Numeric
+from sqlalchemy import Column, Integer, String, Boolean, Date, DateTime, ForeignKey, Enum, Numeric
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -52,6 +52,12 @@ class Card(Base):
     monthly_limit = Column(Numeric(15, 2), default=10000.00)
     credit_limit = Column(Numeric(15, 2), nullable=True)  # For credit cards
     
+    # Approved authorizations counted against the limits; reset when the day or month rolls over
+    daily_spent = Column(Numeric(15, 2), default=0.00, nullable=False)
+    daily_spent_on = Column(Date, nullable=True)
+    monthly_spent = Column(Numeric(15, 2), default=0.00, nullable=False)
+    monthly_spent_in = Column(Integer, nullable=True)  # year * 100 + month
+    
     # Foreign keys
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True)  # For debit cards
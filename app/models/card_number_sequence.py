@@ -0,0 +1,26 @@
+from sqlalchemy import Column, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class CardNumberSequence(Base):
+    """Next unissued account sequence of a BIN.
+
+    Allocators reserve whole blocks of sequences by advancing `next_value`,
+    so card numbers are unique without checking each one against the cards.
+    """
+
+    __tablename__ = "card_number_sequences"
+
+    # Primary key
+    bin = Column(String(8), primary_key=True)
+
+    # Sequence information
+    next_value = Column(BigInteger, nullable=False, default=0)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CardNumberSequence(bin='{self.bin}', next_value={self.next_value})>"
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, Boolean, Enum
+from sqlalchemy.sql import func
+from app.database import Base
+from .account import AccountType
+from .transaction import TransactionType
+
+
+class FeeRule(Base):
+    """Fee rule model: one amount tier of a fee schedule.
+
+    A rule applies to amounts from `min_amount` up to the next tier. Empty
+    account type, transaction type or currency match any value; when several
+    rules apply, the one with the most of these set wins.
+    """
+
+    __tablename__ = "fee_rules"
+
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True)
+
+    # What the rule applies to (NULL matches any)
+    account_type = Column(Enum(AccountType), nullable=True)
+    transaction_type = Column(Enum(TransactionType), nullable=True)
+    currency = Column(String(3), nullable=True)
+    min_amount = Column(Numeric(15, 2), nullable=False, default=0.00)  # Lower bound of the amount tier
+
+    # Fee: flat part plus a percentage of the amount, capped when max_fee is set
+    flat_fee = Column(Numeric(10, 2), nullable=False, default=0.00)
+    percent_fee = Column(Numeric(7, 4), nullable=False, default=0.00)
+    max_fee = Column(Numeric(10, 2), nullable=True)
+    is_active = Column(Boolean, nullable=False, default=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<FeeRule(id={self.id}, account_type={self.account_type}, transaction_type={self.transaction_type}, currency={self.currency}, min_amount={self.min_amount})>"
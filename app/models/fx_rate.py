@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class FxRate(Base):
+    """Exchange rate model: units of quote currency per unit of base currency.
+
+    Rates are append-only; a new row with a later effective time supersedes
+    the previous rate of the pair.
+    """
+
+    __tablename__ = "fx_rates"
+    __table_args__ = (
+        UniqueConstraint("base_currency", "quote_currency", "effective_at", name="uq_fx_rates_pair_effective_at"),
+    )
+
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Rate information
+    base_currency = Column(String(3), nullable=False)
+    quote_currency = Column(String(3), nullable=False)
+    rate = Column(Numeric(18, 8), nullable=False)
+    effective_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    def __repr__(self):
+        return f"<FxRate({self.base_currency}/{self.quote_currency}={self.rate}, effective_at={self.effective_at})>"
@@ -0,0 +1,56 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import enum
+from app.database import Base
+
+
+class HoldStatus(enum.Enum):
+    """Enumeration for hold status."""
+    ACTIVE = "active"
+    CAPTURED = "captured"
+    RELEASED = "released"
+    EXPIRED = "expired"
+
+
+class Hold(Base):
+    """Hold model: funds reserved against an account's available balance.
+
+    An active hold reduces only `available_balance`; its amount is also
+    recorded as a PENDING transaction, completed on capture and cancelled on
+    release or expiry. Holds of card authorizations are settled by the card
+    network or an operator, never by the cardholder.
+    """
+
+    __tablename__ = "holds"
+    __table_args__ = (
+        # The expiry sweeper's scan
+        Index("ix_holds_status_expires_at", "status", "expires_at"),
+    )
+
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Hold information
+    account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    amount = Column(Numeric(15, 2), nullable=False)
+    currency = Column(String(3), default="USD", nullable=False)
+    status = Column(Enum(HoldStatus), nullable=False, default=HoldStatus.ACTIVE)
+    transaction_id = Column(String(50), nullable=False)  # The PENDING transaction of the held amount
+    description = Column(String(255), nullable=True)
+    card_id = Column(Integer, ForeignKey("cards.id"), nullable=True)  # Card whose authorization placed the hold
+
+    # Outcome
+    captured_amount = Column(Numeric(15, 2), nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    resolved_at = Column(DateTime(timezone=True), nullable=True)  # Captured, released or expired
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    account = relationship("Account")
+
+    def __repr__(self):
+        return f"<Hold(id={self.id}, account_id={self.account_id}, amount={self.amount}, status='{self.status.value}')>"
@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class OutboxEvent(Base):
+    """Change event written in the same commit as the money movement it records."""
+    
+    __tablename__ = "outbox_events"
+    # AUTOINCREMENT keeps offsets strictly increasing (SQLite never reuses ids)
+    __table_args__ = {"sqlite_autoincrement": True}
+    
+    # Feed offset
+    id = Column(Integer, primary_key=True)
+    
+    # Event information
+    event_type = Column(String(50), nullable=False)
+    aggregate_id = Column(String(50), nullable=False)  # Transaction.transaction_id
+    payload = Column(Text, nullable=False)  # JSON document
+    
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    def __repr__(self):
+        return f"<OutboxEvent(id={self.id}, type='{self.event_type}', aggregate_id='{self.aggregate_id}')>"
+
+
+class ConsumerOffset(Base):
+    """Last feed offset committed by a downstream consumer."""
+    
+    __tablename__ = "consumer_offsets"
+    
+    consumer = Column(String(100), primary_key=True)
+    offset = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    def __repr__(self):
+        return f"<ConsumerOffset(consumer='{self.consumer}', offset={self.offset})>"
@@ -0,0 +1,66 @@
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+import enum
+from app.database import Base
+
+
+class StandingOrderFrequency(enum.Enum):
+    """Enumeration for how often a standing order runs."""
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+
+class StandingOrderStatus(enum.Enum):
+    """Enumeration for standing order status."""
+    ACTIVE = "active"
+    CANCELLED = "cancelled"
+    COMPLETED = "completed"
+
+
+class StandingOrder(Base):
+    """Standing order model representing a recurring transfer."""
+
+    __tablename__ = "standing_orders"
+    __table_args__ = (
+        # The scheduler's due-order scan
+        Index("ix_standing_orders_status_next_run_at", "status", "next_run_at"),
+    )
+
+    # Primary key
+    id = Column(Integer, primary_key=True, index=True)
+
+    # Transfer details
+    from_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False, index=True)
+    to_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
+    amount = Column(Numeric(15, 2), nullable=False)
+    description = Column(String(255), nullable=True)
+
+    # Schedule: occurrence N is due at start_at plus N periods
+    frequency = Column(Enum(StandingOrderFrequency), nullable=False)
+    start_at = Column(DateTime(timezone=True), nullable=False)
+    end_at = Column(DateTime(timezone=True), nullable=True)
+    next_run_at = Column(DateTime(timezone=True), nullable=False)
+    run_count = Column(Integer, nullable=False, default=0)  # Occurrences elapsed, executed or skipped
+    status = Column(Enum(StandingOrderStatus), nullable=False, default=StandingOrderStatus.ACTIVE)
+
+    # Outcome of the latest run
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+    last_transaction_id = Column(String(50), nullable=True)
+    last_failure_reason = Column(String(255), nullable=True)
+    failure_count = Column(Integer, nullable=False, default=0)
+
+    # Foreign keys
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    # Relationships
+    from_account = relationship("Account", foreign_keys=[from_account_id])
+    to_account = relationship("Account", foreign_keys=[to_account_id])
+
+    def __repr__(self):
+        return f"<StandingOrder(id={self.id}, from={self.from_account_id}, to={self.to_account_id}, amount={self.amount}, frequency='{self.frequency.value}')>"
@@ -1,6 +1,6 @@
-from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Column, Integer, String, Numeric, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 import enum
 from app.database import Base
 
@@ -25,10 +25,26 @@ class TransactionStatus(enum.Enum):
     REVERSED = "reversed"
 
 
+# Types that add to the account's balance; every other type takes from it
+CREDIT_TYPES = (TransactionType.DEPOSIT, TransactionType.INTEREST, TransactionType.REFUND)
+# Transactions whose amount is reflected in Account.balance; a reversed
+# original stays posted and is offset by its compensating entry
+POSTED_STATUSES = (TransactionStatus.COMPLETED, TransactionStatus.REVERSED)
+
+
 class Transaction(Base):
     """Transaction model representing financial transactions."""
     
     __tablename__ = "transactions"
+    __table_args__ = (
+        # Per-account ledger scans (history, reconciliation) and incoming transfers
+        Index("ix_transactions_account_id_created_at", "account_id", "created_at"),
+        Index("ix_transactions_to_account_id", "to_account_id"),
+        # The settlement worker's claim scan
+        Index("ix_transactions_status_settles_at", "status", "settles_at"),
+        # Incremental reconciliation of rows changed after insert; rows never updated stay out of the index
+        Index("ix_transactions_updated_at", "updated_at", sqlite_where=text("updated_at IS NOT NULL")),
+    )
     
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
@@ -43,6 +59,11 @@ class Transaction(Base):
     currency = Column(String(3), default="USD", nullable=False)
     fee = Column(Numeric(10, 2), default=0.00)
     
+    # Currency conversion (cross-currency transfers; amount/currency are the source side)
+    exchange_rate = Column(Numeric(18, 8), nullable=True)
+    converted_amount = Column(Numeric(15, 2), nullable=True)
+    converted_currency = Column(String(3), nullable=True)
+    
     # Account information
     account_id = Column(Integer, ForeignKey("accounts.id"), nullable=False)
     from_account_id = Column(Integer, ForeignKey("accounts.id"), nullable=True)
@@ -62,6 +83,12 @@ class Transaction(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     processed_at = Column(DateTime(timezone=True), nullable=True)
     settled_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())  # NULL until the row is first changed
+    
+    # Deferred settlement (set only on transactions the settlement worker posts)
+    settles_at = Column(DateTime(timezone=True), nullable=True)
+    lease_owner = Column(String(64), nullable=True)  # Worker currently settling the row
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     
     # Relationships
     account = relationship("Account", foreign_keys=[account_id], back_populates="transactions")
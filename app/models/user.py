@@ -23,6 +23,9 @@ class User(Base):
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)
     
+    # Bumped on every account/card/transaction change, used for list ETags
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # Address information
     address_line1 = Column(String(200), nullable=True)
     address_line2 = Column(String(200), nullable=True)
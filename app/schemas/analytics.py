@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class MerchantSpending(BaseModel):
+    """Schema for spending at one merchant."""
+    merchant: str
+    total: str
+    count: int
+
+
+class CategorySpending(BaseModel):
+    """Schema for spending in one merchant category."""
+    category: str
+    total: str
+    count: int
+    merchants: List[MerchantSpending]
+
+
+class MonthlySpending(BaseModel):
+    """Schema for one month's spending breakdown."""
+    month: str
+    total: str
+    transaction_count: int
+    categories: List[CategorySpending]
+
+
+class SpendingResponse(BaseModel):
+    """Schema for spending analytics response."""
+    months: List[MonthlySpending]
+    total: str
+    message: str = Field(default="Spending analytics retrieved successfully")
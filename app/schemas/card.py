@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 from app.models import CardType, CardStatus
@@ -56,3 +56,30 @@ class CardStatusUpdateResponse(BaseModel):
     """Schema for card status update response."""
     card: CardResponse
     message: str = Field(default="Card status updated successfully")
+
+
+class CardAuthorizationRequest(BaseModel):
+    """Schema for a card payment authorization request."""
+    amount: Decimal = Field(..., gt=0, description="Amount to authorize")
+    merchant_name: Optional[str] = Field(None, max_length=100, description="Merchant name")
+    merchant_category: Optional[str] = Field(None, max_length=50, description="Merchant category code")
+    is_international: bool = Field(default=False, description="Payment made abroad")
+    is_contactless: bool = Field(default=False, description="Payment made contactless")
+
+
+class CardAuthorizationResponse(BaseModel):
+    """Schema for an approved card authorization."""
+    card_id: int
+    account_id: int
+    hold_id: int
+    transaction_id: str
+    amount: str
+    currency: str
+    merchant_name: Optional[str] = None
+    merchant_category: Optional[str] = None
+    expires_at: datetime
+    daily_spent: str
+    monthly_spent: str
+    fraud_decision: str
+    fraud_rules: List[str]
+    message: str = Field(default="Authorization approved")
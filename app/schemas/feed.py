@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+from datetime import datetime
+
+
+class FeedEventResponse(BaseModel):
+    """Schema for one change-feed event."""
+    offset: int
+    event_type: str
+    aggregate_id: str
+    payload: Dict[str, Any]
+    created_at: Optional[datetime]
+
+
+class ChangeFeedResponse(BaseModel):
+    """Schema for a batch of change-feed events."""
+    events: list[FeedEventResponse]
+    next_offset: int = Field(..., description="Offset to commit once the batch is processed")
+    latest_offset: int
+    has_more: bool
+
+
+class OffsetCommitRequest(BaseModel):
+    """Schema for committing a consumer offset."""
+    offset: int = Field(..., ge=0, description="Last processed event offset")
+
+
+class ConsumerOffsetResponse(BaseModel):
+    """Schema for a consumer's committed position."""
+    consumer: str
+    offset: int
+    lag: int = Field(..., description="Events committed after the consumer's offset")
+    message: Optional[str] = None
@@ -0,0 +1,18 @@
+from pydantic import BaseModel, Field
+from datetime import datetime
+from decimal import Decimal
+
+
+class FxRateResponse(BaseModel):
+    """Schema for an exchange rate in force."""
+    base_currency: str
+    quote_currency: str
+    rate: Decimal
+    effective_at: datetime
+
+
+class FxRateListResponse(BaseModel):
+    """Schema for exchange rate list response."""
+    rates: list[FxRateResponse]
+    total_count: int
+    message: str = Field(default="Exchange rates retrieved successfully")
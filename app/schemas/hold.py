@@ -0,0 +1,54 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+from app.models import HoldStatus, TransactionType
+
+
+class HoldCreateRequest(BaseModel):
+    """Schema for hold creation request."""
+    account_id: int = Field(..., description="Account ID")
+    amount: Decimal = Field(..., gt=0, description="Amount to reserve")
+    transaction_type: TransactionType = Field(default=TransactionType.PAYMENT, description="Type of the pending transaction")
+    expires_in_minutes: Optional[int] = Field(None, gt=0, description="Minutes until the hold expires, defaults to HOLD_DEFAULT_EXPIRY_MINUTES")
+    description: Optional[str] = Field(None, max_length=255, description="Hold description")
+    reference: Optional[str] = Field(None, max_length=50, description="Reference number")
+
+    @field_validator("transaction_type")
+    @classmethod
+    def debit_type(cls, value: TransactionType) -> TransactionType:
+        # Capturing a hold always debits the account
+        if value not in (TransactionType.PAYMENT, TransactionType.WITHDRAWAL):
+            raise ValueError("Holds can only be placed for payments and withdrawals")
+        return value
+
+
+class HoldCaptureRequest(BaseModel):
+    """Schema for hold capture request."""
+    amount: Optional[Decimal] = Field(None, gt=0, description="Amount to post, defaults to the held amount")
+
+
+class HoldResponse(BaseModel):
+    """Schema for hold response."""
+    id: int
+    account_id: int
+    amount: Decimal
+    currency: str
+    status: HoldStatus
+    transaction_id: str
+    description: Optional[str]
+    card_id: Optional[int] = None
+    captured_amount: Optional[Decimal]
+    expires_at: datetime
+    resolved_at: Optional[datetime]
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class HoldListResponse(BaseModel):
+    """Schema for hold list response."""
+    holds: list[HoldResponse]
+    total_count: int
+    message: str = Field(default="Holds retrieved successfully")
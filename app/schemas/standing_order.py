@@ -0,0 +1,46 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from datetime import datetime
+from decimal import Decimal
+from app.models import StandingOrderFrequency, StandingOrderStatus
+
+
+class StandingOrderCreateRequest(BaseModel):
+    """Schema for standing order creation request."""
+    from_account_id: int = Field(..., description="Source account ID")
+    to_account_id: int = Field(..., description="Destination account ID")
+    amount: Decimal = Field(..., gt=0, description="Amount transferred on every run")
+    frequency: StandingOrderFrequency = Field(..., description="How often the transfer runs")
+    start_at: datetime = Field(..., description="Time of the first run")
+    end_at: Optional[datetime] = Field(None, description="No runs are scheduled after this time")
+    description: Optional[str] = Field(None, max_length=255, description="Transfer description")
+
+
+class StandingOrderResponse(BaseModel):
+    """Schema for standing order response."""
+    id: int
+    from_account_id: int
+    to_account_id: int
+    amount: Decimal
+    description: Optional[str]
+    frequency: StandingOrderFrequency
+    start_at: datetime
+    end_at: Optional[datetime]
+    next_run_at: datetime
+    run_count: int
+    status: StandingOrderStatus
+    last_run_at: Optional[datetime]
+    last_transaction_id: Optional[str]
+    last_failure_reason: Optional[str]
+    failure_count: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class StandingOrderListResponse(BaseModel):
+    """Schema for standing order list response."""
+    standing_orders: list[StandingOrderResponse]
+    total_count: int
+    message: str = Field(default="Standing orders retrieved successfully")
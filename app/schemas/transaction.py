@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 from app.models import TransactionType, TransactionStatus
@@ -32,12 +32,17 @@ class TransactionResponse(BaseModel):
     amount: str
     currency: str
     fee: str
+    exchange_rate: Optional[str] = None
+    converted_amount: Optional[str] = None
+    converted_currency: Optional[str] = None
     account_id: int
     from_account_id: Optional[int] = None
     to_account_id: Optional[int] = None
     description: Optional[str] = None
     reference: Optional[str] = None
     created_at: datetime
+    fraud_decision: Optional[str] = None  # Set on newly created transactions
+    fraud_rules: Optional[List[str]] = None  # Fraud rules that triggered
     message: Optional[str] = None
 
     class Config:
@@ -56,3 +61,20 @@ class TransferResponse(BaseModel):
     from_transaction: TransactionResponse
     to_transaction: TransactionResponse
     message: str = Field(default="Transfer completed successfully")
+
+
+class ReversalRequest(BaseModel):
+    """Schema for reversing a single transaction."""
+    reason: Optional[str] = Field(None, max_length=200, description="Why the transaction is reversed")
+
+
+class BulkReversalRequest(ReversalRequest):
+    """Schema for reversing many transactions at once."""
+    transaction_ids: List[str] = Field(..., min_length=1, description="Transactions to reverse")
+
+
+class ReversalResponse(BaseModel):
+    """Schema for reversal response."""
+    reversals: list[TransactionResponse]  # Compensating entries; reference is the original
+    reversed_count: int
+    message: str = Field(default="Transactions reversed successfully")
@@ -0,0 +1,123 @@
+import enum
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode types the JSON encoders don't handle natively."""
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data):
+    """Parse JSON text or bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response for pre-serialized dicts, skipping response_model validation.
+
+    Handlers return this with plain dicts produced by the mappers below, so
+    FastAPI neither re-validates nor re-encodes the payload.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# Row mappers: each returns exactly the fields (and JSON shape) of the
+# corresponding response schema.
+
+def transaction_to_dict(t) -> dict:
+    """Map a Transaction row to the TransactionResponse shape."""
+    return {
+        "id": t.id,
+        "transaction_id": t.transaction_id,
+        "transaction_type": t.transaction_type.value,
+        "status": t.status.value,
+        "amount": str(t.amount),
+        "currency": t.currency,
+        "fee": str(t.fee),
+        "exchange_rate": str(t.exchange_rate) if t.exchange_rate is not None else None,
+        "converted_amount": str(t.converted_amount) if t.converted_amount is not None else None,
+        "converted_currency": t.converted_currency,
+        "account_id": t.account_id,
+        "from_account_id": t.from_account_id,
+        "to_account_id": t.to_account_id,
+        "description": t.description,
+        "reference": t.reference_number,
+        "created_at": t.created_at,
+        "fraud_decision": None,
+        "fraud_rules": None,
+        "message": None,
+    }
+
+
+def card_to_dict(card) -> dict:
+    """Map a Card row to the CardResponse shape."""
+    return {
+        "id": card.id,
+        "card_number": card.card_number,
+        "card_type": card.card_type.value,
+        "status": card.status.value,
+        "cardholder_name": card.cardholder_name,
+        "expiry_month": card.expiry_month,
+        "expiry_year": card.expiry_year,
+        "is_pin_set": card.is_pin_set,
+        "is_contactless_enabled": card.is_contactless_enabled,
+        "is_international_enabled": card.is_international_enabled,
+        "daily_limit": str(card.daily_limit),
+        "monthly_limit": str(card.monthly_limit),
+        "credit_limit": str(card.credit_limit) if card.credit_limit else None,
+        "user_id": card.user_id,
+        "account_id": card.account_id,
+        "created_at": card.created_at,
+        "message": None,
+    }
+
+
+def statement_to_dict(stmt) -> dict:
+    """Map a Statement row to the StatementResponse shape."""
+    return {
+        "id": stmt.id,
+        "statement_number": stmt.statement_number,
+        "statement_period_start": stmt.statement_period_start.date(),
+        "statement_period_end": stmt.statement_period_end.date(),
+        "account_id": stmt.account_id,
+        "opening_balance": str(stmt.opening_balance),
+        "closing_balance": str(stmt.closing_balance),
+        "total_deposits": str(stmt.total_deposits),
+        "total_withdrawals": str(stmt.total_withdrawals),
+        "total_transfers_in": "0.00",  # Not stored in model
+        "total_transfers_out": "0.00",  # Not stored in model
+        "total_fees": str(stmt.total_fees),
+        "total_interest": str(stmt.total_interest),
+        "transaction_count": stmt.total_transactions,
+        "currency": stmt.currency,
+        "is_generated": stmt.is_generated,
+        "created_at": stmt.created_at,
+        "message": None,
+    }
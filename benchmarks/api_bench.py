@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+In-process load benchmark for the API hot paths.
+
+Seeds a dataset into a dedicated SQLite database, drives the endpoints through
+an ASGI client at the requested concurrency and prints throughput and
+p50/p95/p99 latency per endpoint as JSON.
+
+Usage:
+    python -m benchmarks.api_bench --requests 200 --concurrency 8 --output bench.json
+    python -m benchmarks.api_bench --compare bench.json --tolerance 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+
+DEFAULT_DATABASE_URL = "sqlite:///./bench.db"
+PASSWORD = "benchmark-password"
+
+ENDPOINTS = [
+    "signup",
+    "login",
+    "transaction_create",
+    "transfer",
+    "transaction_history",
+    "card_list",
+    "card_authorize",
+    "statement_generate",
+]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies, errors, elapsed):
+    """Build the JSON summary for one endpoint."""
+    values = sorted(latencies)
+    return {
+        "requests": len(values) + errors,
+        "errors": errors,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 3),
+    }
+
+
+def seed_dataset(users, accounts_per_user, transactions_per_account, cards_per_account, rng):
+    """Create users, accounts, cards and transaction history directly through the ORM."""
+    from app.database import Base, SessionLocal, engine
+    from app.models import (
+        User, Account, AccountType, Transaction, TransactionType, TransactionStatus,
+        Card, CardType, CardStatus
+    )
+    from app.core.security import get_password_hash, create_access_token
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    # Hash once, bcrypt is deliberately slow
+    password_hash = get_password_hash(PASSWORD)
+    db = SessionLocal()
+    seeded = []
+    try:
+        for u in range(users):
+            user = User(
+                first_name="Bench",
+                last_name=f"User{u}",
+                email=f"bench-{u}@example.com",
+                password_hash=password_hash,
+            )
+            db.add(user)
+            db.flush()
+
+            account_ids = []
+            cards = []
+            for a in range(accounts_per_user):
+                account = Account(
+                    account_number=f"{u:06d}{a:04d}",
+                    routing_number="123456789",
+                    account_type=AccountType.CHECKING if a == 0 else AccountType.SAVINGS,
+                    balance=Decimal("1000000.00"),
+                    available_balance=Decimal("1000000.00"),
+                    daily_transfer_limit=Decimal("100000000.00"),
+                    user_id=user.id,
+                )
+                db.add(account)
+                db.flush()
+                account_ids.append(account.id)
+
+                db.add_all([
+                    Transaction(
+                        transaction_id=f"TXNB{u:05d}{a:03d}{t:06d}",
+                        transaction_type=rng.choice([TransactionType.DEPOSIT, TransactionType.WITHDRAWAL]),
+                        status=TransactionStatus.COMPLETED,
+                        amount=Decimal(rng.randint(100, 50000)) / 100,
+                        fee=Decimal("0.00"),
+                        account_id=account.id,
+                        description="Seeded transaction",
+                    ) for t in range(transactions_per_account)
+                ])
+                cards.extend([
+                    Card(
+                        card_number=f"4{u:06d}{a:04d}{c:05d}"[:16],
+                        card_type=CardType.DEBIT,
+                        status=CardStatus.ACTIVE,
+                        cardholder_name=f"Bench User{u}",
+                        expiry_month=12,
+                        expiry_year=date.today().year + 3,
+                        cvv_hash="000",
+                        user_id=user.id,
+                        account_id=account.id,
+                    ) for c in range(cards_per_account)
+                ])
+            db.add_all(cards)
+            db.flush()
+
+            seeded.append({
+                "email": user.email,
+                "token": create_access_token(data={"sub": str(user.id)}),
+                "account_ids": account_ids,
+                "card_ids": [card.id for card in cards],
+            })
+        db.commit()
+    finally:
+        db.close()
+    return seeded
+
+
+def build_request(endpoint, user, rng, api):
+    """Return (method, path, json body) for one request of an endpoint."""
+    account_id = user["account_ids"][0]
+    if endpoint == "signup":
+        return "POST", f"{api}/auth/signup", {
+            "first_name": "Load",
+            "last_name": "Test",
+            "email": f"load-{uuid.uuid4().hex}@example.com",
+            "password": PASSWORD,
+        }
+    if endpoint == "login":
+        return "POST", f"{api}/auth/login", {"email": user["email"], "password": PASSWORD}
+    if endpoint == "transaction_create":
+        return "POST", f"{api}/transactions/", {
+            "account_id": account_id,
+            "transaction_type": "deposit",
+            "amount": f"{rng.randint(100, 10000) / 100:.2f}",
+        }
+    if endpoint == "transfer":
+        return "POST", f"{api}/transactions/transfer", {
+            "from_account_id": account_id,
+            "to_account_id": user["account_ids"][-1],
+            "amount": "1.00",
+        }
+    if endpoint == "transaction_history":
+        return "GET", f"{api}/transactions/account/{account_id}?limit=50", None
+    if endpoint == "card_list":
+        return "GET", f"{api}/cards/", None
+    if endpoint == "card_authorize":
+        return "POST", f"{api}/cards/{rng.choice(user['card_ids'])}/authorize", {
+            "amount": f"{rng.randint(100, 5000) / 100:.2f}",
+            "merchant_name": "Bench Merchant",
+            "merchant_category": "5411",
+        }
+    if endpoint == "statement_generate":
+        today = date.today()
+        return "POST", f"{api}/statements/generate", {
+            "account_id": account_id,
+            "start_date": (today - timedelta(days=30)).isoformat(),
+            "end_date": (today + timedelta(days=1)).isoformat(),
+        }
+    raise ValueError(f"Unknown endpoint: {endpoint}")
+
+
+async def run_endpoint(client, endpoint, users, requests, concurrency, rng, api):
+    """Fire `requests` calls at one endpoint with at most `concurrency` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one(i):
+        nonlocal errors
+        user = users[i % len(users)]
+        method, path, body = build_request(endpoint, user, rng, api)
+        headers = {"Authorization": f"Bearer {user['token']}"}
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, path, json=body, headers=headers)
+            elapsed = time.perf_counter() - start
+        if response.status_code >= 400:
+            errors += 1
+        else:
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+async def run_benchmark(args):
+    import httpx
+    from app.main import app
+    from app.config import settings
+
+    rng = random.Random(args.seed)
+    users = seed_dataset(args.users, args.accounts_per_user, args.transactions_per_account,
+                         args.cards_per_account, rng)
+
+    # bcrypt-heavy endpoints are capped so they don't dominate the run
+    bcrypt_requests = min(args.requests, args.auth_requests)
+
+    results = {}
+    # Server errors are counted per endpoint instead of aborting the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for endpoint in args.endpoints:
+            count = bcrypt_requests if endpoint in ("signup", "login") else args.requests
+            # Warm up caches and lazy imports outside the measured window
+            await run_endpoint(client, endpoint, users, min(args.warmup, count), args.concurrency,
+                               rng, settings.api_v1_str)
+            results[endpoint] = await run_endpoint(client, endpoint, users, count, args.concurrency,
+                                                   rng, settings.api_v1_str)
+    return {
+        "config": {
+            "requests": args.requests,
+            "auth_requests": bcrypt_requests,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "accounts_per_user": args.accounts_per_user,
+            "transactions_per_account": args.transactions_per_account,
+            "cards_per_account": args.cards_per_account,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Return a list of regressions where p95 grew by more than `tolerance`."""
+    regressions = []
+    for endpoint, stats in current["results"].items():
+        previous = baseline.get("results", {}).get(endpoint)
+        if not previous or not previous["p95_ms"]:
+            continue
+        change = (stats["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"]
+        stats["p95_change"] = round(change, 4)
+        if change > tolerance:
+            regressions.append(endpoint)
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the banking API hot paths in-process")
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL, help="Database used for the run (recreated)")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per endpoint")
+    parser.add_argument("--auth-requests", type=int, default=50, help="Cap for signup/login (bcrypt bound)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per endpoint")
+    parser.add_argument("--warmup", type=int, default=10, help="Unmeasured warm-up requests per endpoint")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--accounts-per-user", type=int, default=2)
+    parser.add_argument("--transactions-per-account", type=int, default=200)
+    parser.add_argument("--cards-per-account", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--endpoints", nargs="+", default=ENDPOINTS, choices=ENDPOINTS)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--compare", help="Baseline JSON report to compare p95 latencies against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 growth before failing")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Must be set before the app (and its engine) is imported
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("DEBUG", "False")
+    os.environ.setdefault("RATE_LIMIT_ENABLED", "False")
+
+    report = asyncio.run(run_benchmark(args))
+
+    regressions = []
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        report["regressions"] = regressions
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Bulk card issuance benchmark for the card number allocator.
+
+For each block size, allocates card numbers one at a time (the issue_card
+path) and in bulk, then inserts a batch of cards with bulk-allocated
+numbers, printing numbers and cards per second as JSON. Every run uses
+fresh BINs, so it can be repeated against the same database.
+
+Usage:
+    python -m benchmarks.card_issue_bench --cards 100000 --block-sizes 1 100 1000
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+import uuid
+from datetime import date
+
+
+def seed_account():
+    """One user and account to attach the benchmark cards to."""
+    from sqlalchemy import insert
+    from app.database import Base, SessionLocal, engine
+    from app.models import User, Account, AccountType
+
+    Base.metadata.create_all(bind=engine)
+    run = uuid.uuid4().hex[:8]
+    db = SessionLocal()
+    try:
+        user_id = db.execute(insert(User).values(
+            first_name="Issue", last_name="Bench", email=f"issue-{run}@example.com", password_hash="!"
+        ).returning(User.id)).scalar_one()
+        account_id = db.execute(insert(Account).values(
+            account_number=f"I{run}", routing_number="123456789", account_type=AccountType.CHECKING,
+            user_id=user_id
+        ).returning(Account.id)).scalar_one()
+        db.commit()
+        return user_id, account_id
+    finally:
+        db.close()
+
+
+def issue(numbers, user_id, account_id, batch):
+    """Insert cards carrying `numbers` with executemany batches; returns elapsed seconds."""
+    from sqlalchemy import insert
+    from app.database import SessionLocal
+    from app.models import Card, CardType, CardStatus
+
+    expiry_year = date.today().year + 3
+    db = SessionLocal()
+    started = time.perf_counter()
+    try:
+        for offset in range(0, len(numbers), batch):
+            db.execute(insert(Card.__table__), [{
+                "card_number": number, "card_type": CardType.DEBIT, "status": CardStatus.ACTIVE,
+                "cardholder_name": "Issue Bench", "expiry_month": 12, "expiry_year": expiry_year,
+                "cvv_hash": "000", "is_contactless_enabled": True, "is_international_enabled": True,
+                "daily_spent": 0, "monthly_spent": 0, "user_id": user_id, "account_id": account_id
+            } for number in numbers[offset:offset + batch]])
+            db.commit()
+    finally:
+        db.close()
+    return time.perf_counter() - started
+
+
+def run(args):
+    from app.core.card_numbers import CardNumberAllocator, is_luhn_valid
+    from app.models import CardType
+
+    user_id, account_id = seed_account()
+    rng = random.Random()
+    results = {}
+    for block_size in args.block_sizes:
+        single_bin, bulk_bin = (f"8{rng.randrange(10 ** 7):07d}" for _ in range(2))
+
+        allocator = CardNumberAllocator({"debit": [single_bin]}, block_size=block_size)
+        started = time.perf_counter()
+        singles = [allocator.allocate(CardType.DEBIT) for _ in range(args.single)]
+        single_elapsed = time.perf_counter() - started
+
+        allocator = CardNumberAllocator({"debit": [bulk_bin]}, block_size=block_size)
+        started = time.perf_counter()
+        numbers = allocator.allocate_many(CardType.DEBIT, args.cards)
+        bulk_elapsed = time.perf_counter() - started
+        assert len(set(numbers)) == len(numbers) and all(map(is_luhn_valid, numbers[:1000] + singles))
+
+        issue_elapsed = issue(numbers, user_id, account_id, args.batch)
+        results[str(block_size)] = {
+            "single_numbers_per_second": round(args.single / single_elapsed),
+            "bulk_numbers_per_second": round(args.cards / bulk_elapsed),
+            "issued_cards_per_second": round(args.cards / (bulk_elapsed + issue_elapsed)),
+        }
+    return {
+        "config": {"cards": args.cards, "single": args.single, "batch": args.batch},
+        "results": results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark card number allocation and bulk issuance")
+    parser.add_argument("--database-url", default="sqlite:///./cards_bench.db", help="Database the cards are issued into")
+    parser.add_argument("--cards", type=int, default=100000, help="Cards issued in bulk per block size")
+    parser.add_argument("--single", type=int, default=2000, help="Numbers allocated one at a time per block size")
+    parser.add_argument("--block-sizes", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--batch", type=int, default=5000, help="Cards inserted per commit")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Must be set before the app (and its engine) is imported
+    os.environ["DATABASE_URL"] = args.database_url
+
+    report = run(args)
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
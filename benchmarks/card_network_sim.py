@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Card network simulator for the binary authorization listener.
+
+Replays authorization messages over several pipelined TCP connections at a
+fixed rate (or as fast as the in-flight window allows), printing
+throughput, latency percentiles and response codes every few seconds and
+a JSON summary at the end. With a rate, latency is measured from each
+message's scheduled send time, so a stalled listener is not hidden by the
+simulator slowing down with it.
+
+Usage:
+    python -m app.jobs.card_listener &
+    python -m benchmarks.card_network_sim --seed-cards 1000 --messages 1000000 --rate 2000
+
+    # Listener in the same process, against a scratch database
+    python -m benchmarks.card_network_sim --serve --database-url sqlite:///./network.db --seed-cards 1000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+
+from benchmarks.api_bench import summarize
+
+MERCHANTS = [
+    ("Grocery Mart", "5411"),
+    ("Fuel Stop", "5541"),
+    ("Corner Cafe", "5814"),
+    ("City Transit", "4111"),
+    ("Online Books", "5942"),
+]
+
+GENEROUS = Decimal("1000000000.00")
+
+
+def seed_cards(count):
+    """Create `count` active debit cards on well-funded accounts with high limits; returns their ids."""
+    from sqlalchemy import insert, select
+    from app.database import Base, SessionLocal, engine
+    from app.models import User, Account, AccountType, Card, CardType, CardStatus
+
+    Base.metadata.create_all(bind=engine)
+    run = uuid.uuid4().hex[:6]
+    db = SessionLocal()
+    try:
+        user_id = db.execute(insert(User).values(
+            first_name="Network", last_name="Simulator", email=f"network-{run}@example.com",
+            password_hash="!"
+        ).returning(User.id)).scalar_one()
+        account_ids = db.execute(insert(Account.__table__).returning(
+            Account.__table__.c.id, sort_by_parameter_order=True
+        ), [{
+            "account_number": f"N{run}{i:07d}", "routing_number": "123456789",
+            "account_type": AccountType.CHECKING, "balance": GENEROUS, "available_balance": GENEROUS,
+            "currency": "USD", "accrued_interest": 0, "user_id": user_id
+        } for i in range(count)]).scalars().all()
+        expiry_year = date.today().year + 3
+        db.execute(insert(Card.__table__), [{
+            "card_number": f"8{int(run, 16) % 10 ** 6:06d}{i:09d}", "card_type": CardType.DEBIT,
+            "status": CardStatus.ACTIVE, "cardholder_name": "Network Simulator",
+            "expiry_month": 12, "expiry_year": expiry_year, "cvv_hash": "000",
+            "is_contactless_enabled": True, "is_international_enabled": True,
+            "daily_limit": GENEROUS, "monthly_limit": GENEROUS, "daily_spent": 0, "monthly_spent": 0,
+            "user_id": user_id, "account_id": account_id
+        } for i, account_id in enumerate(account_ids)])
+        db.commit()
+        return db.scalars(select(Card.id).where(Card.user_id == user_id)).all()
+    finally:
+        db.close()
+
+
+def active_cards():
+    from sqlalchemy import select
+    from app.database import SessionLocal
+    from app.models import Card, CardStatus
+
+    db = SessionLocal()
+    try:
+        return db.scalars(select(Card.id).where(
+            Card.status == CardStatus.ACTIVE, Card.account_id.isnot(None)
+        )).all()
+    finally:
+        db.close()
+
+
+class Stats:
+    """Latencies and response codes, overall and since the last report."""
+
+    def __init__(self):
+        self.latencies = []
+        self.codes = Counter()
+        self.reported = 0
+        self.reported_at = time.perf_counter()
+
+    def record(self, latency, code):
+        self.latencies.append(latency)
+        self.codes[code] += 1
+
+    def report(self):
+        now = time.perf_counter()
+        window = self.latencies[self.reported:]
+        summary = summarize(window, 0, now - self.reported_at)
+        self.reported, self.reported_at = len(self.latencies), now
+        print(json.dumps({
+            "answered": len(self.latencies), "throughput_mps": summary["throughput_rps"],
+            "p50_ms": summary["p50_ms"], "p99_ms": summary["p99_ms"]
+        }), flush=True)
+
+
+async def run_connection(host, port, messages, in_flight, stats, schedule):
+    """Send messages from the shared iterator over one connection, keeping `in_flight` outstanding."""
+    from app.core.card_network import LENGTH, decode_response, encode_request
+
+    reader, writer = await asyncio.open_connection(host, port)
+    slots = asyncio.Semaphore(in_flight)
+    sent = {}
+    done_sending = False
+
+    async def receive():
+        try:
+            while sent or not done_sending:
+                (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+                trace, code, _ = decode_response(await reader.readexactly(length))
+                stats.record(time.perf_counter() - sent.pop(trace), code)
+                slots.release()
+        except asyncio.IncompleteReadError:
+            raise ConnectionError(f"Listener closed the connection with {len(sent)} authorizations unanswered")
+        finally:
+            # Wake the sender if the connection dropped while it waited for a slot
+            for _ in range(in_flight):
+                slots.release()
+
+    receiver = asyncio.create_task(receive())
+    for message in messages:
+        await slots.acquire()
+        if receiver.done():
+            break
+        started = schedule(message.trace)
+        if started is None:
+            started = time.perf_counter()
+        else:
+            delay = started - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        sent[message.trace] = started
+        writer.write(encode_request(message))
+        if writer.transport.get_write_buffer_size() > 65536:
+            await writer.drain()
+    done_sending = True
+    if not sent:
+        receiver.cancel()
+    try:
+        # Raises the receiver's error when the listener dropped the connection
+        await receiver
+    except asyncio.CancelledError:
+        if not receiver.cancelled():
+            raise
+    finally:
+        writer.close()
+
+
+def generate(count, card_ids, rng):
+    from app.core.card_network import AuthorizationMessage
+
+    for trace in range(count):
+        name, category = rng.choice(MERCHANTS)
+        yield AuthorizationMessage(
+            trace, rng.choice(card_ids), rng.randint(100, 20000),
+            international=rng.random() < 0.05, contactless=rng.random() < 0.5,
+            merchant_category=category, merchant_name=name
+        )
+
+
+async def simulate(args, card_ids):
+    from app.config import settings
+    from app.core.card_network import CardNetworkListener
+
+    listener = None
+    host, port = args.host or settings.card_network_host, args.port
+    if args.serve:
+        listener = CardNetworkListener(host, 0 if port is None else port, args.workers)
+        await listener.start()
+        port = listener.bound_port
+    elif port is None:
+        port = settings.card_network_port
+
+    stats = Stats()
+    messages = generate(args.messages, card_ids, random.Random(args.seed))
+    start = time.perf_counter()
+
+    def schedule(trace):
+        return start + trace / args.rate if args.rate else None
+
+    async def reporter():
+        while True:
+            await asyncio.sleep(args.report_interval)
+            stats.report()
+
+    reporting = asyncio.create_task(reporter())
+    await asyncio.gather(*(
+        run_connection(host, port, messages, args.in_flight, stats, schedule)
+        for _ in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - start
+    reporting.cancel()
+    if listener is not None:
+        await listener.close()
+
+    summary = summarize(stats.latencies, 0, elapsed)
+    summary["codes"] = {str(code): count for code, count in sorted(stats.codes.items())}
+    return {
+        "config": {
+            "messages": args.messages, "rate": args.rate, "connections": args.connections,
+            "in_flight": args.in_flight, "cards": len(card_ids), "seed": args.seed,
+        },
+        "results": summary,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay authorization messages against the card network listener")
+    parser.add_argument("--host", help="Listener host (CARD_NETWORK_HOST by default)")
+    parser.add_argument("--port", type=int, help="Listener port (CARD_NETWORK_PORT by default)")
+    parser.add_argument("--database-url", help="Database holding the cards (DATABASE_URL by default)")
+    parser.add_argument("--seed-cards", type=int, default=0, help="Create this many funded cards and use only them")
+    parser.add_argument("--serve", action="store_true", help="Run the listener in this process")
+    parser.add_argument("--workers", type=int, help="Listener threads with --serve")
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--rate", type=float, default=0, help="Messages per second overall; 0 sends as fast as answered")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--in-flight", type=int, default=32, help="Outstanding messages per connection")
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the JSON summary to this file")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    # Must be set before the app (and its engine) is imported
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    card_ids = seed_cards(args.seed_cards) if args.seed_cards else active_cards()
+    if not card_ids:
+        raise SystemExit("No active cards to authorize; use --seed-cards")
+    report = asyncio.run(simulate(args, card_ids))
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+
+if __name__ == "__main__":
+    main()
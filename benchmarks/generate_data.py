@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator for large, realistic datasets.
+
+Bulk-loads users, accounts, cards, skewed transaction histories (a few heavy
+business accounts plus a long tail) and monthly statements with core
+``insert()`` executemany in large chunks. The same seed always produces the
+same dataset, and stored balances match the generated transactions.
+
+Usage:
+    python -m benchmarks.generate_data --database-url sqlite:///./large.db \\
+        --users 100000 --transactions 10000000
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from bisect import bisect_right
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from itertools import accumulate
+
+from sqlalchemy import create_engine, event, func, insert, select, update, bindparam, literal, case
+
+from app.database import Base
+from app.models import (
+    User, Account, AccountType, AccountStatus, Transaction, TransactionType, TransactionStatus,
+    Card, CardType, CardStatus, Statement
+)
+from app.core.security import get_password_hash
+
+MERCHANTS = [
+    ("Grocery Mart", "groceries"),
+    ("Fresh Foods", "groceries"),
+    ("City Transit", "transport"),
+    ("Fuel Stop", "transport"),
+    ("Corner Cafe", "dining"),
+    ("Pizza Place", "dining"),
+    ("Stream Plus", "entertainment"),
+    ("Cinema City", "entertainment"),
+    ("Power & Light Co", "utilities"),
+    ("Telecom One", "utilities"),
+    ("Online Store", "shopping"),
+    ("Fashion Hub", "shopping"),
+    ("Pharmacy Plus", "health"),
+    ("Air Travel", "travel"),
+]
+
+PERSONAL_TYPES = [AccountType.CHECKING, AccountType.SAVINGS, AccountType.MONEY_MARKET,
+                  AccountType.CERTIFICATE_OF_DEPOSIT]
+
+
+def create_load_engine(database_url):
+    """Engine tuned for bulk loading (SQLite durability relaxed for the load only)."""
+    engine = create_engine(database_url)
+    if engine.dialect.name == "sqlite":
+        @event.listens_for(engine, "connect")
+        def _sqlite_bulk_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=OFF")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA cache_size=-200000")
+            cursor.close()
+    return engine
+
+
+def chunked_insert(conn, table, rows_iter, chunk_size):
+    """Insert rows from an iterator with executemany, one chunk at a time."""
+    statement = insert(table)
+    total = 0
+    chunk = []
+    for row in rows_iter:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            conn.execute(statement, chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        conn.execute(statement, chunk)
+        total += len(chunk)
+    return total
+
+
+class Phase:
+    """Prints rows/second for a load phase."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        print(f"{self.name}...", flush=True)
+        return self
+
+    def done(self, rows):
+        elapsed = time.perf_counter() - self.start
+        rate = rows / elapsed if elapsed else 0
+        print(f"  {rows:,} rows in {elapsed:.1f}s ({rate:,.0f} rows/s)", flush=True)
+
+    def __exit__(self, *exc):
+        return False
+
+
+def generate_users(rng, count, password_hash, now):
+    for user_id in range(1, count + 1):
+        yield {
+            "id": user_id,
+            "first_name": f"First{user_id}",
+            "last_name": f"Last{user_id}",
+            "email": f"user{user_id}@synthetic.example",
+            "password_hash": password_hash,
+            "is_active": True,
+            "is_verified": rng.random() < 0.8,
+            "country": "US",
+            "created_at": now,
+        }
+
+
+def plan_accounts(rng, users, accounts_per_user, business_ratio, skew):
+    """Decide every account's owner, type and activity weight up front."""
+    accounts = []
+    account_id = 0
+    for user_id in range(1, users + 1):
+        for _ in range(max(1, int(rng.expovariate(1 / accounts_per_user) + 0.5))):
+            account_id += 1
+            if rng.random() < business_ratio:
+                # Heavy business accounts (payroll, merchant settlement)
+                account_type = AccountType.BUSINESS
+                weight = rng.paretovariate(skew) * 200
+            else:
+                account_type = rng.choice(PERSONAL_TYPES) if rng.random() < 0.4 else AccountType.CHECKING
+                weight = rng.paretovariate(skew)
+            accounts.append((account_id, user_id, account_type, weight))
+    return accounts
+
+
+def generate_accounts(accounts, now):
+    for account_id, user_id, account_type, _ in accounts:
+        yield {
+            "id": account_id,
+            "account_number": f"{account_id:010d}",
+            "routing_number": "021000021",
+            "account_type": account_type,
+            "status": AccountStatus.ACTIVE,
+            "balance": Decimal("0.00"),
+            "available_balance": Decimal("0.00"),
+            "currency": "USD",
+            "user_id": user_id,
+            "created_at": now,
+        }
+
+
+def generate_cards(rng, accounts, cards_per_account, now):
+    card_id = 0
+    for account_id, user_id, account_type, _ in accounts:
+        for _ in range(rng.randint(0, cards_per_account)):
+            card_id += 1
+            card_type = CardType.CREDIT if rng.random() < 0.2 else CardType.DEBIT
+            yield {
+                "id": card_id,
+                "card_number": f"4{card_id:015d}",
+                "card_type": card_type,
+                "status": CardStatus.ACTIVE if rng.random() < 0.95 else CardStatus.BLOCKED,
+                "cardholder_name": f"First{user_id} Last{user_id}",
+                "expiry_month": rng.randint(1, 12),
+                "expiry_year": now.year + rng.randint(1, 4),
+                "cvv_hash": "000",
+                "is_pin_set": True,
+                "daily_limit": Decimal("1000.00"),
+                "monthly_limit": Decimal("10000.00"),
+                "credit_limit": Decimal("5000.00") if card_type == CardType.CREDIT else None,
+                "user_id": user_id,
+                "account_id": account_id,
+                "created_at": now,
+            }
+
+
+# Columns written by the transaction fast path, in table order
+TRANSACTION_COLUMNS = (
+    "transaction_id", "transaction_type", "status", "amount", "currency", "fee", "account_id",
+    "from_account_id", "to_account_id", "description", "merchant_name", "merchant_category", "created_at",
+)
+
+
+def compile_insert(engine, table, columns):
+    """Compile a core insert() once so rows can be sent as positional tuples.
+
+    Skipping per-row parameter construction and type processing roughly
+    triples throughput, so values must already be in their stored form
+    (enum names, floats, ISO timestamps).
+    """
+    compiled = insert(table).values({name: bindparam(name) for name in columns}).compile(dialect=engine.dialect)
+    if compiled.positiontup is not None and tuple(compiled.positiontup) != tuple(columns):
+        raise ValueError("columns must be listed in table order")
+    return str(compiled)
+
+
+def chunked_insert_tuples(conn, sql, rows_iter, chunk_size):
+    """Positional executemany of tuples, one chunk at a time."""
+    total = 0
+    chunk = []
+    for row in rows_iter:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            conn.exec_driver_sql(sql, chunk)
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        conn.exec_driver_sql(sql, chunk)
+        total += len(chunk)
+    return total
+
+
+def _timestamp(value):
+    return value.isoformat(" ", "microseconds")
+
+
+# Per-process state for chunk generation (set once by _init_transaction_worker)
+_worker = {}
+
+# Size of the precomputed amount tables sampled per row
+_AMOUNT_TABLE_SIZE = 4096
+
+
+def _init_transaction_worker(accounts, days, now, seed):
+    """Precompute everything rows are sampled from, once per process."""
+    rng = random.Random(seed)
+    start = now - timedelta(days=days)
+    _worker.update(
+        seed=seed,
+        account_ids=[a[0] for a in accounts],
+        cum_weights=list(accumulate(a[3] for a in accounts)),
+        is_business={a[0] for a in accounts if a[2] == AccountType.BUSINESS},
+        days=[(start + timedelta(days=d)).strftime("%Y-%m-%d ") for d in range(days)],
+        times=[f"{s // 3600:02d}:{s // 60 % 60:02d}:{s % 60:02d}.000000" for s in range(86400)],
+        # Log-normal amount distributions (in cents) per kind of movement
+        amounts={
+            kind: [max(1, int(rng.lognormvariate(mu, sigma))) for _ in range(_AMOUNT_TABLE_SIZE)]
+            for kind, (mu, sigma) in {
+                "business_deposit": (10.5, 1.0),
+                "deposit": (9.5, 1.0),
+                "withdrawal": (8.5, 0.8),
+                "payment": (7.5, 1.1),
+                "transfer": (9.0, 1.0),
+            }.items()
+        },
+    )
+
+
+def _generate_transaction_chunk(task):
+    """Generate one chunk of transaction rows plus its balance deltas (in cents).
+
+    Each chunk has its own seed, so the dataset is identical whatever the
+    number of worker processes.
+    """
+    index, offset, size = task
+    rng = random.Random(_worker["seed"] * 1_000_003 + index)
+    random_ = rng.random
+    account_ids = _worker["account_ids"]
+    cum_weights = _worker["cum_weights"]
+    total_weight = cum_weights[-1]
+    is_business = _worker["is_business"]
+    days, times = _worker["days"], _worker["times"]
+    amounts = _worker["amounts"]
+    business_deposits, deposits = amounts["business_deposit"], amounts["deposit"]
+    withdrawals, payments, transfers = amounts["withdrawal"], amounts["payment"], amounts["transfer"]
+    n_days, n_accounts, n_merchants = len(days), len(account_ids), len(MERCHANTS)
+
+    # Enum columns store member names
+    deposit = TransactionType.DEPOSIT.name
+    withdrawal = TransactionType.WITHDRAWAL.name
+    payment = TransactionType.PAYMENT.name
+    transfer = TransactionType.TRANSFER.name
+    completed = TransactionStatus.COMPLETED.name
+
+    rows = []
+    deltas = {}
+    sequence = offset
+    for _ in range(size):
+        sequence += 1
+        account_id = account_ids[bisect_right(cum_weights, random_() * total_weight)]
+        roll = random_()
+        amount_index = int(random_() * _AMOUNT_TABLE_SIZE)
+        merchant_name = merchant_category = None
+        from_account_id = to_account_id = None
+        if roll < 0.35:
+            kind = deposit
+            cents = (business_deposits if account_id in is_business else deposits)[amount_index]
+            deltas[account_id] = deltas.get(account_id, 0) + cents
+        else:
+            if roll < 0.55:
+                kind = withdrawal
+                cents = withdrawals[amount_index]
+            elif roll < 0.95:
+                kind = payment
+                cents = payments[amount_index]
+                merchant_name, merchant_category = MERCHANTS[int(random_() * n_merchants)]
+            else:
+                kind = transfer
+                cents = transfers[amount_index]
+                from_account_id = account_id
+                to_account_id = account_ids[int(random_() * n_accounts)]
+                # Transfers are recorded on the source account only (as transfer_money does)
+                deltas[to_account_id] = deltas.get(to_account_id, 0) + cents
+            deltas[account_id] = deltas.get(account_id, 0) - cents
+        rows.append((
+            f"TXNS{sequence:012d}", kind, completed, cents / 100, "USD", 0.0, account_id,
+            from_account_id, to_account_id, None, merchant_name, merchant_category,
+            days[int(random_() * n_days)] + times[int(random_() * 86400)],
+        ))
+    return rows, deltas
+
+
+def generate_transaction_chunks(accounts, count, days, now, seed, chunk_size, workers):
+    """Yield (rows, balance deltas) per chunk, in chunk order."""
+    tasks = [(i, offset, min(chunk_size, count - offset)) for i, offset in enumerate(range(0, count, chunk_size))]
+    init_args = (accounts, days, now, seed)
+    if workers <= 1:
+        _init_transaction_worker(*init_args)
+        for task in tasks:
+            yield _generate_transaction_chunk(task)
+        return
+    with multiprocessing.Pool(workers, initializer=_init_transaction_worker, initargs=init_args) as pool:
+        yield from pool.imap(_generate_transaction_chunk, tasks)
+
+
+def opening_deposits(balances, start, first_sequence):
+    """Opening deposits so no generated account ends with a negative balance."""
+    sequence = first_sequence
+    created_at = _timestamp(start)
+    for account_id, cents in balances.items():
+        if cents >= 0:
+            continue
+        top_up = -cents + 100_000
+        balances[account_id] = cents + top_up
+        sequence += 1
+        yield (
+            f"TXNS{sequence:012d}", TransactionType.DEPOSIT.name, TransactionStatus.COMPLETED.name,
+            top_up / 100, "USD", 0.0, account_id, None, None, "Opening balance", None, None, created_at,
+        )
+
+
+def write_balances(conn, balances, chunk_size):
+    """Store the accumulated balances with an executemany UPDATE."""
+    statement = (
+        update(Account.__table__)
+        .where(Account.__table__.c.id == bindparam("b_id"))
+        .values(balance=bindparam("b_balance"), available_balance=bindparam("b_balance"))
+    )
+    rows = [{"b_id": account_id, "b_balance": Decimal(cents) / 100} for account_id, cents in balances.items()]
+    for i in range(0, len(rows), chunk_size):
+        conn.execute(statement, rows[i:i + chunk_size])
+    return len(rows)
+
+
+def generate_statements(conn):
+    """Build one statement per account and month with a set-based INSERT ... SELECT."""
+    t = Transaction.__table__
+    month = func.strftime("%Y-%m", t.c.created_at)
+    is_deposit = t.c.transaction_type == TransactionType.DEPOSIT.name
+    monthly = (
+        select(
+            t.c.account_id.label("account_id"),
+            month.label("month"),
+            func.sum(case((is_deposit, t.c.amount), else_=-t.c.amount)).label("net"),
+            func.sum(case((is_deposit, t.c.amount), else_=0)).label("deposits"),
+            func.sum(case((is_deposit, 0), else_=t.c.amount)).label("withdrawals"),
+            func.count().label("tx_count"),
+            func.sum(case((is_deposit, 1), else_=0)).label("deposit_count"),
+        )
+        .group_by(t.c.account_id, month)
+        .subquery()
+    )
+    closing = func.sum(monthly.c.net).over(partition_by=monthly.c.account_id, order_by=monthly.c.month)
+    period_start = func.datetime(func.printf("%s-01", monthly.c.month))
+    rows = select(
+        func.printf("STMT%010d%s", monthly.c.account_id, monthly.c.month).label("statement_number"),
+        period_start.label("statement_period_start"),
+        func.datetime(period_start, "+1 month", "-1 second").label("statement_period_end"),
+        monthly.c.account_id,
+        (closing - monthly.c.net).label("opening_balance"),
+        closing.label("closing_balance"),
+        monthly.c.deposits.label("total_deposits"),
+        monthly.c.withdrawals.label("total_withdrawals"),
+        literal(0).label("total_fees"),
+        literal(0).label("total_interest"),
+        monthly.c.tx_count.label("total_transactions"),
+        monthly.c.deposit_count.label("deposits_count"),
+        (monthly.c.tx_count - monthly.c.deposit_count).label("withdrawals_count"),
+        literal("USD").label("currency"),
+        literal(True).label("is_generated"),
+        func.datetime(period_start, "+1 month").label("created_at"),
+    )
+    s = Statement.__table__
+    result = conn.execute(
+        insert(s).from_select(
+            ["statement_number", "statement_period_start", "statement_period_end", "account_id",
+             "opening_balance", "closing_balance", "total_deposits", "total_withdrawals", "total_fees",
+             "total_interest", "total_transactions", "deposits_count", "withdrawals_count", "currency",
+             "is_generated", "created_at"],
+            rows,
+        )
+    )
+    return result.rowcount
+
+
+def generate(args):
+    rng = random.Random(args.seed)
+    engine = create_load_engine(args.database_url)
+    if args.drop:
+        Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    # Fixed reference time keeps the dataset deterministic for a seed
+    now = datetime.combine(date.today(), datetime.min.time()) if args.now is None else args.now
+    started = time.perf_counter()
+
+    with Phase("Users") as phase, engine.begin() as conn:
+        password_hash = get_password_hash(args.password)
+        phase.done(chunked_insert(conn, User.__table__, generate_users(rng, args.users, password_hash, now),
+                                  args.chunk_size))
+
+    accounts = plan_accounts(rng, args.users, args.accounts_per_user, args.business_ratio, args.skew)
+    with Phase("Accounts") as phase, engine.begin() as conn:
+        phase.done(chunked_insert(conn, Account.__table__, generate_accounts(accounts, now), args.chunk_size))
+
+    with Phase("Cards") as phase, engine.begin() as conn:
+        phase.done(chunked_insert(conn, Card.__table__, generate_cards(rng, accounts, args.cards_per_account, now),
+                                  args.chunk_size))
+
+    balances = {}
+    with Phase("Transactions") as phase:
+        table = Transaction.__table__
+        sql = compile_insert(engine, table, TRANSACTION_COLUMNS)
+        # Secondary indexes are rebuilt once after the load instead of per row
+        secondary_indexes = list(table.indexes)
+        with engine.begin() as conn:
+            for index in secondary_indexes:
+                index.drop(conn, checkfirst=True)
+
+        total = 0
+        chunks = generate_transaction_chunks(accounts, args.transactions, args.days, now, args.seed,
+                                             args.chunk_size, args.workers)
+        for rows, deltas in chunks:
+            # One database transaction per chunk keeps memory flat on tens of millions of rows
+            with engine.begin() as conn:
+                conn.exec_driver_sql(sql, rows)
+            for account_id, cents in deltas.items():
+                balances[account_id] = balances.get(account_id, 0) + cents
+            total += len(rows)
+            if total % (args.chunk_size * 20) == 0:
+                print(f"  {total:,} / {args.transactions:,}", flush=True)
+
+        with engine.begin() as conn:
+            total += chunked_insert_tuples(conn, sql,
+                                           opening_deposits(balances, now - timedelta(days=args.days),
+                                                            args.transactions),
+                                           args.chunk_size)
+            for index in secondary_indexes:
+                index.create(conn)
+        phase.done(total)
+
+    with Phase("Balances") as phase, engine.begin() as conn:
+        phase.done(write_balances(conn, balances, args.chunk_size))
+
+    if args.statements and engine.dialect.name == "sqlite":
+        with Phase("Statements") as phase, engine.begin() as conn:
+            phase.done(generate_statements(conn))
+
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a large synthetic banking dataset")
+    parser.add_argument("--database-url", default="sqlite:///./synthetic.db")
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--accounts-per-user", type=float, default=1.8, help="Mean accounts per user")
+    parser.add_argument("--transactions", type=int, default=1_000_000)
+    parser.add_argument("--cards-per-account", type=int, default=2, help="Maximum cards per account")
+    parser.add_argument("--business-ratio", type=float, default=0.02, help="Share of heavy business accounts")
+    parser.add_argument("--skew", type=float, default=1.2, help="Pareto shape of account activity (lower = more skew)")
+    parser.add_argument("--days", type=int, default=365, help="History length in days")
+    parser.add_argument("--chunk-size", type=int, default=50_000, help="Rows per executemany batch")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Processes generating transaction chunks")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--password", default="password123", help="Password for every generated user")
+    parser.add_argument("--now", type=datetime.fromisoformat, default=None,
+                        help="Reference time (ISO format), defaults to today at midnight")
+    parser.add_argument("--no-statements", dest="statements", action="store_false",
+                        help="Skip monthly statement generation")
+    parser.add_argument("--drop", action="store_true", help="Drop existing tables first")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    generate(parse_args(argv))
+
+
+if __name__ == "__main__":
+    main()
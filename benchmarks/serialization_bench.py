@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for list endpoint serialization.
+
+Compares the per-row cost of the previous path (a validated Pydantic model
+per row, re-validated against response_model and encoded with the stdlib
+JSON encoder) with the row mapper + FastJSONResponse path.
+
+Usage:
+    python -m benchmarks.serialization_bench --pages 50 500 5000
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.models import Transaction, TransactionType, TransactionStatus
+from app.schemas.transaction import TransactionResponse, TransactionListResponse
+from app.utils.serialization import FastJSONResponse, transaction_to_dict
+
+
+def make_rows(count):
+    """Transient Transaction rows shaped like a history page."""
+    now = datetime(2025, 1, 1, 12, 0, 0)
+    return [
+        Transaction(
+            id=i,
+            transaction_id=f"TXN{i:012d}",
+            transaction_type=TransactionType.DEPOSIT if i % 3 else TransactionType.WITHDRAWAL,
+            status=TransactionStatus.COMPLETED,
+            amount=Decimal(f"{i % 1000}.{i % 100:02d}"),
+            currency="USD",
+            fee=Decimal("0.00"),
+            account_id=1,
+            description="Benchmark row",
+            reference_number=None,
+            created_at=now - timedelta(minutes=i),
+        ) for i in range(count)
+    ]
+
+
+_list_adapter = TypeAdapter(TransactionListResponse)
+
+
+def previous_path(rows):
+    """Model per row, response_model re-validation, stdlib JSON encoding."""
+    response = TransactionListResponse(
+        transactions=[
+            TransactionResponse(
+                id=t.id,
+                transaction_id=t.transaction_id,
+                transaction_type=t.transaction_type,
+                status=t.status,
+                amount=str(t.amount),
+                currency=t.currency,
+                fee=str(t.fee),
+                account_id=t.account_id,
+                from_account_id=t.from_account_id,
+                to_account_id=t.to_account_id,
+                description=t.description,
+                reference=t.reference_number,
+                created_at=t.created_at
+            ) for t in rows
+        ],
+        total_count=len(rows),
+        message="Transactions retrieved successfully"
+    )
+    validated = _list_adapter.validate_python(response, from_attributes=True)
+    content = jsonable_encoder(validated)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def fast_path(rows):
+    """Row mapper to plain dicts, encoded once by FastJSONResponse."""
+    return FastJSONResponse({
+        "transactions": [transaction_to_dict(t) for t in rows],
+        "total_count": len(rows),
+        "message": "Transactions retrieved successfully"
+    }).body
+
+
+def measure(fn, rows, min_time):
+    """Best-of-repeats seconds per call."""
+    fn(rows)
+    best = float("inf")
+    deadline = time.perf_counter() + min_time
+    while True:
+        start = time.perf_counter()
+        fn(rows)
+        best = min(best, time.perf_counter() - start)
+        if time.perf_counter() > deadline:
+            return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark list endpoint serialization")
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 500, 5000], help="Rows per page")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds spent per measurement")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.pages:
+        rows = make_rows(size)
+        assert json.loads(previous_path(rows)) == json.loads(fast_path(rows))
+        previous = measure(previous_path, rows, args.min_time)
+        fast = measure(fast_path, rows, args.min_time)
+        results[size] = {
+            "previous_us_per_row": round(previous / size * 1e6, 3),
+            "fast_us_per_row": round(fast / size * 1e6, 3),
+            "speedup": round(previous / fast, 2),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
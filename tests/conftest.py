@@ -0,0 +1,30 @@
+import os
+import uuid
+
+# Every test client shares one address; keep the default login/signup limits out of the way
+os.environ.setdefault("RATE_LIMIT_ENABLED", "False")
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+
+
+@pytest.fixture
+def auth_headers(monkeypatch):
+    """Sign up a fresh user and return their bearer headers; `operator=True` makes them an operator."""
+    client = TestClient(app)
+    operators = []
+
+    def create(operator=False):
+        email = f"user-{uuid.uuid4().hex}@example.com"
+        client.post("/api/v1/auth/signup", json={
+            "first_name": "Test", "last_name": "User", "email": email, "password": "password123"
+        })
+        login = client.post("/api/v1/auth/login", json={"email": email, "password": "password123"})
+        if operator:
+            operators.append(email)
+            monkeypatch.setattr(settings, "operator_emails", list(operators))
+        return {"Authorization": f"Bearer {login.json()['token']['access_token']}"}
+
+    return create
@@ -0,0 +1,119 @@
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.models import Transaction, TransactionType, TransactionStatus
+from app.core.analytics import SpendingCache
+
+client = TestClient(app)
+
+
+def _setup_accounts(headers):
+    accounts = [
+        client.post("/api/v1/accounts/", json={"account_type": account_type, "initial_deposit": 500},
+                    headers=headers).json()["id"]
+        for account_type in ("checking", "savings")
+    ]
+    return accounts
+
+
+def _add(account_id, transaction_type, amount, created_at, category=None, merchant=None, to_account_id=None):
+    db = SessionLocal()
+    db.add(Transaction(
+        transaction_id=f"TXN{uuid.uuid4().hex[:12].upper()}",
+        transaction_type=transaction_type,
+        status=TransactionStatus.COMPLETED,
+        amount=Decimal(amount),
+        account_id=account_id,
+        to_account_id=to_account_id,
+        merchant_category=category,
+        merchant_name=merchant,
+        created_at=created_at
+    ))
+    db.commit()
+    db.close()
+
+
+def test_spending_breakdown_by_category_and_merchant(auth_headers):
+    """Test grouping, exact cent totals and exclusion of transfers between own accounts."""
+    headers = auth_headers()
+    checking, savings = _setup_accounts(headers)
+    march = datetime(2024, 3, 10, 12, 0)
+    _add(checking, TransactionType.PAYMENT, "10.10", march, "groceries", "Corner Shop")
+    _add(savings, TransactionType.PAYMENT, "20.20", march, "groceries", "Corner Shop")
+    _add(checking, TransactionType.PAYMENT, "0.30", march, "groceries", "Bakery")
+    _add(checking, TransactionType.WITHDRAWAL, "4.00", march)
+    _add(checking, TransactionType.DEPOSIT, "999.00", march)
+    _add(checking, TransactionType.TRANSFER, "55.00", march, to_account_id=savings)
+    _add(checking, TransactionType.PAYMENT, "7.00", datetime(2024, 4, 1, 0, 0, 1), "travel", "Rail")
+
+    response = client.get("/api/v1/analytics/spending?start_month=2024-03&end_month=2024-04", headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    march_spending, april_spending = body["months"]
+    assert march_spending["total"] == "34.60"
+    groceries = march_spending["categories"][0]
+    assert groceries["category"] == "groceries"
+    assert groceries["total"] == "30.60"
+    assert groceries["merchants"][0] == {"merchant": "Corner Shop", "total": "30.30", "count": 2}
+    assert march_spending["categories"][1]["category"] == "uncategorized"
+    assert april_spending["total"] == "7.00"
+    assert body["total"] == "41.60"
+
+
+def test_new_transactions_invalidate_cached_month(auth_headers):
+    """Test that a committed withdrawal shows up in the cached current month."""
+    headers = auth_headers()
+    checking, _ = _setup_accounts(headers)
+    month = datetime.now().strftime("%Y-%m")
+    before = client.get(f"/api/v1/analytics/spending?end_month={month}", headers=headers).json()
+    assert before["total"] == "0.00"
+
+    client.post("/api/v1/transactions/", json={
+        "account_id": checking, "transaction_type": "withdrawal", "amount": 12.5
+    }, headers=headers)
+    after = client.get(f"/api/v1/analytics/spending?end_month={month}", headers=headers).json()
+    assert after["total"] == "12.50"
+
+
+def test_cache_rejects_results_computed_before_invalidation():
+    """Test that a breakdown computed concurrently with a write is not cached."""
+    cache = SpendingCache()
+    _, generation = cache.get(1, "2024-01")
+    cache.invalidate(1, "2024-01")
+    cache.put(1, "2024-01", {"total": "stale"}, generation)
+    assert cache.get(1, "2024-01")[0] is None
+
+
+def test_cache_generations_are_bounded():
+    """Test that invalidating uncached keys doesn't grow the cache without bound."""
+    cache = SpendingCache(max_entries=3)
+    _, generation = cache.get(1, "2024-01")
+    for user_id in range(1, 100):
+        cache.invalidate(user_id, "2024-01")
+    assert len(cache._generations) == 3
+    # The load that started before user 1's (now forgotten) invalidation is still rejected
+    cache.put(1, "2024-01", {"total": "stale"}, generation)
+    assert cache.get(1, "2024-01")[0] is None
+
+    _, generation = cache.get(1, "2024-01")
+    cache.put(1, "2024-01", {"total": "fresh"}, generation)
+    assert cache.get(1, "2024-01")[0] == {"total": "fresh"}
+
+
+def test_invalid_month_range(auth_headers):
+    """Test month validation and the range limit."""
+    headers = auth_headers()
+    assert client.get("/api/v1/analytics/spending?end_month=2024-13", headers=headers).status_code == 422
+    response = client.get("/api/v1/analytics/spending?start_month=2023-01&end_month=2024-06", headers=headers)
+    assert response.status_code == 400
+    response = client.get("/api/v1/analytics/spending?start_month=0001-01&end_month=9999-11", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Range cannot exceed 12 months"
+    response = client.get("/api/v1/analytics/spending?start_month=9999-12&end_month=9999-12", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "end_month cannot be after 9999-11"
+    response = client.get("/api/v1/analytics/spending?start_month=9999-01&end_month=9999-11", headers=headers)
+    assert response.status_code == 200
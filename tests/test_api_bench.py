@@ -0,0 +1,10 @@
+from benchmarks.api_bench import percentile
+
+
+def test_percentile_is_nearest_rank():
+    """Test percentile picks the ceil(p * n)-th smallest value."""
+    values = list(range(1, 101))
+    assert [percentile(values, p) for p in (0.5, 0.95, 0.99, 1.0)] == [50, 95, 99, 100]
+    assert percentile(values, 0.0) == 1
+    assert percentile([3, 7, 9], 0.5) == 7
+    assert percentile([], 0.5) == 0.0
@@ -0,0 +1,91 @@
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Transaction, TransactionType, TransactionStatus, ArchiveManifest
+from app.core.archive import archive_transactions
+
+client = TestClient(app)
+
+
+def _setup_account(headers):
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    return account["id"]
+
+
+def _add_transactions(account_id, timestamps):
+    db = SessionLocal()
+    try:
+        ids = []
+        for created_at in timestamps:
+            transaction_id = f"TXN{uuid.uuid4().hex[:12].upper()}"
+            db.add(Transaction(
+                transaction_id=transaction_id,
+                transaction_type=TransactionType.DEPOSIT,
+                status=TransactionStatus.COMPLETED,
+                amount=Decimal("10.00"),
+                currency="USD",
+                fee=Decimal("0.00"),
+                account_id=account_id,
+                created_at=created_at
+            ))
+            ids.append(transaction_id)
+        db.commit()
+        return ids
+    finally:
+        db.close()
+
+
+def test_archived_transactions_are_read_transparently(tmp_path, monkeypatch, auth_headers):
+    """Test that statement-covered old transactions move to archives yet stay visible."""
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path))
+    headers = auth_headers()
+    account_id = _setup_account(headers)
+    now = datetime.now()
+    old = now - timedelta(days=500)
+    archived_ids = _add_transactions(account_id, [old + timedelta(days=d) for d in (1, 2, 40)])
+    # Old but not covered by any statement: stays live
+    uncovered_ids = _add_transactions(account_id, [old + timedelta(days=80)])
+    recent_ids = _add_transactions(account_id, [now - timedelta(days=1)])
+
+    statement = client.post("/api/v1/statements/generate", json={
+        "account_id": account_id,
+        "start_date": old.date().isoformat(),
+        "end_date": (old + timedelta(days=60)).date().isoformat()
+    }, headers=headers).json()
+    assert statement["transaction_count"] == 3
+
+    result = archive_transactions(SessionLocal(), horizon_days=365, now=now)
+    assert result["archived"] >= 3
+    assert len(list(tmp_path.glob("transactions_*.db"))) == 2
+
+    db = SessionLocal()
+    live = {t.transaction_id for t in db.query(Transaction).filter(Transaction.account_id == account_id)}
+    db.close()
+    assert live == set(uncovered_ids + recent_ids)
+
+    # History merges archived rows, newest first, across pages
+    page = client.get(f"/api/v1/transactions/account/{account_id}?skip=1&limit=3", headers=headers).json()
+    assert page["total_count"] == 5
+    assert [t["transaction_id"] for t in page["transactions"]] == [
+        uncovered_ids[0], archived_ids[2], archived_ids[1]
+    ]
+
+    detail = client.get(f"/api/v1/statements/{statement['id']}", headers=headers).json()
+    assert [t["transaction_id"] for t in detail["transactions"]] == archived_ids
+
+    lookup = client.get(f"/api/v1/transactions/{archived_ids[0]}", headers=headers)
+    assert lookup.status_code == 200
+    assert lookup.json()["amount"] == "10.00"
+
+    # Re-running is a no-op
+    assert archive_transactions(SessionLocal(), horizon_days=365, now=now)["archived"] == 0
+
+    # The archive files are temporary; drop their manifest entries
+    db = SessionLocal()
+    db.query(ArchiveManifest).filter(ArchiveManifest.account_id == account_id).delete()
+    db.commit()
+    db.close()
@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.core.cards import authorize_card
+from app.core.holds import expire_holds
+from app.models import Card, Transaction
+
+client = TestClient(app)
+
+
+def _card(headers, deposit="1000.00", **options):
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    client.post("/api/v1/transactions/", json={
+        "account_id": account["id"], "transaction_type": "deposit", "amount": deposit
+    }, headers=headers)
+    card = client.post("/api/v1/cards/", json={
+        "account_id": account["id"], "card_type": "debit", **options
+    }, headers=headers).json()
+    return card["id"], account["id"]
+
+
+def _balances(headers, account_id):
+    account = client.get(f"/api/v1/accounts/{account_id}", headers=headers).json()["account"]
+    return Decimal(str(account["balance"])), Decimal(str(account["available_balance"]))
+
+
+def test_authorization_holds_funds_and_counts_spend(auth_headers):
+    """Test an approved authorization and its merchant fields."""
+    headers = auth_headers()
+    card_id, account_id = _card(headers)
+
+    response = client.post(f"/api/v1/cards/{card_id}/authorize", json={
+        "amount": "25.50", "merchant_name": "Corner Cafe", "merchant_category": "5814"
+    }, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["account_id"], body["amount"], body["daily_spent"]) == (account_id, "25.50", "25.50")
+    assert _balances(headers, account_id) == (Decimal("1000.00"), Decimal("974.50"))
+
+    db = SessionLocal()
+    try:
+        transaction = db.query(Transaction).filter(Transaction.transaction_id == body["transaction_id"]).one()
+        assert (transaction.status.value, transaction.merchant_name, transaction.merchant_category) == (
+            "pending", "Corner Cafe", "5814"
+        )
+    finally:
+        db.close()
+
+    # The cardholder can neither capture nor release the hold; the network (here an operator) settles it
+    holds = client.get(f"/api/v1/holds/account/{account_id}", headers=headers).json()["holds"]
+    assert [(hold["id"], hold["card_id"]) for hold in holds] == [(body["hold_id"], card_id)]
+    for action in ("capture", "release"):
+        response = client.post(f"/api/v1/holds/{body['hold_id']}/{action}", headers=headers)
+        assert response.status_code == 403
+    assert _balances(headers, account_id) == (Decimal("1000.00"), Decimal("974.50"))
+
+    response = client.post(f"/api/v1/holds/{body['hold_id']}/capture", headers=auth_headers(operator=True))
+    assert response.status_code == 200
+    assert _balances(headers, account_id) == (Decimal("974.50"), Decimal("974.50"))
+
+
+def test_authorization_enforces_limits_and_channels(auth_headers):
+    """Test the daily limit counter and the channel flags."""
+    headers = auth_headers()
+    card_id, account_id = _card(headers, daily_limit="100.00", is_international_enabled=False)
+
+    assert client.post(f"/api/v1/cards/{card_id}/authorize", json={"amount": "60.00"}, headers=headers).status_code == 200
+    response = client.post(f"/api/v1/cards/{card_id}/authorize", json={"amount": "50.00"}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Daily card limit exceeded"
+
+    response = client.post(f"/api/v1/cards/{card_id}/authorize", json={
+        "amount": "10.00", "is_international": True
+    }, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "International transactions are disabled for this card"
+
+    # Declines leave the counters and the balance untouched
+    assert client.post(f"/api/v1/cards/{card_id}/authorize", json={"amount": "40.00"}, headers=headers).status_code == 200
+    assert _balances(headers, account_id) == (Decimal("1000.00"), Decimal("900.00"))
+
+    # The counters reset when the day rolls over
+    db = SessionLocal()
+    try:
+        result = authorize_card(db, card_id, Decimal("90.00"), now=datetime.now() + timedelta(days=1))
+        assert result.daily_spent == Decimal("90.00")
+    finally:
+        db.close()
+
+
+def test_authorization_declines_unusable_cards(auth_headers):
+    """Test blocked cards, missing funds and other users' cards."""
+    headers = auth_headers()
+    card_id, account_id = _card(headers, deposit="20.00")
+
+    response = client.post(f"/api/v1/cards/{card_id}/authorize", json={"amount": "30.00"}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Insufficient funds"
+    db = SessionLocal()
+    try:
+        assert db.get(Card, card_id).daily_spent == Decimal("0.00")
+    finally:
+        db.close()
+
+    client.patch(f"/api/v1/cards/{card_id}/status", json={"status": "blocked"}, headers=headers)
+    response = client.post(f"/api/v1/cards/{card_id}/authorize", json={"amount": "5.00"}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Card is blocked"
+
+    response = client.post(f"/api/v1/cards/{card_id}/authorize", json={"amount": "5.00"}, headers=auth_headers())
+    assert response.status_code == 404
+
+
+def test_credit_limit_and_unused_holds_return_spend(auth_headers):
+    """Test the credit limit, and counters given back by release, partial capture and expiry."""
+    headers = auth_headers()
+    operator = auth_headers(operator=True)
+    card_id, _ = _card(headers, card_type="credit", credit_limit="100.00")
+
+    def spent():
+        db = SessionLocal()
+        try:
+            card = db.get(Card, card_id)
+            return card.daily_spent, card.monthly_spent
+        finally:
+            db.close()
+
+    def authorize(amount):
+        return client.post(f"/api/v1/cards/{card_id}/authorize", json={"amount": amount}, headers=headers)
+
+    first = authorize("80.00").json()
+    response = authorize("30.00")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Credit limit exceeded"
+
+    client.post(f"/api/v1/holds/{first['hold_id']}/release", headers=operator)
+    assert spent() == (Decimal("0.00"), Decimal("0.00"))
+
+    second = authorize("60.00").json()
+    client.post(f"/api/v1/holds/{second['hold_id']}/capture", json={"amount": "45.00"}, headers=operator)
+    assert spent() == (Decimal("45.00"), Decimal("45.00"))
+
+    authorize("50.00")
+    db = SessionLocal()
+    try:
+        expire_holds(db, now=datetime.now() + timedelta(days=30))
+    finally:
+        db.close()
+    assert spent() == (Decimal("45.00"), Decimal("45.00"))
@@ -0,0 +1,93 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.core.card_network import (
+    APPROVED, FORMAT_ERROR, INSUFFICIENT_FUNDS, INVALID_CARD, LENGTH, NOT_PERMITTED, REQUEST,
+    AuthorizationMessage, CardNetworkListener, authorize_message, decode_request, decode_response, encode_request
+)
+from app.models import Hold
+
+client = TestClient(app)
+
+
+def _funded_card(headers, deposit, **options):
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    client.post("/api/v1/transactions/", json={
+        "account_id": account["id"], "transaction_type": "deposit", "amount": deposit
+    }, headers=headers)
+    card = client.post("/api/v1/cards/", json={
+        "account_id": account["id"], "card_type": "debit", **options
+    }, headers=headers).json()
+    return card["id"]
+
+
+async def _exchange(frames):
+    """Send raw frames to a fresh listener and collect the responses by trace number."""
+    listener = CardNetworkListener("127.0.0.1", 0, workers=2)
+    await listener.start()
+    try:
+        reader, writer = await asyncio.open_connection("127.0.0.1", listener.bound_port)
+        writer.write(b"".join(frames))
+        responses = {}
+        for _ in frames:
+            (length,) = LENGTH.unpack(await reader.readexactly(LENGTH.size))
+            trace, code, hold_id = decode_response(await reader.readexactly(length))
+            responses[trace] = (code, hold_id)
+        writer.close()
+        return responses
+    finally:
+        await listener.close()
+
+
+def test_request_round_trip():
+    """Test encoding and decoding of authorization requests."""
+    message = AuthorizationMessage(7, 42, 1999, True, False, "5814", "Corner Café")
+    frame = encode_request(message)
+    assert LENGTH.unpack_from(frame)[0] == len(frame) - LENGTH.size
+    assert decode_request(frame[LENGTH.size:]) == message
+
+
+def test_listener_authorizes_pipelined_messages(auth_headers):
+    """Test approvals and declines answered over one connection."""
+    card_id = _funded_card(auth_headers(), "50.00", is_contactless_enabled=False)
+    responses = asyncio.run(_exchange([
+        encode_request(AuthorizationMessage(1, card_id, 2000, merchant_category="5411", merchant_name="Grocery Mart")),
+        encode_request(AuthorizationMessage(2, card_id, 2000, contactless=True)),
+        encode_request(AuthorizationMessage(3, 10 ** 12, 100)),
+        LENGTH.pack(3) + b"\x01\x00\x00",
+    ]))
+
+    code, hold_id = responses[1]
+    assert code == APPROVED
+    db = SessionLocal()
+    try:
+        hold = db.get(Hold, hold_id)
+        assert (str(hold.amount), hold.status.value) == ("20.00", "active")
+    finally:
+        db.close()
+    assert responses[2] == (NOT_PERMITTED, 0)
+    assert responses[3] == (INVALID_CARD, 0)
+    assert responses[0] == (FORMAT_ERROR, 0)
+
+    responses = asyncio.run(_exchange([encode_request(AuthorizationMessage(4, card_id, 4000))]))
+    assert responses[4] == (INSUFFICIENT_FUNDS, 0)
+
+
+def test_invalid_messages_are_format_errors(auth_headers):
+    """Test that a zero amount or an oversized merchant name is refused like the API refuses it."""
+    card_id = _funded_card(auth_headers(), "50.00")
+    assert authorize_message(AuthorizationMessage(1, card_id, 0)) == (FORMAT_ERROR, 0)
+    assert authorize_message(AuthorizationMessage(2, card_id, 100, merchant_name="x" * 101)) == (FORMAT_ERROR, 0)
+
+    long_name = REQUEST.pack(1, 3, card_id, 100, 0, b"5411") + b"x" * 101
+    responses = asyncio.run(_exchange([
+        encode_request(AuthorizationMessage(4, card_id, 0)),
+        LENGTH.pack(len(long_name)) + long_name,
+    ]))
+    assert responses == {4: (FORMAT_ERROR, 0), 3: (FORMAT_ERROR, 0)}
+    db = SessionLocal()
+    try:
+        assert db.query(Hold).filter(Hold.card_id == card_id).count() == 0
+    finally:
+        db.close()
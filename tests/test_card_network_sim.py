@@ -0,0 +1,24 @@
+import asyncio
+import pytest
+from app.core.card_network import AuthorizationMessage
+from benchmarks.card_network_sim import Stats, run_connection
+
+
+def test_dropped_connection_fails_instead_of_hanging():
+    """Test that the simulator surfaces a listener closing the connection mid-run."""
+    async def drop(reader, writer):
+        await reader.read(1)
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(drop, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        messages = (AuthorizationMessage(trace, 1, 100) for trace in range(1000))
+        try:
+            await asyncio.wait_for(run_connection("127.0.0.1", port, messages, 4, Stats(), lambda trace: None), 5)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
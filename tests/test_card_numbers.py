@@ -0,0 +1,77 @@
+import random
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.database import SessionLocal
+from app.core.card_numbers import CardNumberAllocator, card_number_allocator, is_luhn_valid, luhn_check_digit
+from app.models import CardType, CardNumberSequence
+
+client = TestClient(app)
+
+
+def _bin(digits=8):
+    """A BIN no other test uses."""
+    return "9" + "".join(random.choice("0123456789") for _ in range(digits - 1))
+
+
+def test_luhn():
+    """Test the check digit against known numbers."""
+    assert luhn_check_digit("7992739871") == "3"
+    assert is_luhn_valid("4111111111111111")
+    assert not is_luhn_valid("4111111111111112")
+
+
+def test_workers_reserve_disjoint_blocks():
+    """Test that allocators sharing a BIN never issue the same number."""
+    bin_ = _bin()
+    ranges = {"debit": [bin_]}
+    first, second = CardNumberAllocator(ranges, block_size=3), CardNumberAllocator(ranges, block_size=3)
+
+    numbers = [first.allocate(CardType.DEBIT), second.allocate(CardType.DEBIT)] + first.allocate_many(CardType.DEBIT, 4)
+    assert len(set(numbers)) == 6
+    assert all(len(number) == 16 and number.startswith(bin_) and is_luhn_valid(number) for number in numbers)
+    # first: [0, 3) then its bulk request reserves [6, 9) for the rest; second: [3, 6)
+    assert [int(number[8:15]) for number in numbers] == [0, 3, 1, 2, 6, 7]
+
+    db = SessionLocal()
+    try:
+        assert db.get(CardNumberSequence, bin_).next_value == 9
+    finally:
+        db.close()
+
+
+def test_exhausted_bin_moves_to_next_range():
+    """Test falling over to the next BIN and failing once all are used."""
+    small, spare = _bin(14), _bin(14)  # Ten numbers each
+    allocator = CardNumberAllocator({"prepaid": [small, spare]}, block_size=4)
+    numbers = allocator.allocate_many(CardType.PREPAID, 15)
+    assert [number[:14] for number in numbers] == [small] * 10 + [spare] * 5
+    with pytest.raises(HTTPException) as exc_info:
+        allocator.allocate_many(CardType.PREPAID, 6)
+    assert exc_info.value.status_code == 503
+
+
+def test_issued_cards_use_allocator(monkeypatch, auth_headers):
+    """Test issued cards get Luhn-valid numbers and a new sequence starts after existing ones."""
+    bin_ = _bin(6)
+    monkeypatch.setattr(settings, "card_bin_ranges", {"debit": [bin_]})
+    card_number_allocator.reset()
+    headers = auth_headers()
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+
+    card = client.post("/api/v1/cards/", json={"account_id": account["id"], "card_type": "debit"}, headers=headers).json()
+    assert card["card_number"] == bin_ + "000000000" + luhn_check_digit(bin_ + "000000000")
+
+    # A lost sequence row is rebuilt from the highest number issued under the BIN
+    db = SessionLocal()
+    try:
+        db.delete(db.get(CardNumberSequence, bin_))
+        db.commit()
+    finally:
+        db.close()
+    card_number_allocator.reset()
+    card = client.post("/api/v1/cards/", json={"account_id": account["id"], "card_type": "debit"}, headers=headers).json()
+    assert card["card_number"][:15] == bin_ + "000000001"
+    card_number_allocator.reset()
@@ -0,0 +1,118 @@
+import sqlite3
+import threading
+from decimal import Decimal
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from app.main import app
+from app.core.concurrency import AccountLocks, AccountBusyError, retry_on_busy
+
+
+class _Session:
+    def __init__(self):
+        self.rollbacks = 0
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def _busy_error():
+    return OperationalError("UPDATE accounts", {}, sqlite3.OperationalError("database is locked"))
+
+
+def test_opposite_transfers_do_not_deadlock():
+    """Test that locks taken in either argument order are acquired consistently."""
+    locks = AccountLocks()
+    balances = {1: 0, 2: 0}
+
+    def worker(source, target):
+        for _ in range(500):
+            with locks.hold(source, target, timeout=5):
+                balances[source] -= 1
+                balances[target] += 1
+
+    threads = [threading.Thread(target=worker, args=pair) for pair in ((1, 2), (2, 1)) * 2]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert not any(thread.is_alive() for thread in threads)
+    assert balances == {1: 0, 2: 0}
+    # Entries are released once nobody holds them
+    assert len(locks) == 0
+
+
+def test_lock_timeout():
+    """Test that a held account lock times out other writers."""
+    locks = AccountLocks()
+    with locks.hold(7):
+        waiter = []
+        thread = threading.Thread(target=lambda: waiter.append(_try_hold(locks, 7)))
+        thread.start()
+        thread.join()
+    assert waiter == [False]
+
+
+def _try_hold(locks, account_id):
+    try:
+        with locks.hold(account_id, timeout=0.05):
+            return True
+    except AccountBusyError:
+        return False
+
+
+def test_retry_on_busy_backs_off_and_succeeds():
+    """Test that SQLITE_BUSY is retried after rolling back the session."""
+    session = _Session()
+    calls = []
+
+    def unit_of_work():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _busy_error()
+        return "done"
+
+    assert retry_on_busy(session, "test", unit_of_work, attempts=3, base_delay=0.001) == "done"
+    assert session.rollbacks == 2
+
+
+def test_retry_on_busy_is_bounded():
+    """Test that retries stop after the configured attempts."""
+    session = _Session()
+
+    def always_busy():
+        raise _busy_error()
+
+    with pytest.raises(OperationalError):
+        retry_on_busy(session, "test", always_busy, attempts=2, base_delay=0.001)
+    assert session.rollbacks == 2
+
+
+def test_busy_error_after_commit_is_not_retried(monkeypatch, auth_headers):
+    """Test that a busy error after the commit never posts the deposit twice."""
+    client = TestClient(app, raise_server_exceptions=False)
+    headers = auth_headers()
+    account_id = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()["id"]
+
+    refresh = Session.refresh
+    failures = []
+
+    def busy_once(self, instance, *args, **kwargs):
+        if not failures:
+            failures.append(instance)
+            raise _busy_error()
+        return refresh(self, instance, *args, **kwargs)
+
+    monkeypatch.setattr(Session, "refresh", busy_once)
+    response = client.post("/api/v1/transactions/", json={
+        "account_id": account_id, "transaction_type": "deposit", "amount": "100.00"
+    }, headers=headers)
+    monkeypatch.setattr(Session, "refresh", refresh)
+
+    assert failures and response.status_code == 500
+    account = client.get(f"/api/v1/accounts/{account_id}", headers=headers).json()["account"]
+    assert Decimal(str(account["balance"])) == Decimal("100.00")
+    listed = client.get(f"/api/v1/transactions/account/{account_id}", headers=headers).json()
+    assert listed["total_count"] == 1
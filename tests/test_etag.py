@@ -0,0 +1,38 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_account_list_not_modified_until_mutation(auth_headers):
+    """Test that GET /accounts/ answers 304 until an account changes."""
+    headers = auth_headers()
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+
+    first = client.get("/api/v1/accounts/", headers=headers)
+    etag = first.headers["etag"]
+    cached = client.get("/api/v1/accounts/", headers={**headers, "If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.headers["etag"] == etag
+
+    client.post("/api/v1/transactions/", json={
+        "account_id": account["id"], "transaction_type": "deposit", "amount": 25.0
+    }, headers=headers)
+    fresh = client.get("/api/v1/accounts/", headers={**headers, "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != etag
+    assert fresh.json()["accounts"][0]["balance"] == "25.00"
+
+
+def test_card_list_etag_tracks_card_changes(auth_headers):
+    """Test that issuing a card invalidates the card list ETag."""
+    headers = auth_headers()
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+
+    etag = client.get("/api/v1/cards/", headers=headers).headers["etag"]
+    assert client.get("/api/v1/cards/", headers={**headers, "If-None-Match": etag}).status_code == 304
+
+    client.post("/api/v1/cards/", json={"account_id": account["id"], "card_type": "debit"}, headers=headers)
+    response = client.get("/api/v1/cards/", headers={**headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["total_count"] == 1
@@ -0,0 +1,90 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.events import EventBroker, broker
+
+client = TestClient(app)
+
+
+def test_drop_oldest_marks_subscriber_lagged():
+    """Test that a full queue drops the oldest event and requests a resync."""
+    async def scenario():
+        events = EventBroker(queue_size=2, policy="drop_oldest")
+        subscriber = events.subscribe(1)
+        for n in range(3):
+            events.publish(1, "balance", {"n": n})
+        received = await subscriber.get(timeout=0.1)
+        return subscriber, [event.data["n"] for event in received]
+
+    subscriber, received = asyncio.run(scenario())
+    assert received == [1, 2]
+    assert subscriber.lagged
+
+
+def test_disconnect_policy_closes_slow_subscriber():
+    """Test that the disconnect policy closes a subscriber that falls behind."""
+    async def scenario():
+        events = EventBroker(queue_size=1, policy="disconnect")
+        subscriber = events.subscribe(1)
+        events.publish(1, "balance", {})
+        events.publish(1, "balance", {})
+        return subscriber, await subscriber.get(timeout=0.1)
+
+    subscriber, received = asyncio.run(scenario())
+    assert subscriber.closed
+    assert received == []
+
+
+def test_replay_after_last_event_id():
+    """Test Last-Event-ID resumption and detection of unreplayable gaps."""
+    events = EventBroker(replay_size=3)
+    published = [events.publish(1, "transaction", {"n": n}) for n in range(5)]
+    events.publish(2, "transaction", {})
+
+    assert [e.id for e in events.replay(1, published[3].event_id)] == [published[4].id]
+    # Ids already evicted from the window, or not issued yet
+    assert events.replay(1, published[0].event_id) is None
+    assert events.replay(1, f"{events.epoch}-{10 ** 9}") is None
+    assert events.replay(1, "garbage") is None
+
+
+def test_ids_from_before_a_restart_resync():
+    """Test that ids of another broker epoch are never matched against new ids."""
+    before = EventBroker()
+    stale = [before.publish(1, "balance", {}) for _ in range(3)][0]
+    after = EventBroker()
+    after.epoch = before.epoch + "0"
+    for _ in range(3):
+        after.publish(1, "balance", {})
+    assert after.replay(1, stale.event_id) is None
+
+
+def test_replay_histories_are_capped():
+    """Test that the least recently active user's history is dropped first."""
+    events = EventBroker(replay_users=2)
+    first = events.publish(1, "balance", {})
+    events.publish(2, "balance", {})
+    events.publish(1, "balance", {})
+    third = events.publish(3, "balance", {})
+
+    assert set(events._history) == {1, 3}
+    # User 2's events are gone, so resuming before them asks for a resync
+    assert events.replay(2, first.event_id) is None
+    assert events.replay(2, third.event_id) == []
+    assert [e.id for e in events.replay(1, first.event_id)] == [first.id + 2]
+
+
+def test_committed_transactions_are_published(auth_headers):
+    """Test that create_transaction publishes the transaction and new balance."""
+    headers = auth_headers()
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    user_id = account["user_id"]
+
+    client.post("/api/v1/transactions/", json={
+        "account_id": account["id"], "transaction_type": "deposit", "amount": 40.0
+    }, headers=headers)
+
+    replayed = broker.replay(user_id, f"{broker.epoch}-0")
+    assert [e.type for e in replayed] == ["transaction", "balance"]
+    assert replayed[1].data["balance"] == "40.00"
+    assert replayed[1].encode().startswith(b"id: %s-%d\nevent: balance\ndata: {" % (broker.epoch.encode(), replayed[1].id))
@@ -0,0 +1,108 @@
+import uuid
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.database import SessionLocal
+from app.core import outbox
+from app.models import OutboxEvent, ConsumerOffset
+
+client = TestClient(app)
+
+FEED_HEADERS = {"X-Feed-Token": "test-feed-token"}
+
+
+def test_feed_requires_token(monkeypatch):
+    """Test that the feed is disabled without a token and rejects a wrong one."""
+    monkeypatch.setattr(settings, "change_feed_token", None)
+    assert client.get("/api/v1/feed/transactions", headers=FEED_HEADERS).status_code == 404
+
+    monkeypatch.setattr(settings, "change_feed_token", "test-feed-token")
+    assert client.get("/api/v1/feed/transactions", headers={"X-Feed-Token": "wrong"}).status_code == 401
+
+
+def test_money_movements_flow_through_feed(monkeypatch, auth_headers):
+    """Test that committed transactions appear in order and consumers resume from offsets."""
+    monkeypatch.setattr(settings, "change_feed_token", "test-feed-token")
+    consumer = f"consumer-{uuid.uuid4().hex[:8]}"
+    db = SessionLocal()
+    try:
+        start = outbox.latest_offset(db)
+    finally:
+        db.close()
+    client.put(f"/api/v1/feed/consumers/{consumer}/offset", json={"offset": start}, headers=FEED_HEADERS)
+
+    headers = auth_headers()
+    source = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    target = client.post("/api/v1/accounts/", json={"account_type": "savings"}, headers=headers).json()
+    client.post("/api/v1/transactions/", json={
+        "account_id": source["id"], "transaction_type": "deposit", "amount": 100.0
+    }, headers=headers)
+    client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": source["id"], "to_account_id": target["id"], "amount": 30.0
+    }, headers=headers)
+
+    batch = client.get(f"/api/v1/feed/transactions?consumer={consumer}&limit=1", headers=FEED_HEADERS).json()
+    assert batch["has_more"]
+    assert batch["events"][0]["payload"]["transaction_type"] == "deposit"
+    assert batch["events"][0]["payload"]["amount"] == "100.00"
+
+    response = client.put(
+        f"/api/v1/feed/consumers/{consumer}/offset",
+        json={"offset": batch["next_offset"]}, headers=FEED_HEADERS
+    )
+    assert response.json()["lag"] == 1
+
+    batch = client.get(f"/api/v1/feed/transactions?consumer={consumer}", headers=FEED_HEADERS).json()
+    assert [e["payload"]["transaction_type"] for e in batch["events"]] == ["transfer"]
+    assert batch["events"][0]["offset"] > start
+    assert not batch["has_more"]
+
+    beyond = client.put(
+        f"/api/v1/feed/consumers/{consumer}/offset",
+        json={"offset": batch["latest_offset"] + 10}, headers=FEED_HEADERS
+    )
+    assert beyond.status_code == 400
+
+
+def test_pruning_keeps_recent_events_and_refuses_pruned_offsets(monkeypatch, auth_headers):
+    """Test that pruning waits for the retention period and pruned offsets return 410."""
+    monkeypatch.setattr(settings, "change_feed_token", "test-feed-token")
+    monkeypatch.setattr(settings, "outbox_prune_consumed", True)
+    headers = auth_headers()
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    for _ in range(2):
+        client.post("/api/v1/transactions/", json={
+            "account_id": account["id"], "transaction_type": "deposit", "amount": 10.0
+        }, headers=headers)
+
+    db = SessionLocal()
+    try:
+        latest = outbox.latest_offset(db)
+        oldest = outbox.oldest_offset(db)
+        # With every consumer past the new events, they are kept until they are old enough
+        db.query(ConsumerOffset).update({ConsumerOffset.offset: latest})
+        outbox.commit_offset(db, f"pruner-{uuid.uuid4().hex[:8]}", latest)
+        db.flush()
+        assert outbox.prune_consumed(db, datetime.utcnow() - timedelta(hours=settings.outbox_retention_hours)) == 0
+        assert outbox.prune_consumed(db, datetime.utcnow() + timedelta(hours=1)) >= 2
+        assert outbox.oldest_offset(db) == latest
+        db.rollback()
+
+        # Once events are gone, offsets before them are no longer complete
+        db.query(OutboxEvent).filter(OutboxEvent.id < latest).delete()
+        assert outbox.is_retained(db, latest - 1)
+        assert not outbox.is_retained(db, latest - 2)
+        db.rollback()
+        assert outbox.oldest_offset(db) == oldest
+    finally:
+        db.close()
+
+    monkeypatch.setattr(outbox, "oldest_offset", lambda db: latest)
+    consumer = f"late-{uuid.uuid4().hex[:8]}"
+    response = client.get(f"/api/v1/feed/transactions?consumer={consumer}", headers=FEED_HEADERS)
+    assert response.status_code == 410
+    response = client.put(f"/api/v1/feed/consumers/{consumer}/offset", json={"offset": latest - 2}, headers=FEED_HEADERS)
+    assert response.status_code == 410
+    response = client.get(f"/api/v1/feed/transactions?after={latest - 1}", headers=FEED_HEADERS)
+    assert [event["offset"] for event in response.json()["events"]] == [latest]
@@ -0,0 +1,128 @@
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.core.fees import compile_rules, compute_fee
+from app.core.standing_orders import run_due_standing_orders
+from app.jobs.load_fee_rules import replace_rules
+from app.models import AccountType, TransactionType
+
+client = TestClient(app)
+
+
+def _account(headers, currency, deposit=None, account_type="checking"):
+    account = client.post("/api/v1/accounts/", json={"account_type": account_type, "currency": currency}, headers=headers).json()
+    if deposit:
+        client.post("/api/v1/transactions/", json={
+            "account_id": account["id"], "transaction_type": "deposit", "amount": deposit
+        }, headers=headers)
+    return account["id"]
+
+
+def _balance(headers, account_id):
+    return Decimal(str(client.get(f"/api/v1/accounts/{account_id}", headers=headers).json()["account"]["balance"]))
+
+
+def _replace(rules):
+    db = SessionLocal()
+    try:
+        return replace_rules(db, rules)
+    finally:
+        db.close()
+
+
+def _rule(rule_id, account_type=None, transaction_type=None, currency=None, min_amount="0",
+          flat_fee="0", percent_fee="0", max_fee=None):
+    return SimpleNamespace(
+        id=rule_id, account_type=account_type, transaction_type=transaction_type, currency=currency,
+        min_amount=Decimal(min_amount), flat_fee=Decimal(flat_fee), percent_fee=Decimal(percent_fee),
+        max_fee=Decimal(max_fee) if max_fee else None
+    )
+
+
+def test_compile_resolves_specificity_and_tiers():
+    """Test that the most specific rule wins per tier and wildcards are expanded."""
+    table = compile_rules([
+        _rule(1, transaction_type=TransactionType.WITHDRAWAL, flat_fee="1.00"),
+        _rule(2, account_type=AccountType.SAVINGS, transaction_type=TransactionType.WITHDRAWAL, flat_fee="3.00"),
+        _rule(3, transaction_type=TransactionType.WITHDRAWAL, currency="EUR", min_amount="500", percent_fee="1", max_fee="8.00"),
+    ])
+    bounds, specs = table[(AccountType.CHECKING, TransactionType.WITHDRAWAL, None)]
+    assert bounds == [Decimal("0")] and specs[0].rule_id == 1
+    bounds, specs = table[(AccountType.CHECKING, TransactionType.WITHDRAWAL, "EUR")]
+    assert bounds == [Decimal("0"), Decimal("500")] and [s.rule_id for s in specs] == [1, 3]
+    # The account-type rule is as specific as the currency tier, so the higher tier still applies above 500
+    bounds, specs = table[(AccountType.SAVINGS, TransactionType.WITHDRAWAL, "EUR")]
+    assert [s.rule_id for s in specs] == [2, 3]
+    assert (AccountType.CHECKING, TransactionType.DEPOSIT, None) not in table
+
+    assert compute_fee(specs[1], Decimal("600.00")) == Decimal("6.00")
+    assert compute_fee(specs[1], Decimal("2000.00")) == Decimal("8.00")
+    assert compute_fee(_rule(4, flat_fee="0.10", percent_fee="0.125"), Decimal("10.00")) == Decimal("0.11")
+
+
+def test_withdrawal_and_transfer_post_fee_transactions(auth_headers):
+    """Test that fees are charged from the compiled schedule as separate FEE transactions."""
+    currency = "F" + uuid.uuid4().hex[:2].upper()
+    assert _replace([
+        {"transaction_type": "withdrawal", "currency": currency, "flat_fee": "1.50"},
+        {"transaction_type": "transfer", "currency": currency, "min_amount": "100", "percent_fee": "1", "max_fee": "5.00"},
+    ])["loaded"] == 2
+    headers = auth_headers()
+    source = _account(headers, currency, "200.00")
+    destination = _account(headers, currency)
+
+    response = client.post("/api/v1/transactions/", json={
+        "account_id": source, "transaction_type": "withdrawal", "amount": "20.00"
+    }, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["fee"] == "1.50"
+    assert _balance(headers, source) == Decimal("178.50")
+
+    # Below the transfer tier there is no fee
+    client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": source, "to_account_id": destination, "amount": "50.00"
+    }, headers=headers)
+    response = client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": source, "to_account_id": destination, "amount": "120.00"
+    }, headers=headers)
+    assert response.status_code == 201
+    assert response.json()["from_transaction"]["fee"] == "1.20"
+    assert _balance(headers, source) == Decimal("7.30")
+    assert _balance(headers, destination) == Decimal("170.00")
+
+    history = client.get(f"/api/v1/transactions/account/{source}", headers=headers).json()["transactions"]
+    fees = [t for t in history if t["transaction_type"] == "fee"]
+    assert sorted(t["amount"] for t in fees) == ["1.20", "1.50"]
+
+    # The fee counts towards the funds check
+    response = client.post("/api/v1/transactions/", json={
+        "account_id": source, "transaction_type": "withdrawal", "amount": "6.00"
+    }, headers=headers)
+    assert response.status_code == 400
+    assert _balance(headers, source) == Decimal("7.30")
+
+
+def test_standing_order_runs_are_charged(auth_headers):
+    """Test that standing order transfers post their fee in the batch commit."""
+    currency = "G" + uuid.uuid4().hex[:2].upper()
+    _replace([{"transaction_type": "transfer", "currency": currency, "flat_fee": "0.25"}])
+    headers = auth_headers()
+    source = _account(headers, currency, "10.00")
+    destination = _account(headers, currency)
+    now = datetime.now()
+    client.post("/api/v1/standing-orders/", json={
+        "from_account_id": source, "to_account_id": destination, "amount": "4.00",
+        "frequency": "daily", "start_at": (now - timedelta(minutes=1)).isoformat()
+    }, headers=headers)
+
+    db = SessionLocal()
+    try:
+        assert run_due_standing_orders(db, now=now)["executed"] >= 1
+    finally:
+        db.close()
+    assert _balance(headers, source) == Decimal("5.75")
+    assert _balance(headers, destination) == Decimal("4.00")
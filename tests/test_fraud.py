@@ -0,0 +1,138 @@
+import time
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.core import fraud
+from app.core.fraud import (
+    FraudEngine, SlidingWindow, TransactionContext, VelocityRule, WindowStore,
+    APPROVE, REVIEW, DECLINE,
+)
+from app.models import OutboxEvent
+
+client = TestClient(app)
+
+
+def _setup_account(headers, deposit=None):
+    account = client.post("/api/v1/accounts/", json={
+        "account_type": "checking", "initial_deposit": deposit or 0
+    }, headers=headers).json()
+    return account["id"]
+
+
+def test_sliding_window_expires_old_buckets():
+    """Test that events fall out of the window as time advances."""
+    window = SlidingWindow(window_seconds=60, buckets=6)
+    window.add(1000.0, 500)
+    window.add(1030.0, 250)
+    assert window.totals(1030.0) == (2, 750)
+    assert window.totals(1065.0) == (1, 250)
+    assert window.totals(1200.0) == (0, 0)
+
+
+def test_window_store_evicts_idle_and_excess_keys():
+    """Test that memory stays bounded by idle eviction and the key limit."""
+    store = WindowStore(max_keys=3, idle_seconds=100)
+    for subject in range(5):
+        store.get(("rule", subject), 60, now=1000.0)
+    assert len(store) == 3
+    store.get(("rule", "fresh"), 60, now=1200.0)
+    assert len(store) == 1
+
+
+def test_engine_combines_rule_decisions():
+    """Test that the strictest decision wins and every triggered rule is reported."""
+    engine = FraudEngine()
+    engine.register(VelocityRule("count", ("withdrawal",), lambda ctx: ctx.account_id, 60, max_count=2))
+    engine.register(VelocityRule("amount", ("withdrawal",), lambda ctx: ctx.account_id, 60,
+                                 max_amount=10000, action=REVIEW))
+    for _ in range(2):
+        ctx = TransactionContext("withdrawal", 1, "40.00", now=100.0)
+        assert engine.evaluate(ctx).decision == APPROVE
+        engine.record(ctx)
+
+    decision = engine.evaluate(TransactionContext("withdrawal", 1, "40.00", now=110.0))
+    assert decision.decision == DECLINE
+    assert decision.rules == ["count", "amount"]
+    # Other accounts and later windows are unaffected
+    assert engine.evaluate(TransactionContext("withdrawal", 2, "40.00", now=110.0)).decision == APPROVE
+    assert engine.evaluate(TransactionContext("withdrawal", 1, "40.00", now=200.0)).decision == APPROVE
+
+
+def test_default_rules_evaluate_quickly():
+    """Test that evaluating the built-in rules stays well under a millisecond."""
+    engine = fraud.build_engine()
+    contexts = [TransactionContext("transfer", n % 50, "10.00", destination_account_id=n % 7) for n in range(2000)]
+    started = time.perf_counter()
+    for ctx in contexts:
+        engine.evaluate(ctx)
+        engine.record(ctx)
+    assert (time.perf_counter() - started) / len(contexts) < 0.001
+
+
+def test_withdrawal_burst_is_declined(monkeypatch, auth_headers):
+    """Test that create_transaction rejects a burst before committing it."""
+    engine = FraudEngine()
+    engine.register(VelocityRule("withdrawal.velocity", ("withdrawal",), lambda ctx: ctx.account_id, 600, max_count=2))
+    monkeypatch.setattr(fraud, "fraud_engine", engine)
+    headers = auth_headers()
+    account_id = _setup_account(headers, deposit=100)
+
+    statuses = [
+        client.post("/api/v1/transactions/", json={
+            "account_id": account_id, "transaction_type": "withdrawal", "amount": 5
+        }, headers=headers).status_code
+        for _ in range(3)
+    ]
+    assert statuses == [201, 201, 403]
+    account = client.get("/api/v1/accounts/", headers=headers).json()["accounts"][0]
+    assert account["balance"] == "90.00"
+
+
+def test_large_transfer_to_new_payee_is_declined(auth_headers):
+    """Test that a large first transfer to another customer is declined."""
+    headers = auth_headers()
+    source = _setup_account(headers, deposit=9000)
+    target = _setup_account(auth_headers())
+
+    response = client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": source, "to_account_id": target, "amount": 6000
+    }, headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"]["rules"] == ["transfer.large_new_payee"]
+
+    small = client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": source, "to_account_id": target, "amount": 50
+    }, headers=headers)
+    assert small.status_code == 201
+
+
+def test_review_decision_is_returned_and_flagged(monkeypatch, auth_headers):
+    """Test that a transfer sent to review carries the decision and leaves a fraud.review event."""
+    engine = FraudEngine()
+    engine.register(VelocityRule(
+        "destination.fan_in", ("transfer",), lambda ctx: ctx.destination_account_id, 600,
+        max_count=1, action=REVIEW
+    ))
+    monkeypatch.setattr(fraud, "fraud_engine", engine)
+    target = _setup_account(auth_headers())
+
+    responses = []
+    for _ in range(2):
+        headers = auth_headers()
+        source = _setup_account(headers, deposit=100)
+        responses.append(client.post("/api/v1/transactions/transfer", json={
+            "from_account_id": source, "to_account_id": target, "amount": 10
+        }, headers=headers).json()["from_transaction"])
+    assert [(r["fraud_decision"], r["fraud_rules"]) for r in responses] == [
+        (APPROVE, []), (REVIEW, ["destination.fan_in"])
+    ]
+
+    db = SessionLocal()
+    try:
+        flagged = db.query(OutboxEvent.aggregate_id).filter(
+            OutboxEvent.event_type == "fraud.review",
+            OutboxEvent.aggregate_id.in_([r["transaction_id"] for r in responses])
+        ).all()
+        assert flagged == [(responses[1]["transaction_id"],)]
+    finally:
+        db.close()
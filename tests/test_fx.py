@@ -0,0 +1,142 @@
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.core.fx import FxRateCache
+from app.jobs.load_fx_rates import load_rates
+from app.models import StandingOrder, Transaction
+from app.core.standing_orders import run_due_standing_orders
+
+client = TestClient(app)
+
+# Test-only currency codes, so rates loaded here cannot affect other tests
+BASE = datetime(2024, 1, 1)
+
+
+def _account(headers, currency, deposit=None):
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking", "currency": currency}, headers=headers).json()
+    if deposit:
+        client.post("/api/v1/transactions/", json={
+            "account_id": account["id"], "transaction_type": "deposit", "amount": deposit
+        }, headers=headers)
+    return account["id"]
+
+
+def _balance(headers, account_id):
+    return client.get(f"/api/v1/accounts/{account_id}", headers=headers).json()["account"]["balance"]
+
+
+def _load(rows):
+    db = SessionLocal()
+    try:
+        return load_rates(db, rows)
+    finally:
+        db.close()
+
+
+def _pair():
+    """A fresh pair of three-letter test currencies."""
+    code = uuid.uuid4().hex[:4].upper()
+    return "X" + code[:2], "Y" + code[2:]
+
+
+def test_rate_lookup_by_effective_time_and_inverse():
+    """Test that the cache picks the rate in force and inverts the opposite pair."""
+    base, quote = _pair()
+    assert _load([
+        (base, quote, "2.00000000", BASE),
+        (base, quote, "4.00000000", BASE + timedelta(days=1)),
+    ]) == {"loaded": 2, "skipped": 0}
+    assert _load([(base, quote, "2.00000000", BASE)]) == {"loaded": 0, "skipped": 1}
+
+    cache = FxRateCache(refresh_seconds=3600)
+    db = SessionLocal()
+    try:
+        assert cache.rate(db, base, quote, BASE - timedelta(seconds=1)) is None
+        assert cache.rate(db, base, quote, BASE + timedelta(hours=1)) == Decimal("2")
+        assert cache.rate(db, base, quote, BASE + timedelta(days=2)) == Decimal("4")
+        assert cache.rate(db, quote, base, BASE + timedelta(days=2)) == Decimal("0.25")
+        assert cache.rate(db, base, base) == Decimal(1)
+
+        # Within refresh_seconds a write made elsewhere is only seen after invalidate
+        _load([(base, quote, "8.00000000", BASE + timedelta(days=3))])
+        assert cache.rate(db, base, quote, BASE + timedelta(days=4)) == Decimal("4")
+        cache.invalidate()
+        assert cache.rate(db, base, quote, BASE + timedelta(days=4)) == Decimal("8")
+    finally:
+        db.close()
+
+
+def test_cross_currency_transfer_records_both_amounts(auth_headers):
+    """Test that a transfer credits the converted amount and records the rate."""
+    base, quote = _pair()
+    _load([(base, quote, "0.90000000", BASE)])
+    headers = auth_headers()
+    source = _account(headers, base, "100.00")
+    destination = _account(headers, quote)
+
+    response = client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": source, "to_account_id": destination, "amount": "10.05"
+    }, headers=headers)
+    assert response.status_code == 201
+    transfer = response.json()["from_transaction"]
+    assert transfer["amount"] == "10.05"
+    assert transfer["currency"] == base
+    assert transfer["exchange_rate"] == "0.90000000"
+    assert transfer["converted_amount"] == "9.05"  # 9.045 rounded half up
+    assert transfer["converted_currency"] == quote
+    assert Decimal(str(_balance(headers, source))) == Decimal("89.95")
+    assert Decimal(str(_balance(headers, destination))) == Decimal("9.05")
+
+    rates = client.get("/api/v1/fx/rates", headers=headers).json()["rates"]
+    assert {"base_currency": base, "quote_currency": quote, "rate": "0.90000000",
+            "effective_at": BASE.isoformat()} in rates
+
+
+def test_transfer_without_rate_is_rejected(auth_headers):
+    """Test that a transfer between unquoted currencies fails and moves nothing."""
+    base, quote = _pair()
+    headers = auth_headers()
+    source = _account(headers, base, "50.00")
+    destination = _account(headers, quote)
+
+    response = client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": source, "to_account_id": destination, "amount": "10.00"
+    }, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == f"No exchange rate available for {base}/{quote}"
+    assert Decimal(str(_balance(headers, source))) == Decimal("50.00")
+
+
+def test_standing_order_converts_and_records_missing_rate(auth_headers):
+    """Test conversion in standing order runs, and a missing rate as a failed run."""
+    base, quote = _pair()
+    other = _pair()[1]
+    _load([(base, quote, "2.00000000", BASE)])
+    headers = auth_headers()
+    source = _account(headers, base, "100.00")
+    destination = _account(headers, quote)
+    unquoted = _account(headers, other)
+
+    now = datetime.now()
+    ids = []
+    for to_account in (destination, unquoted):
+        ids.append(client.post("/api/v1/standing-orders/", json={
+            "from_account_id": source, "to_account_id": to_account, "amount": "5.00",
+            "frequency": "daily", "start_at": (now - timedelta(minutes=1)).isoformat()
+        }, headers=headers).json()["id"])
+
+    db = SessionLocal()
+    try:
+        run_due_standing_orders(db, now=now)
+        converted, failed = (db.query(StandingOrder).filter(StandingOrder.id == i).one() for i in ids)
+        transaction = db.query(Transaction).filter(Transaction.transaction_id == converted.last_transaction_id).one()
+        assert transaction.converted_amount == Decimal("10.00")
+        assert transaction.converted_currency == quote
+        assert failed.last_failure_reason == f"No exchange rate available for {base}/{other}"
+    finally:
+        db.close()
+    assert Decimal(str(_balance(headers, destination))) == Decimal("10.00")
+    assert Decimal(str(_balance(headers, source))) == Decimal("95.00")
@@ -0,0 +1,45 @@
+from sqlalchemy import create_engine, text
+from benchmarks.generate_data import parse_args, generate
+
+
+def _dataset(path, seed=7):
+    url = f"sqlite:///{path}"
+    generate(parse_args([
+        "--database-url", url, "--users", "50", "--transactions", "3000",
+        "--chunk-size", "700", "--workers", "1", "--seed", str(seed), "--days", "90",
+    ]))
+    return create_engine(url)
+
+
+def test_generated_balances_match_transactions(tmp_path):
+    """Test that stored balances equal the signed sum of generated transactions."""
+    engine = _dataset(tmp_path / "synthetic.db")
+    with engine.connect() as conn:
+        count = conn.execute(text("SELECT COUNT(*) FROM transactions")).scalar()
+        assert count >= 3000
+        mismatches = conn.execute(text("""
+            SELECT a.id FROM accounts a
+            LEFT JOIN (
+                SELECT account_id AS id,
+                       SUM(CASE WHEN transaction_type = 'DEPOSIT' THEN amount ELSE -amount END) AS net
+                FROM transactions GROUP BY account_id
+            ) own ON own.id = a.id
+            LEFT JOIN (
+                SELECT to_account_id AS id, SUM(amount) AS net
+                FROM transactions WHERE to_account_id IS NOT NULL GROUP BY to_account_id
+            ) incoming ON incoming.id = a.id
+            WHERE ABS(a.balance - COALESCE(own.net, 0) - COALESCE(incoming.net, 0)) > 0.005
+        """)).fetchall()
+        assert mismatches == []
+        assert conn.execute(text("SELECT MIN(balance) FROM accounts")).scalar() >= 0
+        assert conn.execute(text("SELECT COUNT(*) FROM statements")).scalar() > 0
+
+
+def test_generation_is_deterministic(tmp_path):
+    """Test that the same seed produces the same transactions."""
+    query = text("SELECT transaction_id, account_id, amount FROM transactions ORDER BY transaction_id LIMIT 200")
+    with _dataset(tmp_path / "a.db").connect() as conn:
+        first = conn.execute(query).fetchall()
+    with _dataset(tmp_path / "b.db").connect() as conn:
+        second = conn.execute(query).fetchall()
+    assert first == second
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.core.holds import expire_holds
+from app.models import Hold, Transaction
+
+client = TestClient(app)
+
+
+def _account(headers, deposit):
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    client.post("/api/v1/transactions/", json={
+        "account_id": account["id"], "transaction_type": "deposit", "amount": deposit
+    }, headers=headers)
+    return account["id"]
+
+
+def _balances(headers, account_id):
+    account = client.get(f"/api/v1/accounts/{account_id}", headers=headers).json()["account"]
+    return Decimal(str(account["balance"])), Decimal(str(account["available_balance"]))
+
+
+def _transaction_status(transaction_id):
+    db = SessionLocal()
+    try:
+        return db.query(Transaction).filter(Transaction.transaction_id == transaction_id).one().status.value
+    finally:
+        db.close()
+
+
+def test_hold_reserves_available_balance_only(auth_headers):
+    """Test creation, partial capture and release of holds."""
+    headers = auth_headers()
+    account_id = _account(headers, "100.00")
+
+    response = client.post("/api/v1/holds/", json={"account_id": account_id, "amount": "60.00"}, headers=headers)
+    assert response.status_code == 201
+    hold = response.json()
+    assert hold["status"] == "active"
+    assert _balances(headers, account_id) == (Decimal("100.00"), Decimal("40.00"))
+    assert _transaction_status(hold["transaction_id"]) == "pending"
+
+    # The reservation and the funds check are one conditional update
+    response = client.post("/api/v1/holds/", json={"account_id": account_id, "amount": "50.00"}, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Insufficient funds"
+    response = client.post("/api/v1/transactions/", json={
+        "account_id": account_id, "transaction_type": "withdrawal", "amount": "50.00"
+    }, headers=headers)
+    assert response.status_code == 400
+
+    response = client.post(f"/api/v1/holds/{hold['id']}/capture", json={"amount": "45.50"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["status"] == "captured"
+    assert _balances(headers, account_id) == (Decimal("54.50"), Decimal("54.50"))
+    assert _transaction_status(hold["transaction_id"]) == "completed"
+    assert client.post(f"/api/v1/holds/{hold['id']}/release", headers=headers).status_code == 400
+
+    second = client.post("/api/v1/holds/", json={"account_id": account_id, "amount": "20.00"}, headers=headers).json()
+    response = client.post(f"/api/v1/holds/{second['id']}/capture", json={"amount": "25.00"}, headers=headers)
+    assert response.status_code == 400
+    response = client.post(f"/api/v1/holds/{second['id']}/release", headers=headers)
+    assert response.json()["status"] == "released"
+    assert _balances(headers, account_id) == (Decimal("54.50"), Decimal("54.50"))
+    assert _transaction_status(second["transaction_id"]) == "cancelled"
+
+    listed = client.get(f"/api/v1/holds/account/{account_id}?hold_status=released", headers=headers).json()
+    assert [h["id"] for h in listed["holds"]] == [second["id"]]
+
+
+def test_other_users_cannot_hold_or_capture(auth_headers):
+    """Test that holds are limited to the user's own accounts."""
+    owner, other = auth_headers(), auth_headers()
+    account_id = _account(owner, "10.00")
+    response = client.post("/api/v1/holds/", json={"account_id": account_id, "amount": "5.00"}, headers=other)
+    assert response.status_code == 404
+    hold = client.post("/api/v1/holds/", json={"account_id": account_id, "amount": "5.00"}, headers=owner).json()
+    assert client.post(f"/api/v1/holds/{hold['id']}/capture", headers=other).status_code == 404
+
+
+def test_holds_are_debits_only(auth_headers):
+    """Test that a hold cannot be placed for a credit transaction type."""
+    headers = auth_headers()
+    account_id = _account(headers, "100.00")
+    for transaction_type in ("deposit", "interest", "refund", "fee", "transfer"):
+        response = client.post("/api/v1/holds/", json={
+            "account_id": account_id, "amount": "30.00", "transaction_type": transaction_type
+        }, headers=headers)
+        assert response.status_code == 422
+    response = client.post("/api/v1/holds/", json={
+        "account_id": account_id, "amount": "30.00", "transaction_type": "withdrawal"
+    }, headers=headers)
+    assert response.status_code == 201
+    assert _balances(headers, account_id) == (Decimal("100.00"), Decimal("70.00"))
+
+
+def test_sweeper_expires_stale_holds_in_batches(auth_headers):
+    """Test that expired holds are released in batches and fresh ones are kept."""
+    headers = auth_headers()
+    account_id = _account(headers, "100.00")
+    stale = [
+        client.post("/api/v1/holds/", json={"account_id": account_id, "amount": "10.00", "expires_in_minutes": 1}, headers=headers).json()
+        for _ in range(3)
+    ]
+    fresh = client.post("/api/v1/holds/", json={"account_id": account_id, "amount": "10.00"}, headers=headers).json()
+    assert _balances(headers, account_id) == (Decimal("100.00"), Decimal("60.00"))
+
+    db = SessionLocal()
+    try:
+        result = expire_holds(db, now=datetime.now() + timedelta(minutes=2), batch_size=2)
+        assert result["expired"] >= 3
+        statuses = dict(db.query(Hold.id, Hold.status).filter(Hold.id.in_([h["id"] for h in stale + [fresh]])))
+    finally:
+        db.close()
+    assert {statuses[h["id"]].value for h in stale} == {"expired"}
+    assert statuses[fresh["id"]].value == "active"
+    assert _transaction_status(stale[0]["transaction_id"]) == "cancelled"
+    assert _balances(headers, account_id) == (Decimal("100.00"), Decimal("90.00"))
+
+    response = client.post(f"/api/v1/holds/{stale[0]['id']}/capture", headers=headers)
+    assert response.status_code == 400
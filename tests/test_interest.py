@@ -0,0 +1,81 @@
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.core import interest
+from app.core.interest import RateTiers, accrue, accrue_interest, compile_tiers
+from app.models import AccountType, Transaction, TransactionType
+
+client = TestClient(app)
+
+
+def _account(headers, account_type, deposit):
+    account = client.post("/api/v1/accounts/", json={"account_type": account_type}, headers=headers).json()
+    client.post("/api/v1/transactions/", json={
+        "account_id": account["id"], "transaction_type": "deposit", "amount": deposit
+    }, headers=headers)
+    return account["id"]
+
+
+def _balance(headers, account_id):
+    return Decimal(str(client.get(f"/api/v1/accounts/{account_id}", headers=headers).json()["account"]["balance"]))
+
+
+def _accrue(day):
+    db = SessionLocal()
+    try:
+        return accrue_interest(db, day=day, chunk_size=50, now=datetime.combine(day, datetime.min.time()))
+    finally:
+        db.close()
+
+
+def test_tiered_fixed_point_accrual(monkeypatch):
+    """Test marginal tiers and the carried remainder, with and without numpy."""
+    tiers = compile_tiers({"savings": [("10000", "1.00"), ("0", "0.50")]})[AccountType.SAVINGS]
+    assert tiers == RateTiers([0, 1000000], [5000, 10000])
+
+    # $20,000: $10,000 at 0.5% plus $10,000 at 1% = $150 a year
+    balances, carried, days = [2000000, 10000, -500, 2000000], [0, 0, 0, 999999], [1, 1, 1, 2]
+    expected_posted = [41, 0, 0, 83]
+    expected_remainders = [95890, 136986, 0, 191779]
+    posted, remainders = accrue(balances, carried, days, tiers, 365)
+    assert list(posted) == expected_posted and list(remainders) == expected_remainders
+
+    monkeypatch.setattr(interest, "np", None)
+    assert accrue(balances, carried, days, tiers, 365) == (expected_posted, expected_remainders)
+
+
+def test_daily_job_posts_interest_once_per_day(auth_headers):
+    """Test that the job posts INTEREST transactions, is idempotent and feeds statements."""
+    headers = auth_headers()
+    savings = _account(headers, "savings", "20000.00")
+    checking = _account(headers, "checking", "20000.00")
+    day = date.today() + timedelta(days=1)
+
+    result = _accrue(day)
+    assert result["posted"] >= 1
+    assert _balance(headers, savings) == Decimal("20000.41")
+    assert _balance(headers, checking) == Decimal("20000.00")
+    assert _accrue(day)["accounts"] == 0
+
+    # A missed day is caught up, including the carried remainder
+    _accrue(day + timedelta(days=2))
+    assert _balance(headers, savings) == Decimal("20001.23")
+
+    db = SessionLocal()
+    try:
+        amounts = [t.amount for t in db.query(Transaction).filter(
+            Transaction.account_id == savings, Transaction.transaction_type == TransactionType.INTEREST
+        ).order_by(Transaction.id)]
+    finally:
+        db.close()
+    assert amounts == [Decimal("0.41"), Decimal("0.82")]
+
+    statement = client.post("/api/v1/statements/generate", json={
+        "account_id": savings,
+        "start_date": date.today().isoformat(),
+        "end_date": (day + timedelta(days=3)).isoformat()
+    }, headers=headers)
+    assert statement.status_code == 201
+    assert statement.json()["total_interest"] == "1.23"
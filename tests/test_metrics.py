@@ -0,0 +1,86 @@
+import json
+import os
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.main import app
+from app.core.metrics import MetricsRegistry, instrument_engine
+
+client = TestClient(app)
+
+
+def test_metrics_endpoint_uses_route_templates():
+    """Test that requests are labelled by route template, not raw path."""
+    client.get("/health")
+    client.get("/api/v1/accounts/12345")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+
+    body = response.text
+    assert 'http_requests_total{method="GET",route="/health",status="200"}' in body
+    assert 'route="/api/v1/accounts/{account_id}"' in body
+    assert "/api/v1/accounts/12345" not in body
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert "http_requests_in_progress" in body
+
+
+def test_histogram_rendering():
+    """Test histogram buckets are cumulative and include +Inf, sum and count."""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    child = histogram.labels("/a")
+    child.observe(0.05)
+    child.observe(0.5)
+    child.observe(2.0)
+
+    body = registry.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in body
+    assert 'latency_seconds_bucket{route="/a",le="1"} 2' in body
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in body
+    assert 'latency_seconds_count{route="/a"} 3' in body
+
+
+def test_multiprocess_aggregation(tmp_path):
+    """Test that snapshots written by other workers are summed into a scrape."""
+    registry = MetricsRegistry(multiproc_dir=str(tmp_path))
+    counter = registry.counter("requests_total", "Requests.", ("route",))
+    gauge = registry.gauge("in_progress", "In progress.")
+    counter.labels("/a").inc(2)
+    gauge.labels().inc()
+
+    # Snapshot of a worker that has exited (pid that cannot exist)
+    other = {
+        "pid": 2 ** 22 + 1,
+        "families": {
+            "requests_total": {
+                "type": "counter", "help": "Requests.", "labelnames": ["route"],
+                "series": [[["/a"], 3.0], [["/b"], 1.0]],
+            },
+            "in_progress": {
+                "type": "gauge", "help": "In progress.", "labelnames": [],
+                "series": [[[], 5.0]],
+            },
+        },
+    }
+    with open(os.path.join(tmp_path, "metrics_other.json"), "w") as f:
+        json.dump(other, f)
+
+    body = registry.render()
+    assert 'requests_total{route="/a"} 5' in body
+    assert 'requests_total{route="/b"} 1' in body
+    # Gauges of dead workers are ignored
+    assert "in_progress 1" in body
+
+
+def test_failed_statements_do_not_leak_start_times():
+    """Test that a statement that raises leaves no start time on the connection."""
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM missing_table"))
+        conn.execute(text("SELECT 1"))
+        assert conn.info["metrics_query_start"] == []
@@ -0,0 +1,70 @@
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+from app.main import app
+from app.core.profiler import current_profile, instrument_engine, normalize_statement, SQLProfile
+
+client = TestClient(app)
+
+
+def test_normalize_statement():
+    """Test that literals, IN-lists and whitespace are normalized away."""
+    shape = normalize_statement("SELECT *  FROM accounts\n WHERE id IN (?, ?, ?) AND name = 'x' LIMIT 10")
+    assert shape == "SELECT * FROM accounts WHERE id IN (?) AND name = ? LIMIT ?"
+
+
+def test_repeated_shapes_flagged_as_n_plus_one():
+    """Test that repeated statement shapes are reported as N+1 suspects."""
+    profile = SQLProfile("GET", "/x")
+    for account_id in range(5):
+        profile.record(f"SELECT * FROM transactions WHERE account_id = {account_id}", 0.001)
+    profile.record("SELECT * FROM accounts WHERE id = ?", 0.001)
+
+    report = profile.to_dict()
+    assert report["query_count"] == 6
+    assert len(report["n_plus_one_suspects"]) == 1
+    assert report["n_plus_one_suspects"][0]["count"] == 5
+
+
+def test_profile_header_and_debug_endpoint(auth_headers):
+    """Test the opt-in header returns a summary that the debug endpoint can expand."""
+    headers = auth_headers()
+
+    response = client.get(
+        "/api/v1/accounts/",
+        headers={**headers, "X-SQL-Profile": "1"}
+    )
+    assert response.status_code == 200
+    summary = response.headers["x-sql-profile"]
+    assert "queries=" in summary
+
+    profile_id = summary.split(";")[0].split("=")[1]
+    # Profiles expose every user's SQL, so only operators may read them
+    assert client.get(f"/api/v1/debug/sql-profiles/{profile_id}").status_code == 401
+    assert client.get("/api/v1/debug/sql-profiles", headers=headers).status_code == 403
+
+    detail = client.get(f"/api/v1/debug/sql-profiles/{profile_id}", headers=auth_headers(operator=True))
+    assert detail.status_code == 200
+    assert detail.json()["route"] == "/api/v1/accounts/"
+    assert detail.json()["query_count"] >= 2
+
+    # Requests without the header are not profiled
+    response = client.get("/api/v1/accounts/", headers=headers)
+    assert "x-sql-profile" not in response.headers
+
+
+def test_failed_statements_do_not_leak_start_times():
+    """Test that a statement that raises leaves no start time on the connection."""
+    engine = create_engine("sqlite://")
+    instrument_engine(engine)
+    profile = SQLProfile("GET", "/x")
+    token = current_profile.set(profile)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 1"))
+            assert conn.info["profiler_query_start"] == []
+    finally:
+        current_profile.reset(token)
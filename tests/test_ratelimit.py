@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from app.config import settings
+from app.core.ratelimit import (
+    MemoryBucketStore, RateLimitMiddleware, RouteLimit, SQLiteBucketStore, parse_rate
+)
+from app.core.security import create_access_token
+
+
+@pytest.fixture(autouse=True)
+def enable_rate_limits(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+
+
+def _client(store=None, default=None):
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login():
+        return {"ok": True}
+
+    @app.get("/accounts/{account_id}")
+    async def account(account_id: int):
+        return {"id": account_id}
+
+    @app.get("/free")
+    async def free():
+        return {"ok": True}
+
+    app.add_middleware(
+        RateLimitMiddleware,
+        limits={"POST /login": "2/minute", "GET /accounts/{account_id}": "3/hour"},
+        default=default,
+        store=store or MemoryBucketStore()
+    )
+    return TestClient(app)
+
+
+def test_parse_rate():
+    """Test rate strings with named and numeric periods."""
+    assert parse_rate("10/minute") == (10, 10 / 60)
+    assert parse_rate("5/2") == (5, 2.5)
+
+
+def test_route_templates_match_concrete_paths():
+    """Test that {param} segments match exactly one path segment."""
+    limit = RouteLimit("GET /accounts/{account_id}", "1/second")
+    assert limit.matches("GET", "/accounts/42")
+    assert not limit.matches("POST", "/accounts/42")
+    assert not limit.matches("GET", "/accounts/42/history")
+
+
+def test_limit_exceeded_returns_429_with_retry_after():
+    """Test that requests past the bucket capacity are rejected with Retry-After."""
+    client = _client()
+    for remaining in ("1", "0"):
+        response = client.post("/login")
+        assert response.status_code == 200
+        assert response.headers["x-ratelimit-remaining"] == remaining
+
+    response = client.post("/login")
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Rate limit exceeded"}
+    assert 1 <= int(response.headers["retry-after"]) <= 30
+
+    # Routes without a limit are not affected
+    assert client.get("/free").status_code == 200
+
+
+def test_authenticated_users_have_separate_buckets():
+    """Test that buckets are keyed by the token's user rather than the client address."""
+    client = _client()
+    alice = {"Authorization": f"Bearer {create_access_token({'sub': '1'})}"}
+    bob = {"Authorization": f"Bearer {create_access_token({'sub': '2'})}"}
+
+    for _ in range(3):
+        assert client.get("/accounts/1", headers=alice).status_code == 200
+    assert client.get("/accounts/2", headers=alice).status_code == 429
+    assert client.get("/accounts/1", headers=bob).status_code == 200
+    # Anonymous requests fall back to the client address
+    assert client.get("/accounts/1").status_code == 200
+
+
+def test_default_limit_applies_to_other_routes():
+    client = _client(default="1/minute")
+    assert client.get("/free").status_code == 200
+    assert client.get("/free").status_code == 429
+
+
+def test_disabled_rate_limiting(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    client = _client()
+    for _ in range(5):
+        assert client.post("/login").status_code == 200
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    """Test that two workers pointing at one SQLite file share their buckets."""
+    path = str(tmp_path / "ratelimit.db")
+    first, second = _client(SQLiteBucketStore(path)), _client(SQLiteBucketStore(path))
+    assert first.post("/login").status_code == 200
+    assert second.post("/login").status_code == 200
+    assert first.post("/login").status_code == 429
+    assert second.post("/login").status_code == 429
+
+
+def test_blocking_store_runs_off_the_event_loop(tmp_path):
+    """Test that a store waiting on its SQLite lock doesn't block the event loop thread."""
+    on_loop = []
+
+    class RecordingStore(SQLiteBucketStore):
+        def take(self, key, capacity, rate):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return super().take(key, capacity, rate)
+
+    client = _client(RecordingStore(str(tmp_path / "ratelimit.db")))
+    assert client.post("/login").status_code == 200
+    assert on_loop == [False]
@@ -0,0 +1,158 @@
+import csv
+import json
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Account, ArchiveManifest, Transaction, TransactionType, TransactionStatus
+from app.core.archive import archive_transactions
+from app.core.reconcile import reconcile_balances
+
+client = TestClient(app)
+
+
+def _create_account(headers, deposit=None):
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    if deposit:
+        client.post("/api/v1/transactions/", json={
+            "account_id": account["id"], "transaction_type": "deposit", "amount": deposit
+        }, headers=headers)
+    return account["id"]
+
+
+def _report(path):
+    with open(path, newline="") as f:
+        return {int(row["account_id"]): row for row in csv.DictReader(f)}
+
+
+def _adjust_balance(account_id, delta):
+    db = SessionLocal()
+    account = db.query(Account).filter(Account.id == account_id).one()
+    account.balance += Decimal(delta)
+    db.commit()
+    db.close()
+
+
+def test_reconciliation_reports_drift_and_resumes(tmp_path, auth_headers):
+    """Test full, resumed and incremental runs against a deliberately drifted balance."""
+    headers = auth_headers()
+    source = _create_account(headers, deposit=100.0)
+    target = _create_account(headers)
+    client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": source, "to_account_id": target, "amount": 40.0
+    }, headers=headers)
+    drifted = _create_account(headers, deposit=10.0)
+    _adjust_balance(drifted, "5.00")
+
+    report, checkpoint = tmp_path / "report.csv", tmp_path / "checkpoint.json"
+    result = reconcile_balances(settings.database_url, str(report), str(checkpoint),
+                                workers=2, partition_size=2)
+    assert result["mode"] == "full"
+    assert result["accounts_checked"] >= 3
+    rows = _report(report)
+    assert rows[drifted]["stored_balance"] == "15.00"
+    assert rows[drifted]["ledger_balance"] == "10.00"
+    assert rows[drifted]["difference"] == "5.00"
+    assert source not in rows and target not in rows
+
+    # An interrupted run only redoes the partitions it had not completed
+    state = json.loads(checkpoint.read_text())
+    partition = drifted - (drifted - 1) % 2
+    state.update(finished=False, accounts_checked=0, discrepancies=0,
+                 completed_partitions=[key for key in state["completed_partitions"] if key != partition])
+    checkpoint.write_text(json.dumps(state))
+    resumed = reconcile_balances(settings.database_url, str(report), str(checkpoint), partition_size=2)
+    assert resumed["resumed"] is True
+    assert resumed["accounts_checked"] <= 2
+    assert resumed["discrepancies"] == 1
+
+    # Incremental runs only look at accounts touched since the last watermark
+    client.post("/api/v1/transactions/", json={
+        "account_id": target, "transaction_type": "deposit", "amount": 1.0
+    }, headers=headers)
+    incremental = reconcile_balances(settings.database_url, str(report), str(checkpoint),
+                                     partition_size=2, incremental=True)
+    assert incremental["mode"] == "incremental"
+    assert incremental["accounts_checked"] == 1
+    assert incremental["discrepancies"] == 0
+    assert _report(report) == {}
+
+    _adjust_balance(drifted, "-5.00")
+
+
+def test_initial_deposit_is_posted(tmp_path, auth_headers):
+    """Test that an account opened with a deposit reconciles with no other activity."""
+    headers = auth_headers()
+    account_id = client.post("/api/v1/accounts/", json={
+        "account_type": "savings", "initial_deposit": 250
+    }, headers=headers).json()["id"]
+    report = tmp_path / "report.csv"
+    reconcile_balances(settings.database_url, str(report), str(tmp_path / "checkpoint.json"))
+    assert account_id not in _report(report)
+
+
+def test_incremental_run_rechecks_updated_transactions(tmp_path, auth_headers):
+    """Test that a status change on a row older than the watermark is reconciled."""
+    headers = auth_headers()
+    account_id = _create_account(headers, deposit=10.0)
+    report, checkpoint = tmp_path / "report.csv", tmp_path / "checkpoint.json"
+    reconcile_balances(settings.database_url, str(report), str(checkpoint))
+    assert account_id not in _report(report)
+
+    # The ledger changes with no new transaction id: the deposit no longer counts
+    db = SessionLocal()
+    deposit = db.query(Transaction).filter(Transaction.account_id == account_id).one()
+    deposit.status = TransactionStatus.CANCELLED
+    db.commit()
+
+    try:
+        incremental = reconcile_balances(settings.database_url, str(report), str(checkpoint), incremental=True)
+        assert incremental["mode"] == "incremental"
+        assert _report(report)[account_id]["difference"] == "10.00"
+    finally:
+        deposit.status = TransactionStatus.COMPLETED
+        db.commit()
+        db.close()
+
+
+def test_reconciliation_includes_archived_transactions(tmp_path, monkeypatch, auth_headers):
+    """Test that archived transactions still count towards the ledger balance."""
+    monkeypatch.setattr(settings, "archive_dir", str(tmp_path))
+    headers = auth_headers()
+    account_id = _create_account(headers)
+    old = datetime.now() - timedelta(days=500)
+
+    db = SessionLocal()
+    for day in (1, 2):
+        db.add(Transaction(
+            transaction_id=f"TXN{uuid.uuid4().hex[:12].upper()}",
+            transaction_type=TransactionType.DEPOSIT,
+            status=TransactionStatus.COMPLETED,
+            amount=Decimal("12.50"),
+            currency="USD",
+            fee=Decimal("0.00"),
+            account_id=account_id,
+            created_at=old + timedelta(days=day)
+        ))
+    db.query(Account).filter(Account.id == account_id).update({Account.balance: Decimal("25.00")})
+    db.commit()
+    db.close()
+
+    client.post("/api/v1/statements/generate", json={
+        "account_id": account_id,
+        "start_date": old.date().isoformat(),
+        "end_date": (old + timedelta(days=10)).date().isoformat()
+    }, headers=headers)
+    assert archive_transactions(SessionLocal(), horizon_days=365)["archived"] >= 2
+
+    report = tmp_path / "report.csv"
+    reconcile_balances(settings.database_url, str(report))
+    assert account_id not in _report(report)
+
+    db = SessionLocal()
+    db.query(ArchiveManifest).filter(ArchiveManifest.account_id == account_id).delete()
+    db.commit()
+    db.close()
@@ -0,0 +1,138 @@
+import uuid
+from datetime import date, timedelta
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.models import Transaction
+
+client = TestClient(app)
+
+
+def _account(headers, deposit):
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    deposited = client.post("/api/v1/transactions/", json={
+        "account_id": account["id"], "transaction_type": "deposit", "amount": deposit
+    }, headers=headers).json()
+    return account["id"], deposited["transaction_id"]
+
+
+def _balance(headers, account_id):
+    account = client.get(f"/api/v1/accounts/{account_id}", headers=headers).json()["account"]
+    return Decimal(str(account["balance"])), Decimal(str(account["available_balance"]))
+
+
+def _statuses(transaction_ids):
+    db = SessionLocal()
+    try:
+        rows = db.query(Transaction).filter(Transaction.transaction_id.in_(transaction_ids)).all()
+        return {row.transaction_id: row.status.value for row in rows}
+    finally:
+        db.close()
+
+
+def test_reversal_requires_operator(auth_headers):
+    """Test that customers cannot reverse their own transactions."""
+    headers = auth_headers()
+    _, deposit_id = _account(headers, "100.00")
+    response = client.post(f"/api/v1/transactions/{deposit_id}/reverse", headers=headers)
+    assert response.status_code == 403
+    assert response.json()["detail"] == "Operator access required"
+
+
+def test_bulk_reversal_restores_balances(auth_headers):
+    """Test one call reversing withdrawals and transfers with compensating entries."""
+    headers = auth_headers(operator=True)
+    source, _ = _account(headers, "500.00")
+    destination, _ = _account(headers, "50.00")
+    withdrawals = [
+        client.post("/api/v1/transactions/", json={
+            "account_id": source, "transaction_type": "withdrawal", "amount": "40.00"
+        }, headers=headers).json()["transaction_id"]
+        for _ in range(3)
+    ]
+    transfer = client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": source, "to_account_id": destination, "amount": "100.00"
+    }, headers=headers).json()["from_transaction"]["transaction_id"]
+    assert _balance(headers, source) == (Decimal("280.00"), Decimal("280.00"))
+
+    originals = withdrawals + [transfer]
+    response = client.post("/api/v1/transactions/reverse", json={
+        "transaction_ids": originals, "reason": "Duplicate postings"
+    }, headers=headers)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reversed_count"] == 4
+    assert [entry["reference"] for entry in body["reversals"]] == originals
+    assert [entry["transaction_type"] for entry in body["reversals"]] == ["refund"] * 3 + ["transfer"]
+    reverse_transfer = body["reversals"][-1]
+    assert (reverse_transfer["from_account_id"], reverse_transfer["to_account_id"]) == (destination, source)
+
+    assert _balance(headers, source) == (Decimal("500.00"), Decimal("500.00"))
+    assert _balance(headers, destination) == (Decimal("50.00"), Decimal("50.00"))
+    entries = [entry["transaction_id"] for entry in body["reversals"]]
+    assert set(_statuses(originals + entries).values()) == {"reversed"}
+
+    # A reversed transaction cannot be reversed again
+    response = client.post(f"/api/v1/transactions/{transfer}/reverse", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"]["errors"][0]["transaction_id"] == transfer
+
+
+def test_bulk_reversal_is_all_or_nothing(auth_headers):
+    """Test that one bad transaction id rejects the whole batch."""
+    headers = auth_headers(operator=True)
+    account_id, deposit_id = _account(headers, "100.00")
+    missing = f"TXN-{uuid.uuid4().hex[:12].upper()}"
+
+    response = client.post("/api/v1/transactions/reverse", json={
+        "transaction_ids": [deposit_id, missing]
+    }, headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"]["errors"] == [{"transaction_id": missing, "reason": "Transaction not found"}]
+    assert _balance(headers, account_id) == (Decimal("100.00"), Decimal("100.00"))
+    assert _statuses([deposit_id]) == {deposit_id: "completed"}
+
+    response = client.post(f"/api/v1/transactions/{missing}/reverse", headers=headers)
+    assert response.status_code == 404
+
+
+def test_reversing_spent_deposit_needs_funds(auth_headers):
+    """Test that a credit is only reversed when the money is still there."""
+    headers = auth_headers(operator=True)
+    account_id, deposit_id = _account(headers, "100.00")
+    client.post("/api/v1/transactions/", json={
+        "account_id": account_id, "transaction_type": "withdrawal", "amount": "70.00"
+    }, headers=headers)
+
+    response = client.post(f"/api/v1/transactions/{deposit_id}/reverse", headers=headers)
+    assert response.status_code == 400
+    assert response.json()["detail"]["errors"][0]["reason"] == "Insufficient funds to reverse"
+
+    client.post("/api/v1/transactions/", json={
+        "account_id": account_id, "transaction_type": "deposit", "amount": "70.00"
+    }, headers=headers)
+    response = client.post(f"/api/v1/transactions/{deposit_id}/reverse", json={"reason": "Bounced"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["reversals"][0]["transaction_type"] == "withdrawal"
+    assert _balance(headers, account_id) == (Decimal("0.00"), Decimal("0.00"))
+
+
+def test_statement_totals_count_posted_refunds(auth_headers):
+    """Test that statements include refunds and leave out pending holds."""
+    headers = auth_headers(operator=True)
+    account_id, _ = _account(headers, "100.00")
+    withdrawal = client.post("/api/v1/transactions/", json={
+        "account_id": account_id, "transaction_type": "withdrawal", "amount": "40.00"
+    }, headers=headers).json()["transaction_id"]
+    assert client.post(f"/api/v1/transactions/{withdrawal}/reverse", headers=headers).status_code == 200
+    client.post("/api/v1/holds/", json={"account_id": account_id, "amount": "10.00"}, headers=headers)
+
+    statement = client.post("/api/v1/statements/generate", json={
+        "account_id": account_id,
+        "start_date": (date.today() - timedelta(days=1)).isoformat(),
+        "end_date": (date.today() + timedelta(days=1)).isoformat()
+    }, headers=headers).json()
+    # Deposit, reversed withdrawal and its refund; the pending hold is not posted
+    assert statement["transaction_count"] == 3
+    assert (statement["total_deposits"], statement["total_withdrawals"]) == ("140.00", "40.00")
@@ -0,0 +1,67 @@
+import json
+from datetime import datetime
+from decimal import Decimal
+from app.models import (
+    Transaction, TransactionType, TransactionStatus,
+    Card, CardType, CardStatus, Statement,
+)
+from app.schemas.transaction import TransactionResponse
+from app.schemas.card import CardResponse
+from app.schemas.statement import StatementResponse
+from app.utils.serialization import (
+    FastJSONResponse, transaction_to_dict, card_to_dict, statement_to_dict,
+)
+
+CREATED = datetime(2025, 3, 4, 5, 6, 7, 890123)
+
+
+def _encoded(mapped):
+    return json.loads(FastJSONResponse(mapped).body)
+
+
+def test_transaction_mapper_matches_schema():
+    """Test that the transaction mapper produces the TransactionResponse JSON."""
+    t = Transaction(
+        id=1, transaction_id="TXN1", transaction_type=TransactionType.TRANSFER,
+        status=TransactionStatus.COMPLETED, amount=Decimal("12.50"), currency="USD",
+        fee=Decimal("0.00"), account_id=1, from_account_id=1, to_account_id=2,
+        description="Rent", reference_number="REF-1", created_at=CREATED,
+    )
+    mapped = transaction_to_dict(t)
+    expected = TransactionResponse.model_validate(mapped).model_dump(mode="json")
+    assert _encoded(mapped) == expected
+
+    t.exchange_rate, t.converted_amount, t.converted_currency = Decimal("0.91234567"), Decimal("11.40"), "EUR"
+    mapped = transaction_to_dict(t)
+    assert _encoded(mapped) == TransactionResponse.model_validate(mapped).model_dump(mode="json")
+    assert mapped["converted_amount"] == "11.40"
+
+
+def test_card_mapper_matches_schema():
+    """Test that the card mapper produces the CardResponse JSON."""
+    card = Card(
+        id=2, card_number="4000123412341234", card_type=CardType.CREDIT,
+        status=CardStatus.ACTIVE, cardholder_name="Jane Doe", expiry_month=1,
+        expiry_year=2030, is_pin_set=False, is_contactless_enabled=True,
+        is_international_enabled=False, daily_limit=Decimal("1000.00"),
+        monthly_limit=Decimal("10000.00"), credit_limit=Decimal("5000.00"),
+        user_id=1, account_id=None, created_at=CREATED,
+    )
+    mapped = card_to_dict(card)
+    expected = CardResponse.model_validate(mapped).model_dump(mode="json")
+    assert _encoded(mapped) == expected
+
+
+def test_statement_mapper_matches_schema():
+    """Test that the statement mapper produces the StatementResponse JSON."""
+    stmt = Statement(
+        id=3, statement_number="STMT-1", statement_period_start=datetime(2025, 1, 1),
+        statement_period_end=datetime(2025, 1, 31, 23, 59, 59), account_id=1,
+        opening_balance=Decimal("0.00"), closing_balance=Decimal("100.00"),
+        total_deposits=Decimal("100.00"), total_withdrawals=Decimal("0.00"),
+        total_fees=Decimal("0.00"), total_interest=Decimal("0.00"),
+        total_transactions=1, currency="USD", is_generated=True, created_at=CREATED,
+    )
+    mapped = statement_to_dict(stmt)
+    expected = StatementResponse.model_validate(mapped).model_dump(mode="json")
+    assert _encoded(mapped) == expected
@@ -0,0 +1,178 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi.testclient import TestClient
+from app.main import app
+from app.config import settings
+from app.database import SessionLocal
+from app.core.settlement import _settle_claimed, claim, settle_pending
+from app.core.standing_orders import run_due_standing_orders
+from app.models import Transaction
+
+client = TestClient(app)
+
+
+def _account(headers):
+    return client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()["id"]
+
+
+def _balances(headers, account_id):
+    account = client.get(f"/api/v1/accounts/{account_id}", headers=headers).json()["account"]
+    return Decimal(str(account["balance"])), Decimal(str(account["available_balance"]))
+
+
+def _settle(**kwargs):
+    db = SessionLocal()
+    try:
+        return settle_pending(db, **kwargs)
+    finally:
+        db.close()
+
+
+def test_deferred_transactions_settle_in_batches(monkeypatch, auth_headers):
+    """Test that pending postings only reserve funds until the worker settles them."""
+    monkeypatch.setattr(settings, "settlement_deferred", True)
+    headers = auth_headers()
+    source, destination = _account(headers), _account(headers)
+
+    deposit = client.post("/api/v1/transactions/", json={
+        "account_id": source, "transaction_type": "deposit", "amount": "100.00"
+    }, headers=headers).json()
+    assert deposit["status"] == "pending"
+    assert _balances(headers, source) == (Decimal("0.00"), Decimal("0.00"))
+    # Credits are not spendable before settlement
+    response = client.post("/api/v1/transactions/", json={
+        "account_id": source, "transaction_type": "withdrawal", "amount": "10.00"
+    }, headers=headers)
+    assert response.status_code == 400
+
+    assert _settle(batch_size=1)["settled"] >= 1
+    assert _balances(headers, source) == (Decimal("100.00"), Decimal("100.00"))
+
+    response = client.post("/api/v1/transactions/transfer", json={
+        "from_account_id": source, "to_account_id": destination, "amount": "30.00"
+    }, headers=headers)
+    assert response.json()["message"] == "Transfer accepted for settlement"
+    client.post("/api/v1/transactions/", json={
+        "account_id": source, "transaction_type": "withdrawal", "amount": "20.00"
+    }, headers=headers)
+    # Debits reserve the available balance right away
+    assert _balances(headers, source) == (Decimal("100.00"), Decimal("50.00"))
+    assert _balances(headers, destination) == (Decimal("0.00"), Decimal("0.00"))
+
+    result = _settle(batch_size=1)
+    assert result["settled"] >= 2 and result["batches"] >= 2
+    assert _balances(headers, source) == (Decimal("50.00"), Decimal("50.00"))
+    assert _balances(headers, destination) == (Decimal("30.00"), Decimal("30.00"))
+
+    db = SessionLocal()
+    try:
+        settled = db.query(Transaction).filter(Transaction.transaction_id == deposit["transaction_id"]).one()
+        assert settled.status.value == "completed"
+        assert settled.settled_at is not None and settled.lease_owner is None
+    finally:
+        db.close()
+
+
+def test_live_leases_are_not_settled_twice(monkeypatch, auth_headers):
+    """Test that claimed rows are skipped by other workers until the lease expires."""
+    monkeypatch.setattr(settings, "settlement_deferred", True)
+    headers = auth_headers()
+    account_id = _account(headers)
+    client.post("/api/v1/transactions/", json={
+        "account_id": account_id, "transaction_type": "deposit", "amount": "5.00"
+    }, headers=headers)
+
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        assert claim(db, "crashed-worker", now, 1000)
+    finally:
+        db.close()
+    assert _settle(worker="other", now=now)["settled"] == 0
+    assert _balances(headers, account_id) == (Decimal("0.00"), Decimal("0.00"))
+
+    later = now + timedelta(seconds=settings.settlement_lease_seconds + 1)
+    assert _settle(worker="other", now=later)["settled"] >= 1
+    assert _balances(headers, account_id) == (Decimal("5.00"), Decimal("5.00"))
+
+    # Pending hold transactions belong to their hold, not to settlement
+    hold = client.post("/api/v1/holds/", json={"account_id": account_id, "amount": "2.00"}, headers=headers).json()
+    _settle(worker="other", now=later)
+    db = SessionLocal()
+    try:
+        held = db.query(Transaction).filter(Transaction.transaction_id == hold["transaction_id"]).one()
+        assert held.status.value == "pending" and held.settles_at is None
+    finally:
+        db.close()
+
+
+def test_taken_over_lease_is_not_posted(monkeypatch, auth_headers):
+    """Test that a worker whose lease expired and was re-claimed posts nothing."""
+    monkeypatch.setattr(settings, "settlement_deferred", True)
+    headers = auth_headers()
+    account_id = _account(headers)
+    client.post("/api/v1/transactions/", json={
+        "account_id": account_id, "transaction_type": "deposit", "amount": "7.00"
+    }, headers=headers)
+
+    db = SessionLocal()
+    try:
+        now = datetime.now()
+        stale = [row.id for row in claim(db, "slow-worker", now, 1000) if row.account_id == account_id]
+        later = now + timedelta(seconds=settings.settlement_lease_seconds + 1)
+        taken = [row.id for row in claim(db, "other", later, 1000) if row.account_id == account_id]
+        assert stale == taken and len(stale) == 1
+
+        assert _settle_claimed(db, stale, "slow-worker", later) == 0
+        assert _balances(headers, account_id) == (Decimal("0.00"), Decimal("0.00"))
+        assert _settle_claimed(db, taken, "other", later) == 1
+    finally:
+        db.close()
+    assert _balances(headers, account_id) == (Decimal("7.00"), Decimal("7.00"))
+
+
+def test_pending_transfers_count_as_payee_history(monkeypatch, auth_headers):
+    """Test that a deferred transfer makes its destination a known payee before it settles."""
+    headers = auth_headers()
+    source = _account(headers)
+    client.post("/api/v1/transactions/", json={
+        "account_id": source, "transaction_type": "deposit", "amount": "9000.00"
+    }, headers=headers)
+    payee = _account(auth_headers())
+    monkeypatch.setattr(settings, "settlement_deferred", True)
+
+    statuses = [
+        client.post("/api/v1/transactions/transfer", json={
+            "from_account_id": source, "to_account_id": payee, "amount": amount
+        }, headers=headers).status_code
+        for amount in ("50.00", "6000.00")
+    ]
+    # The large transfer is not to a new payee: the first one is still pending
+    assert statuses == [201, 201]
+
+
+def test_standing_orders_are_deferred(monkeypatch, auth_headers):
+    """Test that standing orders only reserve funds until the settlement worker posts them."""
+    headers = auth_headers()
+    source, target = _account(headers), _account(headers)
+    client.post("/api/v1/transactions/", json={
+        "account_id": source, "transaction_type": "deposit", "amount": "100.00"
+    }, headers=headers)
+    monkeypatch.setattr(settings, "settlement_deferred", True)
+    now = datetime.now().replace(microsecond=0)
+    client.post("/api/v1/standing-orders/", json={
+        "from_account_id": source, "to_account_id": target, "amount": 60.0,
+        "frequency": "monthly", "start_at": (now - timedelta(minutes=1)).isoformat()
+    }, headers=headers)
+
+    db = SessionLocal()
+    try:
+        run_due_standing_orders(db, now=now)
+    finally:
+        db.close()
+    assert _balances(headers, source) == (Decimal("100.00"), Decimal("40.00"))
+    assert _balances(headers, target) == (Decimal("0.00"), Decimal("0.00"))
+
+    _settle(now=now + timedelta(seconds=settings.settlement_delay_seconds + 1))
+    assert _balances(headers, source) == (Decimal("40.00"), Decimal("40.00"))
+    assert _balances(headers, target) == (Decimal("60.00"), Decimal("60.00"))
@@ -0,0 +1,100 @@
+import asyncio
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core.singleflight import SINGLEFLIGHT_REQUESTS, SingleFlight
+
+client = TestClient(app)
+
+
+def test_concurrent_identical_calls_execute_once():
+    """Test that callers arriving while a call runs share its result."""
+    flight = SingleFlight("test.once")
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {"value": len(calls)}
+
+    async def burst():
+        return await asyncio.gather(*(flight.do("key", load) for _ in range(10)))
+
+    results = asyncio.run(burst())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert len(flight) == 0
+    assert SINGLEFLIGHT_REQUESTS.labels("test.once", "coalesced").value == 9
+    assert SINGLEFLIGHT_REQUESTS.labels("test.once", "executed").value == 1
+
+
+def test_different_keys_and_later_calls_execute_separately():
+    flight = SingleFlight("test.keys")
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def run():
+        await asyncio.gather(flight.do("a", load), flight.do("b", load))
+        return await flight.do("a", load)
+
+    assert asyncio.run(run()) == 3
+
+
+def test_errors_fan_out_to_all_waiters():
+    flight = SingleFlight("test.errors")
+
+    async def load():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def burst():
+        return await asyncio.gather(*(flight.do("key", load) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(burst())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
+
+
+def test_coalesced_endpoints_respond_normally(auth_headers):
+    """Test the coalesced account and statement list endpoints, including errors."""
+    headers = auth_headers()
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+
+    accounts = client.get("/api/v1/accounts/", headers=headers)
+    assert accounts.status_code == 200
+    assert [a["id"] for a in accounts.json()["accounts"]] == [account["id"]]
+
+    statements = client.get(f"/api/v1/statements/account/{account['id']}", headers=headers)
+    assert statements.status_code == 200
+    assert statements.json()["total_count"] == 0
+
+    other = auth_headers()
+    denied = client.get(f"/api/v1/statements/account/{account['id']}", headers=other)
+    assert denied.status_code == 404
+
+
+def test_statement_list_key_changes_after_generation(monkeypatch, auth_headers):
+    """Test that a list requested after generating a statement can't join an older load."""
+    from app.api import statements
+
+    keys = []
+    real = statements.coalesced_read
+
+    async def recording(flight, key, load):
+        keys.append(key)
+        return await real(flight, key, load)
+
+    monkeypatch.setattr(statements, "coalesced_read", recording)
+    headers = auth_headers()
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    client.get(f"/api/v1/statements/account/{account['id']}", headers=headers)
+    client.post("/api/v1/statements/generate", json={
+        "account_id": account["id"], "start_date": "2024-01-01", "end_date": "2024-01-31"
+    }, headers=headers)
+    listed = client.get(f"/api/v1/statements/account/{account['id']}", headers=headers).json()
+
+    assert listed["total_count"] == 1
+    assert keys[0] != keys[1]
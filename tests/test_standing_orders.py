@@ -0,0 +1,122 @@
+from datetime import datetime, timedelta
+from fastapi.testclient import TestClient
+from app.main import app
+from app.database import SessionLocal
+from app.models import StandingOrder, StandingOrderFrequency, Transaction
+from app.core.standing_orders import add_months, occurrence, run_due_standing_orders
+
+client = TestClient(app)
+
+
+def _account(headers, deposit=None):
+    account = client.post("/api/v1/accounts/", json={"account_type": "checking"}, headers=headers).json()
+    if deposit:
+        client.post("/api/v1/transactions/", json={
+            "account_id": account["id"], "transaction_type": "deposit", "amount": deposit
+        }, headers=headers)
+    return account["id"]
+
+
+def _balance(headers, account_id):
+    return client.get(f"/api/v1/accounts/{account_id}", headers=headers).json()["account"]["balance"]
+
+
+def _run(now):
+    db = SessionLocal()
+    try:
+        return run_due_standing_orders(db, now=now, batch_size=2)
+    finally:
+        db.close()
+
+
+def _order(order_id):
+    db = SessionLocal()
+    try:
+        return db.query(StandingOrder).filter(StandingOrder.id == order_id).one()
+    finally:
+        db.close()
+
+
+def test_monthly_schedule_does_not_drift():
+    """Test that month-end start dates clamp without drifting to earlier days."""
+    start = datetime(2024, 1, 31, 9, 0)
+    assert add_months(start, 1) == datetime(2024, 2, 29, 9, 0)
+    assert [occurrence(start, StandingOrderFrequency.MONTHLY, n).day for n in range(4)] == [31, 29, 31, 30]
+    assert occurrence(start, StandingOrderFrequency.WEEKLY, 2) == datetime(2024, 2, 14, 9, 0)
+
+
+def test_due_orders_execute_in_batches_per_source(auth_headers):
+    """Test execution, the carried per-source balance check and schedule advancement."""
+    headers = auth_headers()
+    source = _account(headers, deposit=100.0)
+    rent = _account(headers)
+    savings = _account(headers)
+    now = datetime.now().replace(microsecond=0)
+    start = now - timedelta(minutes=1)
+
+    created = [
+        client.post("/api/v1/standing-orders/", json={
+            "from_account_id": source, "to_account_id": target, "amount": amount,
+            "frequency": "monthly", "start_at": start.isoformat(), "description": "Recurring"
+        }, headers=headers).json()
+        for target, amount in ((rent, 70.0), (savings, 50.0))
+    ]
+    assert created[0]["next_run_at"] == start.isoformat()
+
+    result = _run(now)
+    assert result["executed"] >= 1 and result["failed"] >= 1
+
+    # The source only covers the first order; the second sees the reduced balance
+    assert _balance(headers, source) == "30.00"
+    assert _balance(headers, rent) == "70.00"
+    assert _balance(headers, savings) == "0.00"
+
+    paid, failed = _order(created[0]["id"]), _order(created[1]["id"])
+    assert paid.next_run_at == add_months(start, 1)
+    assert paid.run_count == 1
+    db = SessionLocal()
+    transaction = db.query(Transaction).filter(Transaction.transaction_id == paid.last_transaction_id).one()
+    db.close()
+    assert (transaction.from_account_id, transaction.to_account_id) == (source, rent)
+    assert failed.last_failure_reason == "Insufficient funds"
+    assert failed.failure_count == 1
+    assert failed.next_run_at == add_months(start, 1)
+
+    # Nothing is due any more
+    _run(now)
+    assert _balance(headers, source) == "30.00"
+
+
+def test_end_date_and_cancellation(auth_headers):
+    headers = auth_headers()
+    source = _account(headers, deposit=50.0)
+    target = _account(headers)
+    now = datetime.now().replace(microsecond=0)
+
+    last = client.post("/api/v1/standing-orders/", json={
+        "from_account_id": source, "to_account_id": target, "amount": 5.0, "frequency": "daily",
+        "start_at": (now - timedelta(minutes=1)).isoformat(), "end_at": (now + timedelta(hours=1)).isoformat()
+    }, headers=headers).json()
+    cancelled = client.post("/api/v1/standing-orders/", json={
+        "from_account_id": source, "to_account_id": target, "amount": 5.0, "frequency": "weekly",
+        "start_at": (now - timedelta(minutes=1)).isoformat()
+    }, headers=headers).json()
+    response = client.delete(f"/api/v1/standing-orders/{cancelled['id']}", headers=headers)
+    assert response.json()["status"] == "cancelled"
+
+    _run(now)
+    assert _order(last["id"]).status.value == "completed"
+    assert _balance(headers, target) == "5.00"
+
+    listed = client.get("/api/v1/standing-orders/", headers=headers).json()
+    assert [o["status"] for o in listed["standing_orders"]] == ["completed", "cancelled"]
+
+
+def test_standing_order_requires_own_source_account(auth_headers):
+    headers, other = auth_headers(), auth_headers()
+    source = _account(headers)
+    response = client.post("/api/v1/standing-orders/", json={
+        "from_account_id": source, "to_account_id": _account(other), "amount": 5.0,
+        "frequency": "daily", "start_at": datetime.now().isoformat()
+    }, headers=other)
+    assert response.status_code == 404